@@ -0,0 +1,440 @@
+import asyncio
+import atexit
+import concurrent.futures
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+from playwright.async_api import async_playwright
+
+from app.logging_config import logger
+from app import scrape_metrics
+
+# --- Configuration (overridable per deployment) ---
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "3"))
+BROWSER_RECYCLE_AFTER_PAGES = int(os.getenv("BROWSER_RECYCLE_AFTER_PAGES", "200"))
+BROWSER_MAX_MEMORY_MB = int(os.getenv("BROWSER_MAX_MEMORY_MB", "1024"))
+# Cookies + local storage of the logged-in context, reused across scrapes and restarts
+BROWSER_STORAGE_STATE_PATH = os.getenv("BROWSER_STORAGE_STATE_PATH", "/data/f95_storage_state.json")
+BROWSER_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# --- Request blocking ---
+# The scraper only needs the DOM, so subresources the parser never reads are aborted.
+# Profiles: "off" (load everything), "default" (images/media/fonts, third-party scripts, trackers),
+# "strict" (default + stylesheets and other non-document traffic).
+_BLOCK_PROFILES = {
+    'off': frozenset(),
+    'default': frozenset({'image', 'media', 'font'}),
+    'strict': frozenset({'image', 'media', 'font', 'stylesheet', 'manifest', 'texttrack', 'websocket', 'eventsource'}),
+}
+BROWSER_BLOCK_PROFILE = os.getenv("BROWSER_BLOCK_PROFILE", "default").strip().lower()
+if BROWSER_BLOCK_PROFILE not in _BLOCK_PROFILES:
+    logger.warning(f"BrowserService: Unknown BROWSER_BLOCK_PROFILE '{BROWSER_BLOCK_PROFILE}', using 'default'.")
+    BROWSER_BLOCK_PROFILE = 'default'
+# Comma-separated resource types; replaces the profile's list when set
+_block_types_env = os.getenv("BROWSER_BLOCK_RESOURCE_TYPES")
+BROWSER_BLOCK_RESOURCE_TYPES = (frozenset(t.strip().lower() for t in _block_types_env.split(',') if t.strip())
+                                if _block_types_env is not None else _BLOCK_PROFILES[BROWSER_BLOCK_PROFILE])
+# Scripts from any other host are treated as third-party and blocked (Cloudflare stays allowed for challenges)
+BROWSER_FIRST_PARTY_DOMAINS = [d.strip().lower() for d in os.getenv(
+    "BROWSER_FIRST_PARTY_DOMAINS", "f95zone.to,f95zone.com,challenges.cloudflare.com").split(',') if d.strip()]
+_DEFAULT_TRACKER_DOMAINS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googlesyndication.com',
+    'googleadservices.com', 'adservice.google.com', 'facebook.net', 'hotjar.com', 'quantserve.com',
+    'scorecardresearch.com', 'exoclick.com', 'exosrv.com', 'juicyads.com', 'trafficjunky.net',
+    'trafficstars.com', 'tsyndicate.com', 'adsterra.com', 'popads.net', 'propellerads.com',
+)
+# Extra comma-separated domains to block for every resource type
+BROWSER_BLOCK_DOMAINS = list(_DEFAULT_TRACKER_DOMAINS) + [d.strip().lower() for d in os.getenv("BROWSER_BLOCK_DOMAINS", "").split(',') if d.strip()]
+# Blocked responses are never downloaded, so the savings are estimated from typical sizes per type
+_ESTIMATED_BYTES_BY_TYPE = {
+    'image': 80_000, 'media': 500_000, 'font': 40_000, 'script': 60_000, 'stylesheet': 30_000,
+    'document': 40_000, 'xhr': 5_000, 'fetch': 5_000,
+}
+_ESTIMATED_BYTES_OTHER = 5_000
+_BLOCKING_ENABLED = BROWSER_BLOCK_PROFILE != 'off' or bool(BROWSER_BLOCK_RESOURCE_TYPES)
+
+
+def _chromium_memory_mb():
+    """
+    Approximates the resident memory of the Chromium processes spawned by this process
+    by summing VmRSS of our Chromium descendants. Linux only; returns None elsewhere.
+    """
+    if not os.path.isdir('/proc'):
+        return None
+
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+            # Format: "pid (comm) state ppid ..." - comm may contain spaces, so split after the last ')'
+            ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total_kb = 0
+    stack = list(children.get(os.getpid(), []))
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                cmdline = f.read()
+            if b'chrom' not in cmdline and b'headless_shell' not in cmdline:
+                continue
+            with open(f'/proc/{pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total_kb += int(line.split()[1])
+                        break
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
+
+
+def _host_matches(host, domains):
+    return any(host == d or host.endswith('.' + d) for d in domains)
+
+def _block_reason(resource_type, url):
+    """Returns why a request should be aborted under the configured profile, or None to let it through."""
+    if not _BLOCKING_ENABLED:
+        return None
+    host = (urlsplit(url).hostname or '').lower()
+    if not host: # data:, blob: and similar never hit the network
+        return None
+    if _host_matches(host, BROWSER_BLOCK_DOMAINS):
+        return 'tracker'
+    if resource_type in BROWSER_BLOCK_RESOURCE_TYPES:
+        return resource_type
+    if resource_type == 'script' and BROWSER_BLOCK_PROFILE != 'off' and not _host_matches(host, BROWSER_FIRST_PARTY_DOMAINS):
+        return 'third-party script'
+    return None
+
+
+def load_storage_state(path=BROWSER_STORAGE_STATE_PATH):
+    """
+    Reads a persisted storage state file.
+    Returns (owner, storage_state) or (None, None) if missing/unreadable.
+    """
+    if not path or not os.path.exists(path):
+        return None, None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data.get('owner'), data.get('storage_state')
+    except (OSError, ValueError) as e:
+        logger.warning(f"BrowserService: Could not read storage state {path}: {e}")
+        return None, None
+
+def discard_storage_state(path=BROWSER_STORAGE_STATE_PATH):
+    """Deletes the persisted storage state (e.g. after it was found expired)."""
+    try:
+        if path and os.path.exists(path):
+            os.remove(path)
+            logger.info(f"BrowserService: Discarded storage state {path}.")
+    except OSError as e:
+        logger.warning(f"BrowserService: Could not remove storage state {path}: {e}")
+
+
+class BrowserService:
+    """
+    Long-lived Chromium instance shared by the whole process.
+
+    Playwright objects are bound to the thread that created them, so the browser lives on a
+    dedicated thread running an asyncio loop. Callers on any thread (scheduler, Flask request
+    threads) submit coroutines through run(), which executes them on a page borrowed from a
+    bounded pool. The browser is recycled after a number of pages or when its memory grows
+    above a ceiling.
+    """
+
+    def __init__(self, pool_size=BROWSER_POOL_SIZE, recycle_after_pages=BROWSER_RECYCLE_AFTER_PAGES,
+                 max_memory_mb=BROWSER_MAX_MEMORY_MB, storage_state_path=BROWSER_STORAGE_STATE_PATH):
+        self.pool_size = max(1, pool_size)
+        self.recycle_after_pages = recycle_after_pages
+        self.max_memory_mb = max_memory_mb
+        self.storage_state_path = storage_state_path
+
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._loop = None
+
+        # Everything below is only touched from the loop thread
+        self._cond = None
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._idle_pages = []
+        self._open_pages = 0
+        self._pages_in_use = 0
+        self._pages_served = 0 # Since the last launch
+        self._recycle_pending = False
+        self._block_stats = {} # page -> blocked requests/estimated bytes for its current job
+
+        # Per-context scratch space, reset whenever the browser is recycled.
+        # 'session_owner': account whose cookies the context carries
+        # 'session_verified': True once a loaded page confirmed those cookies are still valid
+        self.context_state = {}
+        self.context_lock = None # asyncio.Lock for work that must run once per context (login)
+
+    # --- Loop thread management ---
+
+    def _ensure_loop(self):
+        """Starts the browser thread and its event loop if not already running."""
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+
+            ready = threading.Event()
+
+            def _loop_runner():
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                self._loop = loop
+                self._cond = asyncio.Condition()
+                self.context_lock = asyncio.Lock()
+                ready.set()
+                try:
+                    loop.run_forever()
+                finally:
+                    loop.close()
+
+            self._thread = threading.Thread(target=_loop_runner, name="BrowserService", daemon=True)
+            self._thread.start()
+            ready.wait()
+            logger.info(f"BrowserService: Started (pool size {self.pool_size}, recycle after {self.recycle_after_pages} pages or {self.max_memory_mb} MB, request blocking '{BROWSER_BLOCK_PROFILE}').")
+
+    def run(self, work, *args, timeout=240, timings=None):
+        """
+        Runs `await work(service, page, *args)` on a pooled page and returns its result.
+        Blocks the calling thread; safe to call from any thread.
+        timings: optional dict that receives the ms spent waiting for a page / launching the browser.
+        """
+        self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self._run_with_page(work, *args, timings=timings), self._loop)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel() # Releases the page (closed as broken) on the loop thread
+            raise
+
+    def shutdown(self):
+        """Closes the browser and stops the loop thread."""
+        if not self._thread or not self._thread.is_alive():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown_async(), self._loop).result(timeout=30)
+        except Exception as e:
+            logger.warning(f"BrowserService: Error during shutdown: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        logger.info("BrowserService: Shut down.")
+
+    # --- Page pool (loop thread only) ---
+
+    async def _run_with_page(self, work, *args, timings=None):
+        page = await self._acquire_page(timings)
+        broken = False
+        stats = self._block_stats.get(page)
+        if stats is not None:
+            stats.update(requests=0, bytes=0, reasons={})
+        try:
+            return await work(self, page, *args)
+        except BaseException:
+            # Navigation errors/timeouts/cancellation can leave the page mid-load; don't reuse it
+            broken = True
+            raise
+        finally:
+            if stats is not None:
+                self._report_blocked(page, stats)
+            await self._release_page(page, broken)
+
+    # --- Request blocking (loop thread only) ---
+
+    async def _install_request_blocking(self, page):
+        """Routes every request of the page through the blocking profile. No-op when blocking is off."""
+        if not _BLOCKING_ENABLED:
+            return
+        stats = {'requests': 0, 'bytes': 0, 'reasons': {}}
+        self._block_stats[page] = stats
+
+        async def _handle_route(route):
+            request = route.request
+            reason = _block_reason(request.resource_type, request.url)
+            if reason is None:
+                await route.continue_()
+                return
+            stats['requests'] += 1
+            stats['bytes'] += _ESTIMATED_BYTES_BY_TYPE.get(request.resource_type, _ESTIMATED_BYTES_OTHER)
+            stats['reasons'][reason] = stats['reasons'].get(reason, 0) + 1
+            await route.abort('blockedbyclient')
+
+        await page.route("**/*", _handle_route)
+
+    def _report_blocked(self, page, stats):
+        scrape_metrics.record('browser_blocked_requests', stats['requests'])
+        scrape_metrics.record('browser_blocked_bytes_est', stats['bytes'])
+        if not stats['requests']:
+            return
+        breakdown = ', '.join(f"{reason}: {count}" for reason, count in sorted(stats['reasons'].items()))
+        logger.debug(f"BrowserService: Blocked {stats['requests']} requests (~{stats['bytes'] / 1024:.0f} KB) on {page.url} ({breakdown}).")
+
+    async def _acquire_page(self, timings=None):
+        async with self._cond:
+            # page_wait: waiting for a free pool slot (and closing a browser that is due for recycling)
+            with scrape_metrics.timed_phase(timings, 'page_wait'):
+                while True:
+                    if self._browser is not None and not self._browser.is_connected() and not self._recycle_pending:
+                        logger.warning("BrowserService: Browser disconnected. Scheduling relaunch.")
+                        self._recycle_pending = True
+                    if self._recycle_pending and self._pages_in_use == 0:
+                        await self._close_browser()
+                    if not self._recycle_pending and (self._idle_pages or self._open_pages < self.pool_size):
+                        break
+                    await self._cond.wait()
+
+            if self._browser is None:
+                await self._launch_browser(timings)
+
+            if self._idle_pages:
+                page = self._idle_pages.pop()
+            else:
+                with scrape_metrics.timed_phase(timings, 'new_page'):
+                    page = await self._context.new_page()
+                    await self._install_request_blocking(page)
+                self._open_pages += 1
+            self._pages_in_use += 1
+            return page
+
+    async def _release_page(self, page, broken=False):
+        async with self._cond:
+            self._pages_in_use -= 1
+            self._pages_served += 1
+
+            if broken or page.is_closed():
+                self._open_pages -= 1
+                self._block_stats.pop(page, None)
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+            else:
+                self._idle_pages.append(page)
+
+            if not self._recycle_pending:
+                reason = self._recycle_reason()
+                if reason:
+                    logger.info(f"BrowserService: Recycling browser ({reason}).")
+                    self._recycle_pending = True
+
+            self._cond.notify_all()
+
+    def _recycle_reason(self):
+        if self.recycle_after_pages and self._pages_served >= self.recycle_after_pages:
+            return f"served {self._pages_served} pages"
+        if self.max_memory_mb:
+            memory_mb = _chromium_memory_mb()
+            if memory_mb is not None and memory_mb > self.max_memory_mb:
+                return f"memory {memory_mb:.0f} MB above {self.max_memory_mb} MB ceiling"
+        return None
+
+    # --- Browser lifecycle (loop thread only) ---
+
+    async def _launch_browser(self, timings=None):
+        owner, storage_state = load_storage_state(self.storage_state_path)
+        try:
+            if self._playwright is None:
+                with scrape_metrics.timed_phase(timings, 'playwright_start'):
+                    self._playwright = await async_playwright().start()
+            with scrape_metrics.timed_phase(timings, 'browser_launch'):
+                self._browser = await self._playwright.chromium.launch(headless=True)
+            with scrape_metrics.timed_phase(timings, 'context_create'):
+                self._context = await self._browser.new_context(user_agent=BROWSER_USER_AGENT, storage_state=storage_state)
+        except Exception:
+            await self._close_browser() # Don't leave a half-launched browser behind
+            raise
+        self.context_state = {}
+        if owner and storage_state:
+            # Restored cookies are trusted until a page shows they expired
+            self.context_state['session_owner'] = owner
+            self.context_state['session_verified'] = False
+        self._pages_served = 0
+        logger.info(f"BrowserService: Chromium launched{f' with stored session for {owner}' if owner and storage_state else ''}.")
+
+    async def save_storage_state(self):
+        """Persists the context's cookies/local storage for the verified session owner (loop thread only)."""
+        owner = self.context_state.get('session_owner')
+        if not self.storage_state_path or self._context is None or not owner or not self.context_state.get('session_verified'):
+            return
+        try:
+            storage_state = await self._context.storage_state()
+            os.makedirs(os.path.dirname(os.path.abspath(self.storage_state_path)), exist_ok=True)
+            tmp_path = f"{self.storage_state_path}.tmp"
+            # Session cookies: keep the file private to the app user
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'owner': owner, 'saved_at': time.time(), 'storage_state': storage_state}, f)
+            os.replace(tmp_path, self.storage_state_path)
+            logger.info(f"BrowserService: Saved storage state for {owner} to {self.storage_state_path}.")
+        except Exception as e:
+            logger.warning(f"BrowserService: Could not save storage state to {self.storage_state_path}: {e}")
+
+    def invalidate_session(self):
+        """Forgets the context's session and the persisted copy (loop thread only)."""
+        self.context_state.pop('session_owner', None)
+        self.context_state.pop('session_verified', None)
+        discard_storage_state(self.storage_state_path)
+
+    async def _close_browser(self):
+        # Keep the persisted session as fresh as the cookies the site rotated during this run
+        await self.save_storage_state()
+
+        for page in self._idle_pages:
+            try:
+                await page.close()
+            except Exception:
+                pass
+        self._idle_pages = []
+        self._open_pages = 0
+        self._block_stats = {}
+
+        if self._context is not None:
+            try:
+                await self._context.close()
+            except Exception:
+                pass
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+        self._context = None
+        self._browser = None
+        self._recycle_pending = False
+        self.context_state = {}
+
+    async def _shutdown_async(self):
+        async with self._cond:
+            await self._close_browser()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+
+# --- Process-wide instance ---
+_browser_service = None
+_browser_service_lock = threading.Lock()
+
+def get_browser_service() -> BrowserService:
+    """Returns the process-wide BrowserService, creating it on first use."""
+    global _browser_service
+    with _browser_service_lock:
+        if _browser_service is None:
+            _browser_service = BrowserService()
+            atexit.register(_browser_service.shutdown)
+        return _browser_service
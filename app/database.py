@@ -5,7 +5,8 @@ from app.logging_config import logger
 def get_db_connection(db_path):
     """Establishes a connection to the database."""
     try:
-        conn = sqlite3.connect(db_path)
+        # Generous busy timeout: concurrent sync workers write to the same WAL database
+        conn = sqlite3.connect(db_path, timeout=30)
         conn.row_factory = sqlite3.Row
         return conn
     except sqlite3.Error as e:
@@ -73,7 +74,9 @@ def initialize_database(db_path):
                 scraper_last_run_at TEXT DEFAULT NULL, -- Timestamp of the last successful scrape
                 os_list TEXT DEFAULT NULL,
                 release_date TEXT DEFAULT NULL,
-                thread_updated_date TEXT DEFAULT NULL
+                thread_updated_date TEXT DEFAULT NULL,
+                first_post_hash TEXT DEFAULT NULL, -- sha256 of the first post slice at the last parse
+                parser_version TEXT DEFAULT NULL -- f95_web_scraper.PARSER_VERSION used for that parse
             )
         """)
         
@@ -93,7 +96,9 @@ def initialize_database(db_path):
             'scraper_last_run_at': "TEXT DEFAULT NULL",
             'os_list': "TEXT DEFAULT NULL",
             'release_date': "TEXT DEFAULT NULL",
-            'thread_updated_date': "TEXT DEFAULT NULL"
+            'thread_updated_date': "TEXT DEFAULT NULL",
+            'first_post_hash': "TEXT DEFAULT NULL",
+            'parser_version': "TEXT DEFAULT NULL"
         }
 
         for col_name, col_def in new_columns_to_add.items():
@@ -156,6 +161,49 @@ def initialize_database(db_path):
                 FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
             )
         """)
+
+        # Create scrape_jobs table (persistent scrape queue, see app/scrape_queue.py)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scrape_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                thread_id TEXT NOT NULL,
+                game_id INTEGER NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0, -- Higher runs first
+                status TEXT NOT NULL DEFAULT 'pending', -- 'pending', 'leased' or 'dead'
+                image_missing BOOLEAN DEFAULT FALSE, -- Recover the cover image from the scraped page
+                rss_status TEXT DEFAULT NULL, -- completed_status of the RSS match that triggered the job
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL, -- Unix time; pushed back after a failure
+                lease_owner TEXT DEFAULT NULL,
+                lease_expires_at REAL DEFAULT NULL,
+                last_error TEXT DEFAULT NULL,
+                generation INTEGER NOT NULL DEFAULT 0, -- Bumped when a request is merged into the job while it is leased
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                FOREIGN KEY(game_id) REFERENCES games(id) ON DELETE CASCADE
+            )
+        """)
+        cursor.execute("PRAGMA table_info(scrape_jobs)")
+        if 'generation' not in [row[1] for row in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE scrape_jobs ADD COLUMN generation INTEGER NOT NULL DEFAULT 0")
+            logger.info("Added 'generation' column to 'scrape_jobs' table.")
+        # At most one live job per thread; dead-lettered jobs don't block new ones
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_scrape_jobs_live_thread ON scrape_jobs(thread_id) WHERE status != 'dead'")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_scrape_jobs_claim ON scrape_jobs(status, priority, available_at)")
+
+        # Create scrape_timings table (per-phase timings of recent scrapes, see app/scrape_metrics.py)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scrape_timings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                game_id INTEGER,
+                thread_id TEXT,
+                started_at TEXT NOT NULL,
+                outcome TEXT, -- 'updated', 'unchanged', 'skipped' or 'failed'
+                fetch_method TEXT, -- 'http' or 'browser'
+                total_ms REAL,
+                phases_json TEXT -- {"goto": ms, "parse_tags": ms, ...}
+            )
+        """)
         
         conn.commit()
         logger.info(f"Database initialized successfully at {db_path}")
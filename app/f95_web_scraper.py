@@ -1,7 +1,10 @@
+import asyncio
+import hashlib
+import os
 import requests
 from bs4 import BeautifulSoup
+import lxml.html
 import time
-from playwright.sync_api import sync_playwright
 import re
 import logging
 from datetime import datetime
@@ -9,17 +12,672 @@ from datetime import datetime
 # Create a logger specific to this module
 # Use the central logger
 from app.logging_config import logger as logger_scraper
+from app.browser_service import get_browser_service, load_storage_state
+from app import scrape_metrics
+from f95apiclient.rate_limit import get_rate_limiter
+
+# Upper bound for waiting on the DOM nodes the parser reads once the first post is attached
+SCRAPER_READY_CAP_MS = int(os.getenv("SCRAPER_READY_CAP_MS", "3000"))
+# Fast parse: slice out the nodes the parser reads with lxml and build the soup from that slice only
+SCRAPER_FAST_PARSE = os.getenv("SCRAPER_FAST_PARSE", "false").lower() in ("1", "true", "yes", "on")
+# Extraction engine: "legacy" (a separate search per field) or "single_pass" (one walk over the page feeding all fields)
+SCRAPER_PARSE_ENGINE = os.getenv("SCRAPER_PARSE_ENGINE", "legacy").lower()
+# Stored per game next to first_post_hash. Bump whenever parse_game_page_content would extract
+# something different from the same page, or the hashed slice changes, so unchanged threads get re-parsed once.
+PARSER_VERSION = "2"
+
+# --- Fast Parse Slice ---
+def _xpath_has_class(cls):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+# First match of each of these is all the parser ever looks at outside the first post
+_SLICE_FIRST_MATCH_XPATHS = [
+    "//title",
+    f"//h1[{_xpath_has_class('p-title-value')}]",
+    f"//span[{_xpath_has_class('js-tagList')}]",
+    f"//div[{_xpath_has_class('tagGroup')}]",
+    f"//*[{_xpath_has_class('js-threadStatusField')}]",
+    f"//article[{_xpath_has_class('message--post')}]",
+]
+
+def _first_post_slice(html_content):
+    """
+    Cuts a thread page down to the nodes parse_game_page_content reads: the title, the tag list,
+    the thread status field, the first post and every <dl> (the DL-list pass scans the whole page).
+    Nodes are kept in document order, so "first match" lookups on the slice find the same node
+    they would on the full page. Returns the slice as an HTML string.
+    """
+    root = lxml.html.document_fromstring(html_content)
+    picked = []
+    for xpath in _SLICE_FIRST_MATCH_XPATHS:
+        found = root.xpath(f"({xpath})[1]")
+        if found:
+            picked.append(found[0])
+    picked.extend(root.iter('dl'))
+
+    # Drop nodes already contained in another picked node; walking the tree restores document order
+    picked_set = set(picked)
+    kept_set = {el for el in picked_set if not any(anc in picked_set for anc in el.iterancestors())}
+    kept = [el for el in root.iter() if el in kept_set]
+    return ''.join(lxml.html.tostring(el, encoding='unicode', with_tail=False) for el in kept)
+
+# Hashed instead of the whole first post: the first post's bbWrapper is all the field extraction reads there
+_HASH_FIRST_MATCH_XPATHS = _SLICE_FIRST_MATCH_XPATHS[:-1] + [
+    f"//article[{_xpath_has_class('message--post')}]//div[{_xpath_has_class('bbWrapper')}]",
+]
+# Volatile markup inside the hashed nodes that never reaches the parsed fields
+_HASH_STRIP_XPATH = " | ".join([
+    ".//time",
+    f".//*[{_xpath_has_class('message-userExtras')}]",
+    f".//*[{_xpath_has_class('reactionsBar')}]",
+    f".//*[{_xpath_has_class('reactionSummary')}]",
+])
+_RE_WHITESPACE_RUN = re.compile(r'\s+')
+
+def _first_post_hash_input(html_content):
+    """
+    The normalized text first_post_hash covers: the title, tag list, thread status field and the first post's
+    bbWrapper, without timestamps, reactions and user extras. Replies (and their authors' Joined/Messages
+    <dl> blocks, which the DL-list pass never matches) are left out.
+    """
+    root = lxml.html.document_fromstring(html_content)
+    parts = []
+    for xpath in _HASH_FIRST_MATCH_XPATHS:
+        found = root.xpath(f"({xpath})[1]")
+        if not found:
+            parts.append('')
+            continue
+        node = found[0]
+        for volatile in node.xpath(_HASH_STRIP_XPATH):
+            volatile.drop_tree()
+        parts.append(_RE_WHITESPACE_RUN.sub(' ', lxml.html.tostring(node, encoding='unicode', with_tail=False)).strip())
+    return '\n'.join(parts)
+
+def first_post_hash(html_content):
+    """
+    sha256 of the normalized nodes parse_game_page_content reads (see _first_post_hash_input),
+    so markup elsewhere on the page (replies, sidebar, tokens, reaction counts) doesn't affect it.
+    Returns None if the page can't be sliced.
+    """
+    try:
+        normalized = _first_post_hash_input(html_content)
+    except Exception as e:
+        logger_scraper.warning(f"Could not hash first post slice: {e}")
+        return None
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+def _make_thread_soup(html_content, fast):
+    if fast:
+        try:
+            return BeautifulSoup(_first_post_slice(html_content), 'lxml')
+        except Exception as e:
+            logger_scraper.warning(f"Fast parse slicing failed ({e}). Parsing the full page instead.")
+    return BeautifulSoup(html_content, 'html.parser')
+
+# --- First Post Field Extraction ---
+# Per-node steps shared by both engines: the legacy engine walks the first post once per field,
+# the single-pass engine feeds every node of one walk to all of them.
+_DESCRIPTION_STOP_KEYWORDS = ['download', 'changelog', "what's new", "what is new", "version history", "updates", "installation", "preview", "screenshots", "spoiler:", "support the dev", "developer", "author", "version", "engine", "language", "status", "censorship", "release date", "thread updated", "os", "platform", "system", "genre", "tags"]
+_SUPPORT_LINK_DOMAINS = ['patreon.com', 'subscribestar.adult', 'discord.gg', 'discord.com', 'itch.io', 'buymeacoffee.com', 'ko-fi.com', 'store.steampowered.com', 'paypal.com', 'subscribestar.com', 'gumroad.com', 'fanbox.cc', 'fantia.jp', 'boosty.to', 'youtube.com', 'twitter.com', 'x.com', 'facebook.com', 'instagram.com', 'reddit.com']
+_DOWNLOAD_SECTION_HEADER_TEXTS = ['download', 'links', 'files']
+# Add 'win' to keywords list explicitly
+_OS_SECTION_KEYWORDS = ['windows', 'pc', 'linux', 'mac', 'macos', 'osx', 'android', 'win']
+
+def _developer_after_label(tag, tag_text_lower):
+    """Value following a bold "Developer:" label, or None."""
+    if not tag_text_lower.startswith("developer:"):
+        return None
+    dev_name_candidate = tag.next_sibling
+    if dev_name_candidate and isinstance(dev_name_candidate, str) and dev_name_candidate.strip():
+        return dev_name_candidate.strip()
+    elif dev_name_candidate and dev_name_candidate.name == 'a' and dev_name_candidate.get_text(strip=True):
+        return dev_name_candidate.get_text(strip=True)
+    elif dev_name_candidate and dev_name_candidate.find(string=True, recursive=False) and dev_name_candidate.find(string=True, recursive=False).strip():
+        return dev_name_candidate.find(string=True, recursive=False).strip()
+    return None
+
+def _version_after_label(tag, tag_text_lower):
+    """Value following a bold "Version:" style label, or None."""
+    if not (any(kw in tag_text_lower for kw in ["version:", "current version:", "latest release:"]) and len(tag_text_lower) < 30):
+        return None
+    version_candidate_text = ""
+    next_elem = tag.next_sibling
+    while next_elem and (isinstance(next_elem, str) and not next_elem.strip()):
+        next_elem = next_elem.next_sibling
+
+    if next_elem:
+        if isinstance(next_elem, str) and next_elem.strip():
+            version_candidate_text = next_elem.strip().splitlines()[0].strip()
+        elif next_elem.name == 'a' and next_elem.get_text(strip=True):
+            version_candidate_text = next_elem.get_text(strip=True)
+        elif next_elem.name and next_elem.find(string=True, recursive=False) and next_elem.find(string=True, recursive=False).strip():
+             version_candidate_text = next_elem.find(string=True, recursive=False).strip()
+    return version_candidate_text or None
+
+def _status_after_label(b_tag, tag_text_lower):
+    """Value following a bold label mentioning "status", or None."""
+    if "status" not in tag_text_lower:
+        return None
+    next_sib = b_tag.next_sibling
+    if next_sib:
+        val = next_sib.get_text(strip=True) if not isinstance(next_sib, str) else next_sib
+        val = val.strip().lstrip(':-').strip()
+        if val:
+            return val
+    return None
+
+def _fallback_image_src(img):
+    """Source of a non-bbImage picture usable as cover (lazy loaded etc.), or None."""
+    src = img.get('src') or img.get('data-src') or img.get('data-url')
+    # Filter out smilies/attachments if possible, though bbImage class usually handles it
+    if src and 'attachments' not in src and 'smilies' not in src:
+        return src
+    return None
+
+def _cover_image_url(bb_image, fallback_src):
+    # Usually the first image in the post
+    if bb_image and bb_image.get('src'):
+        return bb_image.get('src')
+    elif bb_image and bb_image.get('data-url'):
+        return bb_image.get('data-url')
+    return fallback_src
+
+def _description_step(elem, desc_elements):
+    """Feeds one direct child of the first post into the description. Returns True once the description has ended."""
+    elem_text_lower = ""
+    if elem.name and (elem.name.startswith('h') or elem.name == 'dl' or (elem.name == 'div' and any(cls in elem.get('class', []) for cls in ['bbCodeSpoiler', 'bbCodeBlock--download', 'bbCodeBlock--changelog'])) or (elem.name == 'button' and 'bbCodeSpoiler-button' in elem.get('class',[])) or (elem.name in ['strong','b'])):
+        elem_text_lower = elem.get_text(strip=True).lower()
+
+    if (elem_text_lower and any(kw in elem_text_lower for kw in _DESCRIPTION_STOP_KEYWORDS) and len(elem_text_lower) < 70) or elem.name == 'dl':
+        # Check for "Overview" header exception - if it's just "Overview" we might want to skip the header but continue content
+        if "overview" in elem_text_lower or "description" in elem_text_lower or "plot" in elem_text_lower or "story" in elem_text_lower:
+             return False # Skip the header itself, but don't end the description
+        return True
+
+    if isinstance(elem, str):
+        cleaned_text = elem.strip()
+        if cleaned_text: 
+             # Remove literal "\n" characters if they appear in text (common in some raw dumps) and standard newlines
+             cleaned_text = cleaned_text.replace("\\n", " ").replace("\n", " ")
+             desc_elements.append(cleaned_text)
+    elif elem.name not in ['script', 'style', 'iframe', 'form', 'input', 'textarea', 'select', 'button']:
+        if elem.name == 'div' and 'bbCodeSpoiler' in elem.get('class', []):
+            button_text_spoiler = elem.find('button', class_='bbCodeSpoiler-button')
+            if button_text_spoiler and not any(kw in button_text_spoiler.get_text(strip=True).lower() for kw in _DESCRIPTION_STOP_KEYWORDS):
+                 spoiler_text = button_text_spoiler.get_text(strip=True).replace("\\n", " ").replace("\n", " ")
+                 desc_elements.append(spoiler_text)
+        elif elem.name == 'br':
+            desc_elements.append("\n") # Mark paragraph breaks explicitly
+        else:
+            text = elem.get_text(separator=' ', strip=True) # Use space separator for inline tags
+            if "You don't have permission to view the spoiler content" not in text and "Log in or register now" not in text:
+                text = text.replace("\\n", " ").replace("\n", " ")
+                desc_elements.append(text)
+    return False
+
+def _join_description(desc_elements, bb_wrapper):
+    # smart join: join with spaces, but respect explicit newlines we added for <br>
+    full_desc_str = ""
+    for item in desc_elements:
+        if item == "\n":
+            full_desc_str += "\n\n"
+        else:
+            # Collapse multiple spaces
+            clean_item = re.sub(r'\s+', ' ', item).strip()
+            if clean_item:
+                full_desc_str += clean_item + " "
+
+    full_description = re.sub(r'\n{3,}', '\n\n', full_desc_str).strip()
+    if not full_description:
+         full_description = bb_wrapper.get_text(separator='\n', strip=True)
+    return full_description
+
+def _text_prefix_lower(tag, limit=110):
+    """
+    Lower-cased start of tag.get_text(separator=' ', strip=True), read only until it exceeds `limit` characters.
+    The download collector only looks at the first 100 characters, so large containers needn't be joined in full.
+    """
+    parts = []
+    length = -1
+    for string in tag.stripped_strings:
+        parts.append(string)
+        length += len(string) + 1
+        if length > limit:
+            break
+    return ' '.join(parts).lower()
+
+def _download_links_step(elem, state, raw_download_links):
+    """
+    Feeds one node (document order) of the first post to the download link collector.
+    state['section_os'] carries the OS of the section the walk is currently in.
+    """
+    # Skip empty text or irrelevant tags
+    if isinstance(elem, str):
+        text_content = str(elem).strip()
+        if not text_content: return
+        # Text node analysis
+        current_element_text_lower = text_content.lower()
+        is_header_like = True # Treat significant text nodes as potential headers
+    elif elem.name in ['h1','h2','h3','h4','strong','b','p','span','div','u','li']:
+        current_element_text_lower = _text_prefix_lower(elem)
+        if current_element_text_lower.startswith(('-', '|', '•')):
+             is_header_like = False
+        else:
+             is_header_like = True
+    elif elem.name == 'a':
+        # Link processing happens below
+        current_element_text_lower = "" 
+        is_header_like = False
+    else:
+        return
+
+    if is_header_like and len(current_element_text_lower) >= 2:
+        # Check for OS keywords
+        text_to_check = current_element_text_lower[:100] 
+
+        found_os = False
+        # Only trigger OS detection if the element itself is likely a header (short)
+        if len(current_element_text_lower) < 100:
+            if any(os_kw in text_to_check for os_kw in _OS_SECTION_KEYWORDS):
+                if any(kw in text_to_check for kw in ['windows', 'pc', 'win ', 'win/']): state['section_os'] = 'win'
+                elif 'linux' in text_to_check: state['section_os'] = 'linux'
+                elif any(kw in text_to_check for kw in ['mac', 'osx', 'macos']): state['section_os'] = 'mac'
+                elif 'android' in text_to_check: state['section_os'] = 'android'
+
+                # Check if we are inside a restricted spoiler (Split/Update/Patch)
+                try:
+                    parent = elem.parent if isinstance(elem, str) else elem
+                    ancestor_spoilers = parent.find_parents('div', class_='bbCodeSpoiler')
+                    for spoiler_div in ancestor_spoilers:
+                        btn = spoiler_div.find('button', class_='bbCodeSpoiler-button')
+                        if btn:
+                            btn_text = btn.get_text(strip=True).lower()
+                            if any(bad in btn_text for bad in ['split', 'update', 'part', 'extra', 'patch']):
+                                state['section_os'] = 'extras'
+                                break
+                except: pass
+
+                found_os = True
+
+        # If valid OS found, we update. 
+        # If not, check if it's a generic "Download" header which should reset the OS
+        if not found_os:
+            if any(hdr_kw in text_to_check for hdr_kw in _DOWNLOAD_SECTION_HEADER_TEXTS) and len(text_to_check) < 50:
+                state['section_os'] = None
+            elif any(kw in text_to_check for kw in ['translation', 'patch', 'mod', 'extra', 'update', 'split', 'part ']):
+                state['section_os'] = 'extras'
+
+    if elem.name == 'a' and elem.get('href'):
+        href = elem.get('href')
+        text = elem.get_text(strip=True)
+
+        if not href or href.startswith(('#', 'mailto:', 'javascript:')) or "f95zone.to/account/" in href or "f95zone.to/members/" in href : 
+            return
+        if "attachments.f95zone.to" in href.lower(): 
+            return
+
+        try:
+            link_domain = re.match(r"https://?([^/]+)", href).group(1).replace("www.", "")
+            if any(support_domain in link_domain for support_domain in _SUPPORT_LINK_DOMAINS): 
+                return
+        except: pass
+
+        if "f95zone.to/threads/" in href and not any(ext in href.lower() for ext in ['.zip', '.rar', '.apk', '.7z', '.exe', '.patch', '.mod']):
+            if not any(kw in text.lower() for kw in ['mod', 'patch', 'translation', 'download', 'fix', 'guide', 'update', 'part', 'unlocker']): 
+                return
+
+        link_os = 'unknown'
+
+        # Force 'extras' for specific keywords in link text or url (overrides section OS)
+        is_extra_content = False
+        lower_text = text.lower()
+        lower_href = href.lower()
+
+        if any(kw in lower_text for kw in ['update', 'patch', 'fix', 'mod', 'translation', 'guide', 'walkthrough', 'part ', 'unlocker', 'cheat']) or \
+           any(kw in lower_href for kw in ['.part1', '.part2', '.part3', '.part4', '.part5']):
+            link_os = 'extras'
+            is_extra_content = True
+
+        if not is_extra_content:
+            if state['section_os']: 
+                link_os = state['section_os']
+            else:
+                if any(kw in lower_text for kw in ['win ', ' pc ', '.exe', '[win]', '(win)', 'windows', '(pc)', '[pc]']) or any(kw in lower_href for kw in ['_pc.', '.exe']): link_os = 'win'
+                elif any(kw in lower_text for kw in ['linux', '.deb', '.sh', '[linux]', '(linux)', '_linux.']) or any(kw in lower_href for kw in ['_linux.', '.sh']): link_os = 'linux'
+                elif any(kw in lower_text for kw in ['mac', 'osx', '.dmg', '[mac]', '(mac)', '_mac.']) or any(kw in lower_href for kw in ['_mac.', '.dmg']): link_os = 'mac'
+                elif any(kw in lower_text for kw in ['android', '.apk', '[android]', '(android)', '_apk.']) or any(kw in lower_href for kw in ['_apk.', '.apk']): link_os = 'android'
+                elif any(kw in lower_text for kw in ['extra', 'dlc', 'optional', 'bonus', 'soundtrack']): link_os = 'extras'
+
+        raw_download_links.append({'text': text, 'url': href, 'os_determined': link_os})
+
+def _finalize_download_links(raw_download_links):
+    unique_links_map = {}
+    for link_info in raw_download_links:
+        key = (link_info['url'], link_info['text'])
+        if key not in unique_links_map: unique_links_map[key] = link_info
+
+    final_raw_links_with_os = list(unique_links_map.values())
+    has_win_links = any(link['os_determined'] == 'win' for link in final_raw_links_with_os)
+    has_linux_links = any(link['os_determined'] == 'linux' for link in final_raw_links_with_os)
+
+    download_links = []
+    if has_win_links or has_linux_links:
+        for link in final_raw_links_with_os:
+            if link['os_determined'] in ['win', 'linux', 'mac', 'android', 'extras']:
+                download_links.append({'text': link['text'], 'url': link['url'], 'os_type': link['os_determined']})
+    else:
+        for link in final_raw_links_with_os:
+            download_links.append({'text': link['text'], 'url': link['url'], 'os_type': link['os_determined']})
+    return download_links
+
+# --- "Label: value" Fields ---
+# Fields read from the first post's text (joined with a literal "\\n" separator). Each rule keeps its
+# patterns (plain text form, then the <strong> form) and cleanup limits; everything is compiled once here.
+# Adding a field is one more entry.
+_LABEL_FIELD_RULES = [
+    # release_date checks the length before cutting at the separator
+    {'field': 'release_date', 'labels': r"Release Date|Released|Initial Release|First Release", 'max_len': 50, 'require_digit': True, 'check_before_split': True},
+    {'field': 'os_general_list', 'labels': r"Platform|OS|Systems|Support[s]?", 'max_len': 100},
+    # language keeps the last valid pattern instead of the first
+    {'field': 'language', 'labels': r"Language[s]?", 'max_len': 150, 'last_valid_wins': True},
+    {'field': 'status', 'labels': r"Status", 'max_len': 100},
+    {'field': 'censorship', 'labels': r"Censorship|Censored", 'max_len': 50},
+]
+for _rule in _LABEL_FIELD_RULES:
+    _rule['patterns'] = [
+        re.compile(rf"(?:{_rule['labels']})\s*[:\-]?\s*([^\n]+)", re.IGNORECASE),
+        re.compile(rf"<strong>(?:{_rule['labels']})\s*[:\-]?\s*</strong>\s*([^\n]+)", re.IGNORECASE),
+    ]
+# One scan decides whether any <strong> form can match at all (get_text() output rarely contains markup)
+_RE_STRONG_MARKUP = re.compile(r"<strong>", re.IGNORECASE)
+_RE_LABEL_VALUE_PREFIX = re.compile(r"^\\s*[:\\-\\s]\\s*")
+
+def _label_field_value(rule, match):
+    """Legacy cleanup/validation of a rule's match. Returns the value or None."""
+    if not (match and match.group(1).strip()):
+        return None
+    cleaned = _RE_LABEL_VALUE_PREFIX.sub("", match.group(1).strip()).strip()
+    if rule.get('check_before_split'):
+        if not (cleaned and len(cleaned) < rule['max_len'] and (not rule.get('require_digit') or any(c.isdigit() for c in cleaned))):
+            return None
+        return cleaned.split('\\n')[0].strip()
+    cleaned = cleaned.split('\\n')[0].strip()
+    if not (cleaned and len(cleaned) < rule['max_len']):
+        return None
+    return cleaned
+
+def _scan_label_fields(text):
+    """
+    Returns {field: value} for the _LABEL_FIELD_RULES whose value was found in `text`.
+    A rule's <strong> form is only tried when its plain form gave no value (or the rule keeps the
+    last valid value), and not at all when the text contains no <strong> markup.
+    """
+    has_strong_markup = None
+    values = {}
+    for rule in _LABEL_FIELD_RULES:
+        plain_pattern, strong_pattern = rule['patterns']
+        value = _label_field_value(rule, plain_pattern.search(text))
+        if value is None or rule.get('last_valid_wins'):
+            if has_strong_markup is None:
+                has_strong_markup = _RE_STRONG_MARKUP.search(text) is not None
+            if has_strong_markup:
+                value = _label_field_value(rule, strong_pattern.search(text)) or value
+        if value is not None:
+            values[rule['field']] = value
+    return values
+
+def _status_from_labels(bb_wrapper):
+    for b_tag in bb_wrapper.find_all(['b', 'strong']):
+        val = _status_after_label(b_tag, b_tag.get_text(strip=True).lower())
+        if val:
+            return val
+    return None
+
+def _scan_first_post(bb_wrapper):
+    """Developer, version, cover image, description and download links of the first post."""
+    found = {'author_from_post_label': "Not found", 'version_from_post': "Not found", 'image_url': None}
+
+    # Developer/Author
+    strong_tags = bb_wrapper.find_all(['strong', 'b'])
+    for tag in strong_tags:
+        value = _developer_after_label(tag, tag.get_text(strip=True).lower())
+        if value:
+            found['author_from_post_label'] = value
+            break
+
+    # Version
+    for tag in strong_tags:
+        value = _version_after_label(tag, tag.get_text(strip=True).lower())
+        if value:
+            found['version_from_post'] = value
+            break
+
+    # Image URL (Cover Image)
+    img_tag = bb_wrapper.find('img', class_='bbImage')
+    fallback_src = None
+    if not (img_tag and (img_tag.get('src') or img_tag.get('data-url'))):
+         # Fallback for lazy loaded or other images
+         for img in bb_wrapper.find_all('img'):
+             fallback_src = _fallback_image_src(img)
+             if fallback_src:
+                 break
+    found['image_url'] = _cover_image_url(img_tag, fallback_src)
+
+    # Overview/Full Description
+    desc_elements = []
+    for elem in bb_wrapper.children:
+        if _description_step(elem, desc_elements):
+            break
+    found['full_description'] = _join_description(desc_elements, bb_wrapper)
+
+    # Download Links
+    raw_download_links = []
+    download_state = {'section_os': None}
+    for elem in bb_wrapper.descendants:
+        _download_links_step(elem, download_state, raw_download_links)
+    found['download_links'] = _finalize_download_links(raw_download_links)
+    return found
+
+_DOWNLOAD_HEADER_TAGS = ('h1', 'h2', 'h3', 'h4', 'strong', 'b', 'u', 'span')
+_DOWNLOAD_HEADER_MAX_LEN = 30
+
+def _is_download_header_text(txt):
+    """Text that is predominantly "DOWNLOAD" ("Click download below" is not)."""
+    if not txt: return False
+    t = txt.strip().lower()
+    return "download" in t and len(t) < _DOWNLOAD_HEADER_MAX_LEN and "below" not in t and "click" not in t
+
+def _may_be_download_header(tag):
+    """
+    False when tag.get_text(strip=True) can't be a download header because it is too long,
+    read only until that's certain. Otherwise the result of _is_download_header_text on the full text.
+    """
+    parts = []
+    length = 0
+    for string in tag.stripped_strings:
+        parts.append(string)
+        length += len(string)
+        if length >= _DOWNLOAD_HEADER_MAX_LEN:
+            return False
+    return _is_download_header_text(''.join(parts))
+
+def _is_under(node, root):
+    """Whether node is still in root's tree (False once it was extracted, replaced or decomposed)."""
+    while node is not None:
+        if node is root:
+            return True
+        node = getattr(node, 'parent', None) # Decomposed nodes have no attributes left
+    return False
+
+def _has_class(tag, cls):
+    return cls in (tag.get('class') or ())
+
+def _scan_page_single_pass(soup):
+    """
+    Single-pass engine: one walk over the soup collects every node the extraction looks up (title, first post,
+    thread status field, tag lists, <dl>s) and feeds each node of the first post's bbWrapper to the developer,
+    version, status label, cover image, description, download link and "Label: value" text collectors.
+    It also records the spoilers, <dt>s and DOWNLOAD header candidates of the post, which are read after the
+    spoiler unwrap mutates the post; parse_game_page_content re-checks those against the mutated tree.
+    Same results as the legacy engine.
+    """
+    scan = {'title_h1': None, 'title_tag': None, 'article': None, 'bb_wrapper': None, 'status_field': None,
+            'tag_lists': [], 'tag_groups': [], 'dls': [], 'spoilers': [], 'dts': [], 'header_candidates': []}
+    post = {'author_from_post_label': "Not found", 'version_from_post': "Not found", 'image_url': None, 'status_from_label': None}
+    developer_done = version_done = status_done = description_done = False
+    desc_elements = []
+    bb_image = None
+    fallback_src = None
+    raw_download_links = []
+    download_state = {'section_os': None}
+    post_strings = []
+    string_types = None
+    header_tag_positions = {} # id(tag) -> position, for tags that only become header candidates once a spoiler inside them is unwrapped
+    header_candidates = {}    # position -> node
+    bb_wrapper = None
+    post_last = None          # last descendant of bb_wrapper; the walk is inside the post until it passes it
+
+    for position, elem in enumerate(soup.descendants):
+        name = elem.name
+        in_post = post_last is not None
+
+        if in_post:
+            # --- First post collectors ---
+            if not description_done and elem.parent is bb_wrapper:
+                description_done = _description_step(elem, desc_elements)
+
+            if name is None:
+                if type(elem) in string_types:
+                    post_strings.append(elem)
+                if _is_download_header_text(elem):
+                    header_candidates[position] = elem
+            else:
+                if name in ('strong', 'b') and not (developer_done and version_done and status_done):
+                    tag_text_lower = elem.get_text(strip=True).lower()
+                    if not developer_done:
+                        value = _developer_after_label(elem, tag_text_lower)
+                        if value:
+                            post['author_from_post_label'] = value
+                            developer_done = True
+                    if not version_done:
+                        value = _version_after_label(elem, tag_text_lower)
+                        if value:
+                            post['version_from_post'] = value
+                            version_done = True
+                    if not status_done:
+                        value = _status_after_label(elem, tag_text_lower)
+                        if value:
+                            post['status_from_label'] = value
+                            status_done = True
+                elif name == 'img':
+                    if bb_image is None and _has_class(elem, 'bbImage'):
+                        bb_image = elem
+                    if fallback_src is None:
+                        fallback_src = _fallback_image_src(elem)
+                elif name == 'dt':
+                    scan['dts'].append(elem)
+                elif name == 'div' and _has_class(elem, 'bbCodeSpoiler'):
+                    scan['spoilers'].append(elem)
+                    # Unwrapping drops the spoiler button's text from the tags around it
+                    for ancestor in elem.parents:
+                        if ancestor is bb_wrapper:
+                            break
+                        ancestor_position = header_tag_positions.get(id(ancestor))
+                        if ancestor_position is not None:
+                            header_candidates[ancestor_position] = ancestor
+
+                if name in _DOWNLOAD_HEADER_TAGS:
+                    header_tag_positions[id(elem)] = position
+                    if _may_be_download_header(elem):
+                        header_candidates[position] = elem
+
+            _download_links_step(elem, download_state, raw_download_links)
+
+            if elem is post_last:
+                post_last = None
+
+        # --- Page lookups (first match in document order, like soup.find) ---
+        if name is None:
+            continue
+        if name == 'h1':
+            if scan['title_h1'] is None and _has_class(elem, 'p-title-value'):
+                scan['title_h1'] = elem
+        elif name == 'title':
+            if scan['title_tag'] is None:
+                scan['title_tag'] = elem
+        elif name == 'article':
+            if scan['article'] is None and _has_class(elem, 'message--post'):
+                scan['article'] = elem
+        elif name == 'span':
+            if _has_class(elem, 'js-tagList'):
+                scan['tag_lists'].append(elem)
+        elif name == 'dl':
+            scan['dls'].append(elem)
+        elif name == 'div':
+            if _has_class(elem, 'tagGroup'):
+                scan['tag_groups'].append(elem)
+            elif (bb_wrapper is None and scan['article'] is not None and _has_class(elem, 'bbWrapper')
+                  and _is_under(elem, scan['article'])):
+                bb_wrapper = scan['bb_wrapper'] = elem
+                string_types = elem.interesting_string_types or elem.MAIN_CONTENT_STRING_TYPES
+                if elem.contents:
+                    post_last = elem._last_descendant()
+        if scan['status_field'] is None and _has_class(elem, 'js-threadStatusField'):
+            scan['status_field'] = elem
+
+    post['image_url'] = _cover_image_url(bb_image, fallback_src)
+    if bb_wrapper is not None:
+        post['full_description'] = _join_description(desc_elements, bb_wrapper)
+    post['download_links'] = _finalize_download_links(raw_download_links)
+    scan['post_fields'] = post
+    scan['post_text'] = "\\n".join(post_strings)
+    scan['header_candidates'] = [header_candidates[position] for position in sorted(header_candidates)]
+    return scan
+
+def _find_download_header(bb_wrapper, candidates=None):
+    """
+    The node the raw download block starts at, searched in the (spoiler-unwrapped) post.
+    candidates: nodes recorded by the single-pass walk; only those still in the post are checked.
+    """
+    nodes = bb_wrapper.descendants if candidates is None else (c for c in candidates if _is_under(c, bb_wrapper))
+    for elem in nodes:
+         # Check Headers/Strong tags directly
+         if elem.name in _DOWNLOAD_HEADER_TAGS:
+             if _is_download_header_text(elem.get_text(strip=True)):
+                 return elem
+
+         # Check isolated Text Nodes
+         if isinstance(elem, str):
+             if _is_download_header_text(elem) and elem.parent.name not in ['script', 'style', 'a']:
+                 # Promote to parent if parent is just a wrapper for this text
+                 if len(elem.parent.get_text(strip=True)) < 40:
+                     return elem.parent
+                 return elem # Just the text
+    return None
 
 # --- Parsing Function (Shared by Requests and Playwright) ---
-def parse_game_page_content(html_content, game_thread_url):
+def parse_game_page_content(html_content, game_thread_url, fast=None, engine=None, timings=None):
     """
     Parses the HTML content of a game thread page and extracts detailed information.
+    fast: parse only the slice of the page the extraction reads, using lxml (defaults to SCRAPER_FAST_PARSE).
+    engine: "legacy" or "single_pass" extraction (defaults to SCRAPER_PARSE_ENGINE).
+    timings: optional dict that receives the ms spent per parse phase (parse_soup, parse_title, ...).
     Returns a dictionary of game data.
     """
     if not html_content:
         return None
 
-    soup = BeautifulSoup(html_content, 'html.parser')
+    if fast is None:
+        fast = SCRAPER_FAST_PARSE
+    if engine is None:
+        engine = SCRAPER_PARSE_ENGINE
+    clock = scrape_metrics.PhaseClock(timings)
+    soup = _make_thread_soup(html_content, fast)
+    clock.lap('parse_soup')
+    # Single-pass engine: every lookup below reads from this one walk instead of searching the soup again
+    scan = _scan_page_single_pass(soup) if engine == 'single_pass' else None
+    if scan is not None:
+        clock.lap('parse_scan')
     
 
 
@@ -54,10 +712,10 @@ def parse_game_page_content(html_content, game_thread_url):
     }
     
 
-    raw_title_h1 = soup.find('h1', class_='p-title-value')
+    raw_title_h1 = scan['title_h1'] if scan else soup.find('h1', class_='p-title-value')
     if raw_title_h1:
         data['title_full_raw'] = raw_title_h1.get_text(strip=True)
-    elif page_title_element := soup.find('title'):
+    elif page_title_element := (scan['title_tag'] if scan else soup.find('title')):
         data['title_full_raw'] = page_title_element.get_text(strip=True).replace(" | F95zone", "")
     
     # 1. Robust Title String Parsing
@@ -98,25 +756,24 @@ def parse_game_page_content(html_content, game_thread_url):
         data['version_from_title'] = version_part
         data['author_from_title'] = author_part
 
+    clock.lap('parse_title')
+
     # --- II. Main Post Content Extraction ---
-    first_post_article_content = soup.find('article', class_='message--post')
-    bb_wrapper = first_post_article_content.find('div', class_='bbWrapper') if first_post_article_content else None
+    if scan:
+        first_post_article_content = scan['article']
+        bb_wrapper = scan['bb_wrapper']
+    else:
+        first_post_article_content = soup.find('article', class_='message--post')
+        bb_wrapper = first_post_article_content.find('div', class_='bbWrapper') if first_post_article_content else None
 
     if bb_wrapper:
-        # Developer/Author
-        strong_tags = bb_wrapper.find_all(['strong', 'b'])
-        for tag in strong_tags:
-            if tag.get_text(strip=True).lower().startswith("developer:"):
-                dev_name_candidate = tag.next_sibling
-                if dev_name_candidate and isinstance(dev_name_candidate, str) and dev_name_candidate.strip():
-                    data['author_from_post_label'] = dev_name_candidate.strip()
-                    break
-                elif dev_name_candidate and dev_name_candidate.name == 'a' and dev_name_candidate.get_text(strip=True):
-                    data['author_from_post_label'] = dev_name_candidate.get_text(strip=True)
-                    break
-                elif dev_name_candidate and dev_name_candidate.find(string=True, recursive=False) and dev_name_candidate.find(string=True, recursive=False).strip():
-                     data['author_from_post_label'] = dev_name_candidate.find(string=True, recursive=False).strip()
-                     break
+        # Developer/Author, Version, Image URL (Cover Image), Overview/Full Description, Download Links
+        post_fields = scan['post_fields'] if scan else _scan_first_post(bb_wrapper)
+        clock.lap('parse_first_post') # Description, cover image and download links
+        data['author_from_post_label'] = post_fields['author_from_post_label']
+        data['version_from_post'] = post_fields['version_from_post']
+        data['image_url'] = post_fields['image_url']
+        data['full_description'] = post_fields['full_description']
 
         # Thread starter
         if first_post_article_content:
@@ -126,110 +783,12 @@ def parse_game_page_content(html_content, game_thread_url):
                 if author_link_tag:
                     data['author_from_thread_starter'] = author_link_tag.get_text(strip=True)
 
-        # Version
-        for tag in strong_tags:
-            tag_text_lower = tag.get_text(strip=True).lower()
-            if any(kw in tag_text_lower for kw in ["version:", "current version:", "latest release:"]) and len(tag_text_lower) < 30:
-                version_candidate_text = ""
-                next_elem = tag.next_sibling
-                while next_elem and (isinstance(next_elem, str) and not next_elem.strip()):
-                    next_elem = next_elem.next_sibling
-                
-                if next_elem:
-                    if isinstance(next_elem, str) and next_elem.strip():
-                        version_candidate_text = next_elem.strip().splitlines()[0].strip()
-                    elif next_elem.name == 'a' and next_elem.get_text(strip=True):
-                        version_candidate_text = next_elem.get_text(strip=True)
-                    elif next_elem.name and next_elem.find(string=True, recursive=False) and next_elem.find(string=True, recursive=False).strip():
-                         version_candidate_text = next_elem.find(string=True, recursive=False).strip()
-
-                if version_candidate_text:
-                     data['version_from_post'] = version_candidate_text
-                     break 
-
- 
-
-        # Image URL (Cover Image)
-        # Usually the first image in the post
-        img_tag = bb_wrapper.find('img', class_='bbImage')
-        if img_tag and img_tag.get('src'):
-             data['image_url'] = img_tag.get('src')
-        elif img_tag and img_tag.get('data-url'):
-             data['image_url'] = img_tag.get('data-url')
-        else:
-             # Fallback for lazy loaded or other images
-             potential_imgs = bb_wrapper.find_all('img')
-             for img in potential_imgs:
-                 src = img.get('src') or img.get('data-src') or img.get('data-url')
-                 # Filter out smilies/attachments if possible, though bbImage class usually handles it
-                 if src and 'attachments' not in src and 'smilies' not in src:
-                     data['image_url'] = src
-                     break
-
-        # Overview/Full Description
-        desc_elements = []
-        stop_keywords = ['download', 'changelog', "what's new", "what is new", "version history", "updates", "installation", "preview", "screenshots", "spoiler:", "support the dev", "developer", "author", "version", "engine", "language", "status", "censorship", "release date", "thread updated", "os", "platform", "system", "genre", "tags"]
-        for elem in bb_wrapper.children:
-            elem_text_lower = ""
-            if elem.name and (elem.name.startswith('h') or elem.name == 'dl' or (elem.name == 'div' and any(cls in elem.get('class', []) for cls in ['bbCodeSpoiler', 'bbCodeBlock--download', 'bbCodeBlock--changelog'])) or (elem.name == 'button' and 'bbCodeSpoiler-button' in elem.get('class',[])) or (elem.name in ['strong','b'])):
-                elem_text_lower = elem.get_text(strip=True).lower()
-            
-            if (elem_text_lower and any(kw in elem_text_lower for kw in stop_keywords) and len(elem_text_lower) < 70) or elem.name == 'dl':
-                # Check for "Overview" header exception - if it's just "Overview" we might want to skip the header but continue content
-                if "overview" in elem_text_lower or "description" in elem_text_lower or "plot" in elem_text_lower or "story" in elem_text_lower:
-                     continue # Skip the header itself, but don't break the loop
-                
-                is_likely_section_header = True
-                if is_likely_section_header:
-                    break
-            
-            if isinstance(elem, str):
-                cleaned_text = elem.strip()
-                if cleaned_text: 
-                     # Remove literal "\n" characters if they appear in text (common in some raw dumps) and standard newlines
-                     cleaned_text = cleaned_text.replace("\\n", " ").replace("\n", " ")
-                     desc_elements.append(cleaned_text)
-            elif elem.name not in ['script', 'style', 'iframe', 'form', 'input', 'textarea', 'select', 'button']:
-                if elem.name == 'div' and 'bbCodeSpoiler' in elem.get('class', []):
-                    button_text_spoiler = elem.find('button', class_='bbCodeSpoiler-button')
-                    if button_text_spoiler and not any(kw in button_text_spoiler.get_text(strip=True).lower() for kw in stop_keywords):
-                         spoiler_text = button_text_spoiler.get_text(strip=True).replace("\\n", " ").replace("\n", " ")
-                         desc_elements.append(spoiler_text)
-                elif elem.name == 'br':
-                    desc_elements.append("\n") # Mark paragraph breaks explicitly
-                else:
-                    text = elem.get_text(separator=' ', strip=True) # Use space separator for inline tags
-                    if "You don't have permission to view the spoiler content" not in text and "Log in or register now" not in text:
-                        text = text.replace("\\n", " ").replace("\n", " ")
-                        desc_elements.append(text)
-        
-        # smart join: join with spaces, but respect explicit newlines we added for <br>
-        full_desc_str = ""
-        for item in desc_elements:
-            if item == "\n":
-                full_desc_str += "\n\n"
-            else:
-                # Collapse multiple spaces
-                clean_item = re.sub(r'\s+', ' ', item).strip()
-                if clean_item:
-                    full_desc_str += clean_item + " "
-        
-        data['full_description'] = re.sub(r'\n{3,}', '\n\n', full_desc_str).strip()
-
-        if not data['full_description']:
-             data['full_description'] = bb_wrapper.get_text(separator='\n', strip=True)
-
-        # Release Date
-        release_date_patterns = [r"(?:Release Date|Released|Initial Release|First Release)\s*[:\-]?\s*([^\n]+)", r"<strong>(?:Release Date|Released|Initial Release|First Release)\s*[:\-]?\s*</strong>\s*([^\n]+)"]
-        bb_wrapper_text_for_dates = bb_wrapper.get_text(separator="\\n")
-        for pattern in release_date_patterns:
-            match = re.search(pattern, bb_wrapper_text_for_dates, re.IGNORECASE)
-            if match and match.group(1).strip():
-                potential_date_str = match.group(1).strip()
-                cleaned_val = re.sub(r"^\\s*[:\\-\\s]\\s*", "", potential_date_str).strip()
-                if cleaned_val and len(cleaned_val) < 50 and any(c.isdigit() for c in cleaned_val):
-                    data['release_date'] = cleaned_val.split('\\n')[0].strip()
-                    break
+        # Release Date, OS Listing, Language, Censorship, Status ("Label: value" lines, see _LABEL_FIELD_RULES)
+        bb_wrapper_text_for_dates = scan['post_text'] if scan else bb_wrapper.get_text(separator="\\n")
+        label_fields = _scan_label_fields(bb_wrapper_text_for_dates)
+        for field in ('release_date', 'os_general_list', 'language', 'censorship'):
+            if field in label_fields and data[field] == "Not found":
+                data[field] = label_fields[field]
 
         # Thread Updated Date
         if first_post_article_content:
@@ -239,27 +798,6 @@ def parse_game_page_content(html_content, game_thread_url):
             elif time_tag:
                 data['thread_updated_date'] = time_tag.get_text(strip=True)
 
-        # OS Listing
-        os_patterns = [r"(?:Platform|OS|Systems|Support[s]?)\s*[:\-]?\s*([^\n]+)", r"<strong>(?:Platform|OS|Systems|Support[s]?)\s*[:\-]?\s*</strong>\s*([^\n]+)"]
-        for pattern in os_patterns:
-            match = re.search(pattern, bb_wrapper_text_for_dates, re.IGNORECASE)
-            if match and match.group(1).strip():
-                os_list_str_raw = match.group(1).strip()
-                cleaned_os_list_str = re.sub(r"^\\s*[:\\-\\s]\\s*", "", os_list_str_raw).strip().split('\\n')[0].strip()
-                if cleaned_os_list_str and len(cleaned_os_list_str) < 100:
-                    data['os_general_list'] = cleaned_os_list_str
-                    break
-
-        # Language
-        language_patterns = [r"(?:Language[s]?)\s*[:\-]?\s*([^\n]+)", r"<strong>(?:Language[s]?)\s*[:\-]?\s*</strong>\s*([^\n]+)"]
-        if data['language'] == "Not found":
-            for pattern in language_patterns:
-                match = re.search(pattern, bb_wrapper_text_for_dates, re.IGNORECASE)
-                if match and match.group(1).strip():
-                    lang_str_raw = match.group(1).strip()
-                    cleaned_lang_str = re.sub(r"^\\s*[:\\-\\s]\\s*", "", lang_str_raw).strip().split('\\n')[0].strip()
-                    if cleaned_lang_str and len(cleaned_lang_str) < 150:
-                        data['language'] = cleaned_lang_str
         if data['status'] == "Not found" and data['title_full_raw']:
              # Fallback: Check Title for Status Prefixes (e.g. "Abandoned Game Name")
              lower_title = data['title_full_raw'].lower()
@@ -271,7 +809,7 @@ def parse_game_page_content(html_content, game_thread_url):
         # Status
         # Priority 1: Check .js-threadStatusField (Dynamic/Structured)
         if data['status'] == "Not found":
-            status_div = soup.select_one(".js-threadStatusField")
+            status_div = scan['status_field'] if scan else soup.select_one(".js-threadStatusField")
             if status_div:
                 raw_val = status_div.get_text(strip=True)
                 logger_scraper.warning(f"Found .js-threadStatusField. Raw content: '{raw_val}'")
@@ -284,173 +822,24 @@ def parse_game_page_content(html_content, game_thread_url):
             else:
                 logger_scraper.warning(".js-threadStatusField NOT found in parsed HTML.")
 
-        status_patterns = [r"(?:Status)\s*[:\-]?\s*([^\n]+)", r"<strong>(?:Status)\s*[:\-]?\s*</strong>\s*([^\n]+)"]
-        if data['status'] == "Not found":
-            for pattern in status_patterns:
-                match = re.search(pattern, bb_wrapper_text_for_dates, re.IGNORECASE)
-                if match and match.group(1).strip():
-                    status_str_raw = match.group(1).strip()
-                    cleaned_status_str = re.sub(r"^\\s*[:\\-\\s]\\s*", "", status_str_raw).strip().split('\\n')[0].strip()
-                    if cleaned_status_str and len(cleaned_status_str) < 100:
-                        data['status'] = cleaned_status_str
-                        break
-        
+        if data['status'] == "Not found" and 'status' in label_fields:
+            data['status'] = label_fields['status']
+
         if data['status'] == "Not found":
-             for b_tag in bb_wrapper.find_all(['b', 'strong']):
-                 if "status" in b_tag.get_text(strip=True).lower():
-                     next_sib = b_tag.next_sibling
-                     if next_sib:
-                         val = next_sib.get_text(strip=True) if not isinstance(next_sib, str) else next_sib
-                         val = val.strip().lstrip(':-').strip()
-                         if val:
-                             data['status'] = val
-                             break
-
-        # Censorship
-        censorship_patterns = [r"(?:Censorship|Censored)\s*[:\-]?\s*([^\n]+)", r"<strong>(?:Censorship|Censored)\s*[:\-]?\s*</strong>\s*([^\n]+)"]
-        if data['censorship'] == "Not found":
-            for pattern in censorship_patterns:
-                match = re.search(pattern, bb_wrapper_text_for_dates, re.IGNORECASE)
-                if match and match.group(1).strip():
-                    cen_str_raw = match.group(1).strip()
-                    cleaned_cen_str = re.sub(r"^\\s*[:\\-\\s]\\s*", "", cen_str_raw).strip().split('\\n')[0].strip()
-                    if cleaned_cen_str and len(cleaned_cen_str) < 50:
-                        data['censorship'] = cleaned_cen_str
-                        break
-        
-        # Download Links
-        raw_download_links = []
-        support_link_domains = ['patreon.com', 'subscribestar.adult', 'discord.gg', 'discord.com', 'itch.io', 'buymeacoffee.com', 'ko-fi.com', 'store.steampowered.com', 'paypal.com', 'subscribestar.com', 'gumroad.com', 'fanbox.cc', 'fantia.jp', 'boosty.to', 'youtube.com', 'twitter.com', 'x.com', 'facebook.com', 'instagram.com', 'reddit.com']
-        download_section_headers_texts = ['download', 'links', 'files']
-        download_elements = bb_wrapper.descendants
-        
-        # Add 'win' to keywords list explicitly
-        os_section_keywords = ['windows', 'pc', 'linux', 'mac', 'macos', 'osx', 'android', 'win']
-        current_section_os = None
-        
-        for elem in download_elements:
-             # Skip empty text or irrelevant tags
-             if isinstance(elem, str):
-                 text_content = str(elem).strip()
-                 if not text_content: continue
-                 # Text node analysis
-                 current_element_text_lower = text_content.lower()
-                 is_header_like = True # Treat significant text nodes as potential headers
-             elif elem.name in ['h1','h2','h3','h4','strong','b','p','span','div','u','li']:
-                 current_element_text_lower = elem.get_text(separator=' ', strip=True).lower()
-                 if current_element_text_lower.startswith(('-', '|', '•')):
-                      is_header_like = False
-                 else:
-                      is_header_like = True
-             elif elem.name == 'a':
-                 # Link processing happens below
-                 current_element_text_lower = "" 
-                 is_header_like = False
-             else:
-                 continue
-            
-             if is_header_like and len(current_element_text_lower) >= 2:
-                 # Check for OS keywords
-                 text_to_check = current_element_text_lower[:100] 
-                 
-                 found_os = False
-                 # Only trigger OS detection if the element itself is likely a header (short)
-                 if len(current_element_text_lower) < 100:
-                     if any(os_kw in text_to_check for os_kw in os_section_keywords):
-                         if any(kw in text_to_check for kw in ['windows', 'pc', 'win ', 'win/']): current_section_os = 'win'
-                         elif 'linux' in text_to_check: current_section_os = 'linux'
-                         elif any(kw in text_to_check for kw in ['mac', 'osx', 'macos']): current_section_os = 'mac'
-                         elif 'android' in text_to_check: current_section_os = 'android'
-                         
-                         # Check if we are inside a restricted spoiler (Split/Update/Patch)
-                         try:
-                             parent = elem.parent if isinstance(elem, str) else elem
-                             ancestor_spoilers = parent.find_parents('div', class_='bbCodeSpoiler')
-                             for spoiler_div in ancestor_spoilers:
-                                 btn = spoiler_div.find('button', class_='bbCodeSpoiler-button')
-                                 if btn:
-                                     btn_text = btn.get_text(strip=True).lower()
-                                     if any(bad in btn_text for bad in ['split', 'update', 'part', 'extra', 'patch']):
-                                         current_section_os = 'extras'
-                                         break
-                         except: pass
-                         
-                         found_os = True
-                
-                 # If valid OS found, we update. 
-                 # If not, check if it's a generic "Download" header which should reset the OS
-                 if not found_os:
-                     if any(hdr_kw in text_to_check for hdr_kw in download_section_headers_texts) and len(text_to_check) < 50:
-                         current_section_os = None
-                     elif any(kw in text_to_check for kw in ['translation', 'patch', 'mod', 'extra', 'update', 'split', 'part ']):
-                         current_section_os = 'extras'
-
-             if elem.name == 'a' and elem.get('href'):
-                 href = elem.get('href')
-                 text = elem.get_text(strip=True)
-                 
-                 if not href or href.startswith(('#', 'mailto:', 'javascript:')) or "f95zone.to/account/" in href or "f95zone.to/members/" in href : 
-                     continue
-                 if "attachments.f95zone.to" in href.lower(): 
-                     continue
-
-                 try:
-                     link_domain = re.match(r"https://?([^/]+)", href).group(1).replace("www.", "")
-                     if any(support_domain in link_domain for support_domain in support_link_domains): 
-                         continue
-                 except: pass
-
-                 if "f95zone.to/threads/" in href and not any(ext in href.lower() for ext in ['.zip', '.rar', '.apk', '.7z', '.exe', '.patch', '.mod']):
-                     if not any(kw in text.lower() for kw in ['mod', 'patch', 'translation', 'download', 'fix', 'guide', 'update', 'part', 'unlocker']): 
-                         continue
-
-                 link_os = 'unknown'
-                 
-                 # Force 'extras' for specific keywords in link text or url (overrides section OS)
-                 is_extra_content = False
-                 lower_text = text.lower()
-                 lower_href = href.lower()
-                 
-                 if any(kw in lower_text for kw in ['update', 'patch', 'fix', 'mod', 'translation', 'guide', 'walkthrough', 'part ', 'unlocker', 'cheat']) or \
-                    any(kw in lower_href for kw in ['.part1', '.part2', '.part3', '.part4', '.part5']):
-                     link_os = 'extras'
-                     is_extra_content = True
-
-                 if not is_extra_content:
-                     if current_section_os: 
-                         link_os = current_section_os
-                     else:
-                         if any(kw in lower_text for kw in ['win ', ' pc ', '.exe', '[win]', '(win)', 'windows', '(pc)', '[pc]']) or any(kw in lower_href for kw in ['_pc.', '.exe']): link_os = 'win'
-                         elif any(kw in lower_text for kw in ['linux', '.deb', '.sh', '[linux]', '(linux)', '_linux.']) or any(kw in lower_href for kw in ['_linux.', '.sh']): link_os = 'linux'
-                         elif any(kw in lower_text for kw in ['mac', 'osx', '.dmg', '[mac]', '(mac)', '_mac.']) or any(kw in lower_href for kw in ['_mac.', '.dmg']): link_os = 'mac'
-                         elif any(kw in lower_text for kw in ['android', '.apk', '[android]', '(android)', '_apk.']) or any(kw in lower_href for kw in ['_apk.', '.apk']): link_os = 'android'
-                         elif any(kw in lower_text for kw in ['extra', 'dlc', 'optional', 'bonus', 'soundtrack']): link_os = 'extras'
-                 
-                 raw_download_links.append({'text': text, 'url': href, 'os_determined': link_os})
-
-        unique_links_map = {}
-        for link_info in raw_download_links:
-            key = (link_info['url'], link_info['text'])
-            if key not in unique_links_map: unique_links_map[key] = link_info
-        
-        final_raw_links_with_os = list(unique_links_map.values())
-        has_win_links = any(link['os_determined'] == 'win' for link in final_raw_links_with_os)
-        has_linux_links = any(link['os_determined'] == 'linux' for link in final_raw_links_with_os)
-
-        if has_win_links or has_linux_links:
-            for link in final_raw_links_with_os:
-                if link['os_determined'] in ['win', 'linux', 'mac', 'android', 'extras']:
-                    data['download_links'].append({'text': link['text'], 'url': link['url'], 'os_type': link['os_determined']})
-        else:
-            for link in final_raw_links_with_os:
-                data['download_links'].append({'text': link['text'], 'url': link['url'], 'os_type': link['os_determined']})
+             status_from_label = post_fields['status_from_label'] if scan else _status_from_labels(bb_wrapper)
+             if status_from_label:
+                 data['status'] = status_from_label
+
+        data['download_links'] = post_fields['download_links']
+
+    clock.lap('parse_metadata')
 
     # --- Raw Download Block Extraction (Hybrid HTML) ---
     if bb_wrapper:  
         try:
             # Pre-process: Globally Unwrap Spoilers in the wrapper
             # This ensures we catch them at any depth before we start linear scanning
-            all_spoilers = bb_wrapper.find_all('div', class_='bbCodeSpoiler')
+            all_spoilers = scan['spoilers'] if scan else bb_wrapper.find_all('div', class_='bbCodeSpoiler')
             for sp in all_spoilers:
                 content_div = sp.find('div', class_='bbCodeBlock-content')
                 if content_div:
@@ -460,35 +849,9 @@ def parse_game_page_content(html_content, game_thread_url):
                 else:
                     sp.decompose() # Remove empty/broken spoilers
 
-            download_header_node = None
-            
             # 1. Find the "DOWNLOAD" start marker
-            # Strategy: Look for "DOWNLOAD" string in case-insensitive way.
             # We want the *highest* logical node that represents just the header.
-            # Iterate descendants once?
-            
-            # Helper to check if text is predominantly "DOWNLOAD"
-            def is_download_header_text(txt):
-                if not txt: return False
-                t = txt.strip().lower()
-                return "download" in t and len(t) < 30 and "below" not in t and "click" not in t # "Click download below" vs "DOWNLOAD"
-
-            for elem in bb_wrapper.descendants:
-                 # Check Headers/Strong tags directly
-                 if elem.name in ['h1','h2','h3','h4','strong','b','u','span']:
-                     if is_download_header_text(elem.get_text(strip=True)):
-                         download_header_node = elem
-                         break
-                 
-                 # Check isolated Text Nodes
-                 if isinstance(elem, str):
-                     if is_download_header_text(elem) and elem.parent.name not in ['script', 'style', 'a']:
-                         # Promote to parent if parent is just a wrapper for this text
-                         if len(elem.parent.get_text(strip=True)) < 40:
-                             download_header_node = elem.parent
-                         else:
-                             download_header_node = elem # Just the text
-                         break
+            download_header_node = _find_download_header(bb_wrapper, scan['header_candidates'] if scan else None)
             
             if download_header_node:
                 captured_html = ""
@@ -698,6 +1061,8 @@ def parse_game_page_content(html_content, game_thread_url):
         except Exception as e:
             logger_scraper.error(f"Error extracting raw download html: {e}")
 
+    clock.lap('parse_downloads')
+
     # --- Tags ---
     data['tags'] = []
     
@@ -705,7 +1070,12 @@ def parse_game_page_content(html_content, game_thread_url):
     system_tags_found = False
     
     # Check for XenForo 2.x standard tag list
-    if tags_span_container := soup.find('span', class_='js-tagList'):
+    if scan:
+        # The walk ran before the download block extraction changed the post; take the first node still in place
+        tags_span_container = next((t for t in scan['tag_lists'] if t.name == 'span' and _has_class(t, 'js-tagList') and _is_under(t, soup)), None)
+    else:
+        tags_span_container = soup.find('span', class_='js-tagList')
+    if tags_span_container:
         tag_links = tags_span_container.find_all('a', class_='tagItem')
         for tag_link in tag_links:
             tag_text = tag_link.get_text(strip=True)
@@ -714,7 +1084,11 @@ def parse_game_page_content(html_content, game_thread_url):
                 system_tags_found = True
 
     if not system_tags_found:
-        if tags_container := soup.find('div', class_='tagGroup'):
+        if scan:
+            tags_container = next((t for t in scan['tag_groups'] if t.name == 'div' and _has_class(t, 'tagGroup') and _is_under(t, soup)), None)
+        else:
+            tags_container = soup.find('div', class_='tagGroup')
+        if tags_container:
             tag_links = tags_container.find_all('a', class_='tagItem')
             for tag_link in tag_links:
                 tag_text = tag_link.get_text(strip=True)
@@ -724,7 +1098,10 @@ def parse_game_page_content(html_content, game_thread_url):
 
     # Priority 2: Spoiler "Genre/Tags" in post (Fallback)
     if not system_tags_found and bb_wrapper: 
-        spoilers_for_tags = bb_wrapper.find_all('div', class_='bbCodeSpoiler')
+        if scan:
+            spoilers_for_tags = [sp for sp in scan['spoilers'] if sp.name == 'div' and _has_class(sp, 'bbCodeSpoiler') and _is_under(sp, bb_wrapper)]
+        else:
+            spoilers_for_tags = bb_wrapper.find_all('div', class_='bbCodeSpoiler')
         for spoiler in spoilers_for_tags:
             button = spoiler.find('button', class_='bbCodeSpoiler-button')
             content_div = spoiler.find('div', class_='bbCodeSpoiler-content')
@@ -755,15 +1132,24 @@ def parse_game_page_content(html_content, game_thread_url):
     
     # Priority 3: Old/Legacy formats
     if not data['tags'] and bb_wrapper: 
-        if tags_dt := bb_wrapper.find('dt', string=lambda t: t and 'tags' in t.lower()):
+        if scan:
+            tags_dt = next((dt for dt in scan['dts'] if dt.name == 'dt' and dt.string and 'tags' in dt.string.lower() and _is_under(dt, bb_wrapper)), None)
+        else:
+            tags_dt = bb_wrapper.find('dt', string=lambda t: t and 'tags' in t.lower())
+        if tags_dt:
             if tags_dd := tags_dt.find_next_sibling('dd'): 
                 tag_links = tags_dd.find_all('a')
                 for tag_link in tag_links:
                     tag_text = tag_link.get_text(strip=True)
                     if tag_text not in data['tags']: data['tags'].append(tag_text)
 
+    clock.lap('parse_tags')
+
     # --- DL Lists ---
-    dls = soup.find_all('dl')
+    if scan:
+        dls = [dl for dl in scan['dls'] if dl.name == 'dl' and _is_under(dl, soup)]
+    else:
+        dls = soup.find_all('dl')
     for dl_element in dls:
         dt_elements = dl_element.find_all('dt')
         for dt in dt_elements:
@@ -864,113 +1250,274 @@ def parse_game_page_content(html_content, game_thread_url):
             logger_scraper.warning(f"Sanitizing unknown status '{result_data['status']}' to 'Unknown'")
             result_data['status'] = "Unknown"
 
+    clock.lap('parse_metadata') # DL lists, engine inference, consolidation
     return result_data
 
 
+# --- HTTP Fast Path ---
+# Most thread pages are static XenForo HTML, so a plain GET with the browser's cookies is enough.
+# The browser is only needed when the site serves a challenge or the first post is missing.
+_RE_FIRST_POST_ARTICLE = re.compile(r'<article[^>]+class="[^"]*\bmessage--post\b')
+_CHALLENGE_MARKERS = (
+    "<title>Just a moment...</title>", # Cloudflare interstitial
+    "_cf_chl_opt",
+    "cf-browser-verification",
+    "Checking your browser before accessing",
+    "<title>DDoS-Guard</title>",
+)
+
+def _browser_session_cookies(username):
+    """
+    The persisted browser session cookies (see BrowserService) for `username` as a cookie jar, or None.
+    The jar is passed per request; it must never be merged into a shared client session.
+    """
+    owner, storage_state = load_storage_state()
+    if not storage_state or owner != username:
+        return None
+
+    now = time.time()
+    jar = requests.cookies.RequestsCookieJar()
+    applied = 0
+    for cookie in storage_state.get('cookies', []):
+        if 'f95zone.to' not in cookie.get('domain', ''):
+            continue
+        expires = cookie.get('expires', -1)
+        if expires not in (-1, None) and expires < now:
+            continue
+        jar.set(cookie['name'], cookie['value'], domain=cookie['domain'], path=cookie.get('path', '/'))
+        applied += 1
+    return jar if applied else None
+
+def _http_fallback_reason(html_content, expect_logged_in):
+    """Returns why an HTTP-fetched thread page is unusable, or None if it can be parsed as-is."""
+    if not html_content:
+        return "empty response"
+    if any(marker in html_content for marker in _CHALLENGE_MARKERS):
+        return "challenge page"
+    if not _RE_FIRST_POST_ARTICLE.search(html_content):
+        return "missing article.message--post"
+    if expect_logged_in and "p-navgroup--member" not in html_content:
+        return "session cookies not accepted (guest page)"
+    return None
+
+def _fetch_thread_html_http(f95_client, game_thread_url, username=None):
+    """
+    Tries a single direct GET of the thread through F95ApiClient with the authenticated cookies.
+    The cookies go with this request only, and it never falls back to a proxy.
+    Returns the HTML, or None if the caller should fall back to Playwright.
+    """
+    cookies = None
+    if username:
+        cookies = _browser_session_cookies(username)
+        if cookies is None:
+            logger_scraper.info("EXTRACT_GAME_DATA: No stored browser session yet. Skipping HTTP fast path.")
+            return None
+    has_session = cookies is not None
+
+    if not f95_client.direct_circuit.allow_direct():
+        logger_scraper.info("EXTRACT_GAME_DATA: Direct connections are failing (circuit open). Skipping HTTP fast path.")
+        return None
+
+    try:
+        response = f95_client._make_request("GET", game_thread_url, max_attempts=1, cookies=cookies, allow_proxy=False)
+    except Exception as e:
+        logger_scraper.warning(f"EXTRACT_GAME_DATA: HTTP fast path request failed: {e}")
+        return None
+
+    if response is None or response.status_code != 200:
+        logger_scraper.info(f"EXTRACT_GAME_DATA: HTTP fast path got status {response.status_code if response is not None else 'No Response'}. Falling back to Playwright.")
+        return None
+
+    reason = _http_fallback_reason(response.text, expect_logged_in=has_session)
+    if reason:
+        logger_scraper.info(f"EXTRACT_GAME_DATA: HTTP fast path unusable ({reason}). Falling back to Playwright.")
+        return None
+    return response.text
+
+
 # --- Playwright Fallback Logic ---
-def login_to_f95zone(page, username, password, target_url_after_login=None):
+async def _paced_goto(page, url, timings=None, **kwargs):
+    """page.goto through the process-wide rate limiter shared with F95ApiClient (sleeps without blocking the browser loop)."""
+    limiter = get_rate_limiter()
+    wait = limiter.reserve(url)
+    if wait is None:
+        raise RuntimeError(f"Rate limiter has no slot for {url} within the wait limit")
+    if wait > 0:
+        with scrape_metrics.timed_phase(timings, 'rate_limit_wait'):
+            await asyncio.sleep(wait)
+    with scrape_metrics.timed_phase(timings, 'goto'):
+        response = await page.goto(url, **kwargs)
+    if response is not None:
+        limiter.record_response(url, response.status, response.headers.get('retry-after'))
+    return response
+
+async def login_to_f95zone(page, username, password, target_url_after_login=None):
     """
     Logs into F95zone using Playwright.
     """
     try:
         logger_scraper.info("Login Attempt: Initiated.")
-        page.fill("input[name='login']", username)
-        page.fill("input[name='password']", password)
+        await page.fill("input[name='login']", username)
+        await page.fill("input[name='password']", password)
         login_button = page.locator("button.button--primary", has_text="Log in")
-        if not login_button.count(): 
+        if not await login_button.count(): 
             login_button = page.locator("form.block[action='/login/login'] button[type='submit']")
-        if not login_button.count():
+        if not await login_button.count():
             login_button = page.get_by_role("button", name=re.compile(r"log in", re.IGNORECASE))
 
-        if login_button.count():
-            login_button.first.click(timeout=25000) 
-            page.wait_for_load_state("domcontentloaded", timeout=15000)
+        if await login_button.count():
+            await login_button.first.click(timeout=25000) 
+            await page.wait_for_load_state("domcontentloaded", timeout=15000)
         else:
             return False
 
         # Check for login success
-        if page.query_selector(f"div.p-account.p-navgroup--member span.p-navgroup-linkText:text-matches('{re.escape(username)}')"):
+        if await page.query_selector(f"div.p-account.p-navgroup--member span.p-navgroup-linkText:text-matches('{re.escape(username)}')"):
             if target_url_after_login:
-                page.goto(target_url_after_login, timeout=60000, wait_until="domcontentloaded")
+                await _paced_goto(page, target_url_after_login, timeout=60000, wait_until="domcontentloaded")
             return True
         return False
     except Exception as e:
         logger_scraper.error(f"LOGIN ERROR: {e}")
         return False
 
-def extract_game_data(game_thread_url, username=None, password=None, requests_session=None):
+async def _page_shows_logged_in(page, username):
+    """Cheap session probe: checks the already-loaded page's nav bar for the member menu."""
+    try:
+        return await page.query_selector(f"div.p-account.p-navgroup--member span.p-navgroup-linkText:text-matches('{re.escape(username)}')") is not None
+    except Exception:
+        return False
+
+async def _ensure_logged_in(service, page, username, password):
     """
-    Extracts detailed information from an F95zone game thread page.
-    Uses authenticated Playwright scraping ONLY (Requests fallback removed for robustness).
+    Makes sure the shared browser context carries a session for `username`.
+    A session restored from the persisted storage state is trusted until a loaded page
+    shows it expired, so the login form is only used on demand.
     """
-    logger_scraper.info(f"EXTRACT_GAME_DATA: Starting extraction for: {game_thread_url}")
-    
-    # NOTE: requests_session argument is kept for signature compatibility but ignored.
+    if service.context_state.get('session_owner') == username:
+        return True
 
-    logger_scraper.info("EXTRACT_GAME_DATA: Initiating Playwright session.")
-    try:
-        with sync_playwright() as p:
-            # Launch options - headless but can be toggled for debugging
-            browser = p.chromium.launch(headless=True)
-            
-            # Browser Context with standard User Agent
-            context = browser.new_context(user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-            page = context.new_page()
-            
-            # 1. Login Logic
-            logged_in = False
-            if username and password:
-                # Go to login page first
-                logger_scraper.info("EXTRACT_GAME_DATA: Navigating to login page...")
-                page.goto("https://f95zone.to/login/login", wait_until="domcontentloaded", timeout=45000)
-                
-                # Perform login
-                logged_in = login_to_f95zone(page, username, password, target_url_after_login=game_thread_url)
-                if not logged_in:
-                     logger_scraper.warning("EXTRACT_GAME_DATA: Login failed or not verified. Will attempt to scrape as Guest (likely to fail for some content).")
-            else:
-                 logger_scraper.warning("EXTRACT_GAME_DATA: No credentials provided. Scraping as Guest.")
-            
-            # 2. Navigate to Game Thread (if not already there from login redirect)
-            if not logged_in or page.url != game_thread_url:
-                 logger_scraper.info(f"EXTRACT_GAME_DATA: Navigating to game thread: {game_thread_url}")
-                 page.goto(game_thread_url, wait_until="domcontentloaded", timeout=60000)
-
-            # 3. Smart Waits & Interaction
-            # Wait for the main post content to be visible - this is the signal the useful part has loaded.
-            try:
-                page.wait_for_selector("article.message--post", timeout=15000)
-            except Exception:
-                logger_scraper.warning("EXTRACT_GAME_DATA: Timeout waiting for article.message--post. Page might be broken or Cloudflare blocked.")
-            
-            # Expand Spoilers (Legacy logic, helpful for full text)
-            try:
-                # We only click spoilers that might look like "Tags" or "Genre" or generic triggers
-                # But typically we unwrap them in the soup parser anyway. 
-                # Clicking them in JS ensures the DOM is fully hydrated if they are lazy loaded.
-                
-                # Check if we have any spoilers
-                if page.locator("button.bbCodeSpoiler-button").count() > 0:
-                    # Click all visible ones? Risks clicking 'download' spoilers that we want to parse structure of.
-                    # Actually, we want to click them so the HTML snapshot contains the expanded content.
-                    # LIMIT: Only click first 10 to avoid stalling on massive Changelogs?
-                    # The soup parser handles unwrapping global spoilers now, so this might be redundant 
-                    # UNLESS content isn't in DOM until clicked (unlikely for XF2).
-                    # We'll skip massive clicking to speed things up, trusting the Soup 'Global Unwrap' logic.
-                    pass 
-            except: pass
-
-            # Safety Buffer - minimal wait to allow any final JS (like status field) to settle
-            # Reduced from 5000 to 1500
-            page.wait_for_timeout(1500) 
-            
-            # 4. Capture Content
-            html_content = page.content()
-            browser.close()
+    async with service.context_lock:
+        # Another page may have logged in while we waited for the lock
+        if service.context_state.get('session_owner') == username:
+            return True
+        if service.context_state.get('login_failed_for') == username:
+            return False
 
-            logger_scraper.info("EXTRACT_GAME_DATA: Playwright fetch complete. Parsing content...")
-            return parse_game_page_content(html_content, game_thread_url)
+        logger_scraper.info("EXTRACT_GAME_DATA: Navigating to login page...")
+        await _paced_goto(page, "https://f95zone.to/login/login", wait_until="domcontentloaded", timeout=45000)
+        if await login_to_f95zone(page, username, password):
+            service.context_state['session_owner'] = username
+            service.context_state['session_verified'] = True
+            await service.save_storage_state()
+            return True
 
+        # Don't retry on every page; the next browser recycle gets a fresh attempt
+        service.context_state['login_failed_for'] = username
+        return False
+
+async def _goto_thread(page, game_thread_url, timings=None):
+    logger_scraper.info(f"EXTRACT_GAME_DATA: Navigating to game thread: {game_thread_url}")
+    await _paced_goto(page, game_thread_url, timings, wait_until="domcontentloaded", timeout=60000)
+
+    # Wait for the main post content to be visible - this is the signal the useful part has loaded.
+    # Spoilers are not clicked: the soup parser unwraps them globally.
+    try:
+        with scrape_metrics.timed_phase(timings, 'wait_for_selector'):
+            await page.wait_for_selector("article.message--post", timeout=15000)
+    except Exception:
+        logger_scraper.warning("EXTRACT_GAME_DATA: Timeout waiting for article.message--post. Page might be broken or Cloudflare blocked.")
+
+# Ready once the first post's bbWrapper exists and, where the thread has a status field,
+# that field has been filled in (it is populated client-side on some layouts).
+_THREAD_READY_JS = """() => {
+    if (!document.querySelector('article.message--post .bbWrapper')) return false;
+    const status = document.querySelector('.js-threadStatusField');
+    return !status || status.textContent.trim().length > 0;
+}"""
+
+async def _wait_for_thread_ready(page):
+    """Waits (at most SCRAPER_READY_CAP_MS) for the nodes the parser reads, recording how long it took."""
+    started = time.monotonic()
+    try:
+        await page.wait_for_function(_THREAD_READY_JS, timeout=SCRAPER_READY_CAP_MS)
+    except Exception:
+        logger_scraper.info(f"EXTRACT_GAME_DATA: Page not fully ready after {SCRAPER_READY_CAP_MS} ms, capturing it as is.")
+    waited_ms = (time.monotonic() - started) * 1000
+    scrape_metrics.record('thread_ready_wait_ms', waited_ms)
+    logger_scraper.debug(f"EXTRACT_GAME_DATA: Page ready after {waited_ms:.0f} ms.")
+
+async def _fetch_thread_html(service, page, game_thread_url, username, password, timings=None):
+    """Loads a game thread on a pooled page and returns the rendered HTML. timings receives per-phase ms."""
+    # 1. Login Logic
+    has_credentials = bool(username and password)
+    if has_credentials:
+        with scrape_metrics.timed_phase(timings, 'login'):
+            logged_in = await _ensure_logged_in(service, page, username, password)
+        if not logged_in:
+            logger_scraper.warning("EXTRACT_GAME_DATA: Login failed or not verified. Will attempt to scrape as Guest (likely to fail for some content).")
+    else:
+        logger_scraper.warning("EXTRACT_GAME_DATA: No credentials provided. Scraping as Guest.")
+
+    # 2. Navigate to Game Thread
+    await _goto_thread(page, game_thread_url, timings)
+
+    # 3. Session Probe - the thread page itself tells us whether the (restored) cookies still work
+    if has_credentials and service.context_state.get('session_owner') == username:
+        if await _page_shows_logged_in(page, username):
+            service.context_state['session_verified'] = True
+        else:
+            logger_scraper.info("EXTRACT_GAME_DATA: Stored F95zone session has expired. Logging in again.")
+            service.invalidate_session()
+            with scrape_metrics.timed_phase(timings, 'login'):
+                logged_in = await _ensure_logged_in(service, page, username, password)
+            if logged_in:
+                await _goto_thread(page, game_thread_url, timings)
+
+    # Wait only for what the parser reads (first post body, status field) instead of a fixed sleep
+    with scrape_metrics.timed_phase(timings, 'settle_wait'):
+        await _wait_for_thread_ready(page)
+
+    # 4. Capture Content
+    with scrape_metrics.timed_phase(timings, 'page_content'):
+        return await page.content()
+
+def fetch_game_page_html(game_thread_url, username=None, password=None, f95_client=None, timings=None):
+    """
+    Fetches the raw HTML of an F95zone game thread page.
+    Tiered fetch: when an F95ApiClient is given, a plain HTTP GET with the browser session's
+    cookies is tried first; authenticated Playwright (pooled via BrowserService) is the fallback.
+    timings: optional dict that receives the ms spent per fetch phase.
+    Returns None if both fail.
+    """
+    if f95_client is not None:
+        with scrape_metrics.timed_phase(timings, 'http_fetch'):
+            html_content = _fetch_thread_html_http(f95_client, game_thread_url, username if password else None)
+        if html_content:
+            logger_scraper.info("EXTRACT_GAME_DATA: HTTP fetch complete.")
+            return html_content
+
+    try:
+        html_content = get_browser_service().run(_fetch_thread_html, game_thread_url, username, password, timings, timings=timings)
+        logger_scraper.info("EXTRACT_GAME_DATA: Playwright fetch complete.")
+        return html_content
     except Exception as e:
         logger_scraper.error(f"EXTRACT_GAME_DATA: Playwright session failed: {e}", exc_info=True)
-        return None
\ No newline at end of file
+        return None
+
+def extract_game_data(game_thread_url, username=None, password=None, requests_session=None, f95_client=None):
+    """
+    Extracts detailed information from an F95zone game thread page (fetch_game_page_html + parse_game_page_content).
+    """
+    logger_scraper.info(f"EXTRACT_GAME_DATA: Starting extraction for: {game_thread_url}")
+    
+    # NOTE: requests_session argument is kept for signature compatibility but ignored; pass f95_client instead.
+
+    html_content = fetch_game_page_html(game_thread_url, username, password, f95_client)
+    if not html_content:
+        return None
+    try:
+        return parse_game_page_content(html_content, game_thread_url)
+    except Exception as e:
+        logger_scraper.error(f"EXTRACT_GAME_DATA: Parsing failed for {game_thread_url}: {e}", exc_info=True)
+        return None
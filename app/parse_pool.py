@@ -0,0 +1,121 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.logging_config import logger
+from app import scrape_metrics
+from app.f95_web_scraper import parse_game_page_content, first_post_hash
+
+# --- Configuration ---
+# Parse worker processes. 0 parses inline in the fetching thread (no pipeline); unset = one per core
+# beyond the first, up to 4 (so a single-core host parses inline).
+SCRAPER_PARSE_WORKERS = int(os.getenv("SCRAPER_PARSE_WORKERS", str(min(4, (os.cpu_count() or 1) - 1))))
+# Fetched pages allowed to wait for / be in a parse worker at once; fetchers block beyond this so raw HTML
+# can't pile up. 0 = twice the worker count.
+SCRAPER_PARSE_QUEUE_SIZE = int(os.getenv("SCRAPER_PARSE_QUEUE_SIZE", "0"))
+
+
+def _parse_page(html_content, game_thread_url, previous_hash):
+    """
+    Worker body (runs in the pool, or inline when the pipeline is off).
+    Returns (parsed data or None, first post hash, phase timings); parsing is skipped when the hash equals previous_hash.
+    """
+    timings = {}
+    with scrape_metrics.timed_phase(timings, 'first_post_hash'):
+        page_hash = first_post_hash(html_content)
+    if previous_hash and page_hash == previous_hash:
+        return None, page_hash, timings
+    return parse_game_page_content(html_content, game_thread_url, timings=timings), page_hash, timings
+
+
+class ParsePool:
+    """
+    Parse stage of the scrape pipeline (see services.drain_scrape_queue): fetcher threads submit raw HTML
+    and go on fetching, a pool of spawned processes parses it on every core instead of sharing one
+    interpreter's GIL, and the results (plain dicts) go to the DB writer. queue_size bounds the pages
+    submitted but not parsed yet.
+    """
+
+    def __init__(self, workers, queue_size=0):
+        self.workers = workers
+        self.queue_size = queue_size or workers * 2
+        self._executor = self._new_executor()
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        logger.info(f"ParsePool: Started {workers} parse workers (queue size {self.queue_size}).")
+
+    def _new_executor(self):
+        # spawn: forking a process that runs the browser loop and scheduler threads is not safe
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def _submit(self, *args):
+        executor = self._executor
+        try:
+            return executor.submit(_parse_page, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge page): the pages it had fail, later pages get fresh workers
+            with self._executor_lock:
+                if self._executor is executor:
+                    logger.warning("ParsePool: Worker process died, restarting the pool.")
+                    self._executor = self._new_executor()
+                    executor.shutdown(wait=False)
+            return self._executor.submit(_parse_page, *args)
+
+    def submit(self, html_content, game_thread_url, previous_hash=None, timings=None):
+        """
+        Queues one page for a worker process and returns its Future (result: what _parse_page returns)
+        without waiting for the parse. Blocks while queue_size pages are already queued or parsing.
+        """
+        with scrape_metrics.timed_phase(timings, 'parse_queue_wait'):
+            self._slots.acquire()
+        try:
+            future = self._submit(html_content, game_thread_url, previous_hash)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def parse(self, html_content, game_thread_url, previous_hash=None, timings=None):
+        """Parses one page in a worker process and waits for it (single-page callers). Returns what _parse_page returns."""
+        return self.submit(html_content, game_thread_url, previous_hash, timings).result()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+def get_parse_pool():
+    """Returns the process-wide ParsePool, or None when SCRAPER_PARSE_WORKERS is 0."""
+    global _parse_pool
+    if SCRAPER_PARSE_WORKERS <= 0:
+        return None
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ParsePool(SCRAPER_PARSE_WORKERS, SCRAPER_PARSE_QUEUE_SIZE)
+            atexit.register(_parse_pool.shutdown)
+        return _parse_pool
+
+def parse_page(html_content, game_thread_url, previous_hash=None, timings=None):
+    """
+    Parses a fetched thread page through the parse pool when enabled, inline otherwise.
+    Returns (parsed data or None, first post hash), see _parse_page; the parse phases are added to timings.
+    """
+    pool = get_parse_pool()
+    if pool is not None:
+        data, page_hash, parse_timings = pool.parse(html_content, game_thread_url, previous_hash, timings)
+    else:
+        data, page_hash, parse_timings = _parse_page(html_content, game_thread_url, previous_hash)
+    add_parse_timings(timings, parse_timings)
+    return data, page_hash
+
+def add_parse_timings(timings, parse_timings):
+    """Adds the phase timings a parse worker returned to a scrape's timings dict (if any)."""
+    if timings is not None:
+        for name, ms in parse_timings.items():
+            timings[name] = timings.get(name, 0.0) + ms
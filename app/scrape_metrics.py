@@ -0,0 +1,159 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from app.database import get_db_connection
+
+# Number of most recent samples kept per metric for the rolling statistics
+SCRAPE_METRICS_WINDOW = int(os.getenv("SCRAPE_METRICS_WINDOW", "500"))
+# Rows kept in the scrape_timings table (one per scraped game)
+SCRAPE_TIMINGS_KEEP = int(os.getenv("SCRAPE_TIMINGS_KEEP", "2000"))
+
+_lock = threading.Lock()
+_samples = {}  # name -> deque of recent values
+_totals = {}   # name -> [count, sum] since process start
+
+
+def record(name, value):
+    """Adds one observation (e.g. a wait time in ms or bytes saved on a page) to a metric."""
+    with _lock:
+        window = _samples.get(name)
+        if window is None:
+            window = _samples[name] = deque(maxlen=SCRAPE_METRICS_WINDOW)
+        window.append(value)
+        totals = _totals.setdefault(name, [0, 0])
+        totals[0] += 1
+        totals[1] += value
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summary(name=None):
+    """
+    Rolling statistics for one metric, or for all metrics keyed by name when name is None.
+    Each entry: count/total since start, and mean/p50/p95/max over the recent window.
+    """
+    with _lock:
+        names = [name] if name is not None else sorted(_samples)
+        snapshot = {n: (list(_samples.get(n, ())), list(_totals.get(n, (0, 0)))) for n in names}
+
+    result = {}
+    for n, (values, (count, total)) in snapshot.items():
+        values.sort()
+        result[n] = {
+            'count': count,
+            'total': total,
+            'mean': (sum(values) / len(values)) if values else None,
+            'p50': _percentile(values, 50),
+            'p95': _percentile(values, 95),
+            'max': values[-1] if values else None,
+        }
+    return result[name] if name is not None else result
+
+
+def reset():
+    """Drops all collected samples."""
+    with _lock:
+        _samples.clear()
+        _totals.clear()
+
+
+# --- Per-scrape phase timings ---
+# A scrape passes a plain dict (phase name -> ms) down through fetch and parse; phases that run
+# more than once (e.g. two navigations) add up. The dict is stored with save_scrape_timings.
+
+@contextmanager
+def timed_phase(timings, name):
+    """Adds the duration of the block to timings[name] (no-op bookkeeping when timings is None)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+
+class PhaseClock:
+    """Splits straight-line code into consecutive phases: lap(name) charges the time since the previous lap to name."""
+
+    def __init__(self, timings):
+        self.timings = timings
+        self._last = time.perf_counter()
+
+    def lap(self, name):
+        if self.timings is None:
+            return
+        now = time.perf_counter()
+        self.timings[name] = self.timings.get(name, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+
+def save_scrape_timings(db_path, game_id, thread_id, outcome, total_ms, timings):
+    """Stores one scrape's phase timings (and feeds them to the rolling metrics as phase_<name>_ms)."""
+    for name, ms in timings.items():
+        record(f"phase_{name}_ms", ms)
+    record('scrape_total_ms', total_ms)
+
+    conn = get_db_connection(db_path)
+    if not conn:
+        return
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO scrape_timings (game_id, thread_id, started_at, outcome, fetch_method, total_ms, phases_json)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (game_id, thread_id, datetime.now(timezone.utc).isoformat(), outcome,
+              'browser' if 'goto' in timings else ('http' if 'http_fetch' in timings else None),
+              round(total_ms, 1), json.dumps({k: round(v, 1) for k, v in timings.items()})))
+        cursor.execute("DELETE FROM scrape_timings WHERE id <= ?", (cursor.lastrowid - SCRAPE_TIMINGS_KEEP,))
+        conn.commit()
+    finally:
+        conn.close()
+
+def get_scrape_timings(db_path, limit=200):
+    """
+    The most recent scrapes (newest first, phases decoded) and per-phase statistics over them:
+    {'recent': [...], 'phases': {name: {count, mean, p50, p95, max}}, 'phase_names': [...]}.
+    """
+    conn = get_db_connection(db_path)
+    if not conn:
+        return {'recent': [], 'phases': {}, 'phase_names': []}
+    try:
+        rows = conn.execute("""
+            SELECT t.*, g.name AS game_name FROM scrape_timings t LEFT JOIN games g ON g.id = t.game_id
+            ORDER BY t.id DESC LIMIT ?
+        """, (limit,)).fetchall()
+    finally:
+        conn.close()
+
+    recent = []
+    values = {}
+    for row in rows:
+        item = dict(row)
+        item['phases'] = json.loads(item.pop('phases_json') or '{}')
+        recent.append(item)
+        for name, ms in list(item['phases'].items()) + [('total', item['total_ms'])]:
+            values.setdefault(name, []).append(ms)
+
+    phases = {}
+    for name, series in values.items():
+        series.sort()
+        phases[name] = {
+            'count': len(series),
+            'mean': sum(series) / len(series),
+            'p50': _percentile(series, 50),
+            'p95': _percentile(series, 95),
+            'max': series[-1],
+        }
+    # Slowest phases first, total last
+    phase_names = sorted((n for n in phases if n != 'total'), key=lambda n: -phases[n]['mean'])
+    return {'recent': recent, 'phases': phases, 'phase_names': phase_names}
@@ -0,0 +1,244 @@
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+from app.logging_config import logger
+from app.database import get_db_connection
+
+# --- Priorities (higher is claimed first) ---
+PRIORITY_USER = 40            # Manual sync from the UI
+PRIORITY_NEW_GAME = 30        # Game just added to a list
+PRIORITY_VERSION_CHANGE = 20  # RSS reported a new version
+PRIORITY_REFRESH = 10         # Incomplete data / SCRAPER_DEBOUNCE_DAYS refresh
+
+# --- Configuration ---
+# A claimed job not completed within this time is handed to another worker (the worker is assumed dead)
+SCRAPE_JOB_LEASE_SECONDS = int(os.getenv("SCRAPE_JOB_LEASE_SECONDS", "600"))
+# Failed attempts before a job is dead-lettered
+SCRAPE_JOB_MAX_ATTEMPTS = int(os.getenv("SCRAPE_JOB_MAX_ATTEMPTS", "5"))
+# Retry delay after the n-th failure: base * 2^(n-1), capped
+SCRAPE_JOB_BACKOFF_BASE_SECONDS = int(os.getenv("SCRAPE_JOB_BACKOFF_BASE_SECONDS", "60"))
+SCRAPE_JOB_BACKOFF_MAX_SECONDS = int(os.getenv("SCRAPE_JOB_BACKOFF_MAX_SECONDS", "21600"))
+
+
+def _now_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+def _backoff_seconds(attempts):
+    return min(SCRAPE_JOB_BACKOFF_MAX_SECONDS, SCRAPE_JOB_BACKOFF_BASE_SECONDS * (2 ** max(0, attempts - 1)))
+
+
+def enqueue_scrape_job(db_path, thread_id, game_id, priority=PRIORITY_REFRESH, image_missing=False, rss_status=None):
+    """
+    Queues a scrape of a game thread. If the thread already has a live job, that job is reused:
+    its priority is raised to the higher of the two (a higher priority also cancels a pending retry delay),
+    and image_missing / rss_status are merged in. Merging into a leased job bumps its generation, so
+    complete_scrape_job re-queues it instead of dropping the request. Returns the job id, or None on error.
+    """
+    conn = get_db_connection(db_path)
+    if not conn:
+        return None
+    try:
+        now = time.time()
+        cursor = conn.cursor()
+        # Upsert against the live-job index so concurrent enqueues of one thread can't both insert
+        cursor.execute("""
+            INSERT INTO scrape_jobs (thread_id, game_id, priority, image_missing, rss_status, available_at, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(thread_id) WHERE status != 'dead' DO UPDATE SET
+                available_at = CASE WHEN excluded.priority > scrape_jobs.priority AND scrape_jobs.status = 'pending'
+                                    THEN MIN(scrape_jobs.available_at, excluded.available_at) ELSE scrape_jobs.available_at END,
+                priority = MAX(scrape_jobs.priority, excluded.priority),
+                image_missing = (scrape_jobs.image_missing OR excluded.image_missing),
+                rss_status = COALESCE(excluded.rss_status, scrape_jobs.rss_status),
+                generation = scrape_jobs.generation + (scrape_jobs.status = 'leased'),
+                updated_at = excluded.updated_at
+        """, (thread_id, game_id, priority, bool(image_missing), rss_status, now, _now_iso(), _now_iso()))
+        conn.commit()
+        job = cursor.execute("SELECT id, status FROM scrape_jobs WHERE thread_id = ? AND status != 'dead'", (thread_id,)).fetchone()
+        logger.info(f"Scrape job {job['id']} for thread {thread_id} queued (priority {priority}, status {job['status']}).")
+        return job['id']
+    except sqlite3.Error as e:
+        logger.error(f"Failed to queue scrape job for thread {thread_id}: {e}")
+        return None
+    finally:
+        conn.close()
+
+def claim_scrape_jobs(db_path, worker_id, limit=1, lease_seconds=None):
+    """
+    Leases up to `limit` due jobs to worker_id, highest priority first. Jobs whose lease expired are
+    claimable again; those already out of attempts are dead-lettered instead.
+    BEGIN IMMEDIATE makes the claim atomic across threads and processes. Returns a list of rows.
+    """
+    if lease_seconds is None:
+        lease_seconds = SCRAPE_JOB_LEASE_SECONDS
+    conn = get_db_connection(db_path)
+    if not conn:
+        return []
+    try:
+        conn.isolation_level = None # Manual transaction control
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("""
+            UPDATE scrape_jobs SET status = 'dead', lease_owner = NULL, lease_expires_at = NULL,
+                last_error = COALESCE(last_error, 'Lease expired'), updated_at = ?
+            WHERE status = 'leased' AND lease_expires_at <= ? AND attempts >= ?
+        """, (_now_iso(), now, SCRAPE_JOB_MAX_ATTEMPTS))
+        ids = [r['id'] for r in conn.execute("""
+            SELECT id FROM scrape_jobs
+            WHERE (status = 'pending' AND available_at <= ?) OR (status = 'leased' AND lease_expires_at <= ?)
+            ORDER BY priority DESC, available_at, id
+            LIMIT ?
+        """, (now, now, limit)).fetchall()]
+        jobs = []
+        if ids:
+            placeholders = ",".join("?" * len(ids))
+            conn.execute(f"""
+                UPDATE scrape_jobs SET status = 'leased', lease_owner = ?, lease_expires_at = ?,
+                    attempts = attempts + 1, updated_at = ?
+                WHERE id IN ({placeholders})
+            """, (worker_id, now + lease_seconds, _now_iso(), *ids))
+            jobs = conn.execute(f"SELECT * FROM scrape_jobs WHERE id IN ({placeholders}) ORDER BY priority DESC, available_at, id", ids).fetchall()
+        conn.execute("COMMIT")
+        return jobs
+    except sqlite3.Error as e:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        logger.error(f"Failed to claim scrape jobs for {worker_id}: {e}")
+        return []
+    finally:
+        conn.close()
+
+def claim_scrape_job_for_thread(db_path, worker_id, thread_id, lease_seconds=None):
+    """
+    Leases the live job of one thread to worker_id, even if it is waiting out a retry delay (a user is waiting
+    for it). Returns the row, or None if the thread has no job or another worker holds an unexpired lease.
+    """
+    if lease_seconds is None:
+        lease_seconds = SCRAPE_JOB_LEASE_SECONDS
+    conn = get_db_connection(db_path)
+    if not conn:
+        return None
+    try:
+        now = time.time()
+        cursor = conn.execute("""
+            UPDATE scrape_jobs SET status = 'leased', lease_owner = ?, lease_expires_at = ?,
+                attempts = attempts + 1, updated_at = ?
+            WHERE thread_id = ? AND (status = 'pending' OR (status = 'leased' AND lease_expires_at <= ?))
+        """, (worker_id, now + lease_seconds, _now_iso(), thread_id, now))
+        conn.commit()
+        if cursor.rowcount == 0:
+            return None
+        return conn.execute("SELECT * FROM scrape_jobs WHERE thread_id = ? AND lease_owner = ? AND status = 'leased'",
+                            (thread_id, worker_id)).fetchone()
+    except sqlite3.Error as e:
+        logger.error(f"Failed to claim the scrape job of thread {thread_id} for {worker_id}: {e}")
+        return None
+    finally:
+        conn.close()
+
+def get_live_scrape_job(db_path, thread_id):
+    """The pending or leased job of a thread, or None."""
+    conn = get_db_connection(db_path)
+    if not conn:
+        return None
+    try:
+        return conn.execute("SELECT * FROM scrape_jobs WHERE thread_id = ? AND status != 'dead'", (thread_id,)).fetchone()
+    finally:
+        conn.close()
+
+def complete_scrape_job(db_path, job_id, worker_id, generation):
+    """
+    Removes a finished job. If another request was merged into it while it ran (its generation is no longer
+    the claimed one), the job is put back as pending instead, with fresh attempts.
+    Returns False if the lease was lost to another worker in the meantime.
+    """
+    conn = get_db_connection(db_path)
+    if not conn:
+        return False
+    try:
+        cursor = conn.execute("DELETE FROM scrape_jobs WHERE id = ? AND lease_owner = ? AND generation = ?",
+                              (job_id, worker_id, generation))
+        if cursor.rowcount == 0:
+            cursor = conn.execute("""
+                UPDATE scrape_jobs SET status = 'pending', lease_owner = NULL, lease_expires_at = NULL,
+                    attempts = 0, available_at = ?, updated_at = ?
+                WHERE id = ? AND lease_owner = ?
+            """, (time.time(), _now_iso(), job_id, worker_id))
+            if cursor.rowcount:
+                logger.info(f"Scrape job {job_id} got a new request while running. Queued again.")
+        conn.commit()
+        return cursor.rowcount > 0
+    finally:
+        conn.close()
+
+def fail_scrape_job(db_path, job_id, worker_id, error):
+    """
+    Records a failed attempt: the job is retried after an exponential backoff, or dead-lettered
+    once it has used SCRAPE_JOB_MAX_ATTEMPTS. Returns the new status, or None if the lease was lost.
+    """
+    conn = get_db_connection(db_path)
+    if not conn:
+        return None
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT attempts, thread_id FROM scrape_jobs WHERE id = ? AND lease_owner = ?", (job_id, worker_id))
+        row = cursor.fetchone()
+        if not row:
+            return None
+        if row['attempts'] >= SCRAPE_JOB_MAX_ATTEMPTS:
+            status, available_at = 'dead', time.time()
+            logger.warning(f"Scrape job {job_id} (thread {row['thread_id']}) dead-lettered after {row['attempts']} attempts: {error}")
+        else:
+            status, available_at = 'pending', time.time() + _backoff_seconds(row['attempts'])
+            logger.info(f"Scrape job {job_id} (thread {row['thread_id']}) failed (attempt {row['attempts']}), retrying in {_backoff_seconds(row['attempts'])}s: {error}")
+        cursor.execute("""
+            UPDATE scrape_jobs SET status = ?, available_at = ?, lease_owner = NULL, lease_expires_at = NULL,
+                last_error = ?, updated_at = ?
+            WHERE id = ?
+        """, (status, available_at, str(error)[:1000], _now_iso(), job_id))
+        conn.commit()
+        return status
+    finally:
+        conn.close()
+
+def get_scrape_queue_stats(db_path):
+    """Job counts by status, plus the number of pending jobs that are due now."""
+    stats = {'pending': 0, 'leased': 0, 'dead': 0, 'due': 0}
+    conn = get_db_connection(db_path)
+    if not conn:
+        return stats
+    try:
+        for row in conn.execute("SELECT status, COUNT(*) AS n FROM scrape_jobs GROUP BY status"):
+            stats[row['status']] = row['n']
+        stats['due'] = conn.execute("SELECT COUNT(*) FROM scrape_jobs WHERE status = 'pending' AND available_at <= ?", (time.time(),)).fetchone()[0]
+        return stats
+    finally:
+        conn.close()
+
+def get_dead_scrape_jobs(db_path, limit=100):
+    """Dead-lettered jobs, most recent first."""
+    conn = get_db_connection(db_path)
+    if not conn:
+        return []
+    try:
+        return [dict(r) for r in conn.execute("SELECT * FROM scrape_jobs WHERE status = 'dead' ORDER BY updated_at DESC LIMIT ?", (limit,))]
+    finally:
+        conn.close()
+
+def requeue_dead_scrape_jobs(db_path):
+    """Gives the newest dead-lettered job of each thread a fresh set of attempts (unless the thread already has a live job)."""
+    conn = get_db_connection(db_path)
+    if not conn:
+        return 0
+    try:
+        cursor = conn.execute("""
+            UPDATE scrape_jobs SET status = 'pending', attempts = 0, available_at = ?, updated_at = ?
+            WHERE id IN (SELECT MAX(id) FROM scrape_jobs WHERE status = 'dead' GROUP BY thread_id)
+              AND thread_id NOT IN (SELECT thread_id FROM scrape_jobs WHERE status != 'dead')
+        """, (time.time(), _now_iso()))
+        conn.commit()
+        return cursor.rowcount
+    finally:
+        conn.close()
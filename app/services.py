@@ -1,9 +1,14 @@
 import json
+import multiprocessing
 import re
 import os
+import queue
 import shutil
+import socket
 import time
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from datetime import datetime, timezone, timedelta
 from email.utils import parsedate_to_datetime
 from typing import Optional, Set
@@ -11,6 +16,7 @@ from urllib.parse import urlparse
 
 # Third-party imports
 from f95apiclient import F95ApiClient
+from f95apiclient.async_client import prefetch_images, prefetch_rss_queries
 from pushover import Client as PushoverClient, RequestError
 
 # Local imports
@@ -21,13 +27,40 @@ from app.database import (
     get_setting,
     get_all_user_ids
 )
-from app.f95_web_scraper import extract_game_data
+from app.f95_web_scraper import fetch_game_page_html, parse_game_page_content, first_post_hash, PARSER_VERSION
+from app.parse_pool import parse_page, get_parse_pool, add_parse_timings
+from app.scrape_queue import (
+    enqueue_scrape_job,
+    claim_scrape_jobs,
+    claim_scrape_job_for_thread,
+    get_live_scrape_job,
+    complete_scrape_job,
+    fail_scrape_job,
+    PRIORITY_NEW_GAME,
+    PRIORITY_VERSION_CHANGE,
+    PRIORITY_REFRESH,
+    SCRAPE_JOB_LEASE_SECONDS,
+)
+from app import snapshot_store, scrape_metrics
 
 # Constants
 MAX_COMPLETED_GAMES_TO_FETCH_FOR_STATUS_CHECK = 50
 NUM_GAMES_TO_PROCESS_FROM_RSS = 60
 SCRAPER_DEBOUNCE_DAYS = 3
+# Games checked/scraped at once during a sync (1 = serial). Browser pages are additionally
+# capped by BROWSER_POOL_SIZE, so keep the two in step.
+SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "3"))
 IMAGE_CACHE_DIR_FS = os.getenv("IMAGE_CACHE_DIR_FS", "/data/image_cache")
+# Batched update check: a sync of at least RSS_BATCH_MIN_GAMES games first pages through the unfiltered
+# latest-updates feed (RSS_BATCH_PAGE_SIZE items per page, at most RSS_BATCH_MAX_PAGES pages) and matches it
+# against every game by thread ID; the per-game search strategies only run for games the pages don't cover.
+RSS_BATCH_DETECTION_ENABLED = os.getenv("RSS_BATCH_DETECTION_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+RSS_BATCH_MIN_GAMES = int(os.getenv("RSS_BATCH_MIN_GAMES", "5"))
+RSS_BATCH_PAGE_SIZE = int(os.getenv("RSS_BATCH_PAGE_SIZE", "90"))
+RSS_BATCH_MAX_PAGES = int(os.getenv("RSS_BATCH_MAX_PAGES", "20"))
+# First search queries of the games the batched index doesn't settle, fetched concurrently before the per-game
+# checks (async client) so those checks hit the RSS cache. Keep it small enough to finish within RSS_CACHE_TTL_SECONDS.
+RSS_PREFETCH_MAX_QUERIES = int(os.getenv("RSS_PREFETCH_MAX_QUERIES", "60"))
 
 # --- Helper Functions ---
 
@@ -43,6 +76,25 @@ def _get_filename_from_url(url):
     except Exception:
         return f"image_{int(time.time())}.jpg" # Simplified
 
+def _scrape_game_page(f95_url, f95_username, f95_password, f95_client, previous_hash=None, timings=None):
+    """
+    Fetches a game thread, keeps the raw HTML in the snapshot store (for offline re-parsing)
+    and parses it. Returns (parsed data, first post hash); parsed data is None if the fetch or
+    the parse failed, or if the first post hash equals previous_hash (nothing to re-parse).
+    timings: optional dict that receives the ms spent per fetch/parse phase (see scrape_metrics).
+    """
+    html_content = fetch_game_page_html(f95_url, username=f95_username, password=f95_password, f95_client=f95_client, timings=timings)
+    if not html_content:
+        return None, None
+    with scrape_metrics.timed_phase(timings, 'snapshot_save'):
+        snapshot_store.save_snapshot(_extract_thread_id(f95_url), html_content)
+    try:
+        # Hashing and parsing run in the parse pool when SCRAPER_PARSE_WORKERS is set
+        return parse_page(html_content, f95_url, previous_hash, timings=timings)
+    except Exception as e:
+        logger.error(f"Parsing failed for {f95_url}: {e}", exc_info=True)
+        return None, None
+
 def send_pushover_notification(db_path, user_id, title, message, url=None, url_title=None):
     """Sends a Pushover notification to a specific user using their stored credentials."""
     pushover_user_key = get_setting(db_path, 'pushover_user_key', user_id=user_id)
@@ -178,36 +230,66 @@ def generate_search_strategies(name: str, author: str) -> list[tuple[str, Option
             
     return unique_strats
 
-def _determine_specific_game_status(f95_client: F95ApiClient, game_url: str, game_name: str, target_status_prefix: str, author: str = None) -> Optional[str]:
-    """Checks if a game is listed in a feed with a specific status prefix using robust search."""
-    strategies = generate_search_strategies(game_name, author)
+def _find_game_in_rss(f95_client: F95ApiClient, game_url: str, game_name: str, author: str = None,
+                      completion_status_filter: str = None, strategies=None):
+    """
+    Runs the search strategies (optionally with a status prefix filter) until one returns the game.
+    Returns (matching feed item, (query, creator) strategy that found it), or (None, None).
+    """
+    if strategies is None:
+        strategies = generate_search_strategies(game_name, author)
     norm_target = _normalize_url(game_url)
     target_id = _extract_thread_id(game_url)
 
     for q, creator_param in strategies:
         try:
-            # We filter by specific status AND the search strategy
             data = f95_client.get_latest_game_data_from_rss(
                 search_term=q,
                 creator=creator_param,
-                completion_status_filter=target_status_prefix,
+                completion_status_filter=completion_status_filter,
                 limit=60 # Sufficient limit for search results
             )
-            if data:
-                for item in data:
-                    item_url = item.get('url')
-                    # Prioritize ID match
-                    item_id = _extract_thread_id(item_url)
-                    if target_id and item_id and target_id == item_id:
-                        return target_status_prefix.upper()
-                    # Fallback to normalized URL match
-                    if _normalize_url(item_url) == norm_target:
-                        return target_status_prefix.upper()
+            for item in data or []:
+                item_url = item.get('url')
+                # Prioritize ID match
+                item_id = _extract_thread_id(item_url)
+                if target_id and item_id and target_id == item_id:
+                    return item, (q, creator_param)
+                # Fallback to normalized URL match
+                if _normalize_url(item_url) == norm_target:
+                    return item, (q, creator_param)
         except Exception as e:
-            logger.warning(f"Error checking status '{target_status_prefix}' for game '{game_name}' with strategy {q}/{creator_param}: {e}")
+            logger.warning(f"Error searching RSS (filter '{completion_status_filter}') for game '{game_name}' with strategy {q}/{creator_param}: {e}")
             continue
 
-    return None
+    return None, None
+
+def _determine_specific_game_status(f95_client: F95ApiClient, game_url: str, game_name: str, target_status_prefix: str, author: str = None) -> Optional[str]:
+    """Checks if a game is listed in a feed with a specific status prefix using robust search."""
+    item, _ = _find_game_in_rss(f95_client, game_url, game_name, author, completion_status_filter=target_status_prefix)
+    return target_status_prefix.upper() if item else None
+
+def _resolve_game_status(f95_client: F95ApiClient, game_url: str, game_name: str, author: str = None) -> Optional[str]:
+    """
+    Completion status ('Ongoing', 'Completed', 'On Hold', 'Abandoned') from RSS, or None if the game isn't found.
+    One unfiltered search finds the game; its category tags already give Completed / On Hold / Abandoned.
+    'Ongoing' is only the default for an item without a status tag, so it is confirmed with the status
+    prefix filters, using just the strategy that found the game.
+    """
+    item, strategy = _find_game_in_rss(f95_client, game_url, game_name, author)
+    if not item:
+        return None
+    status = item.get('completed_status')
+    if status and status != 'Ongoing':
+        return status
+    # Check order: Ongoing -> Completed -> On Hold -> Abandoned
+    for status_check in ['ongoing', 'completed', 'on_hold', 'abandoned']:
+        confirmed, _ = _find_game_in_rss(f95_client, game_url, game_name, author,
+                                         completion_status_filter=status_check, strategies=[strategy])
+        if confirmed:
+            # Standardized formatting "On Hold" instead of "On_Hold"
+            return status_check.replace('_', ' ').title()
+    return status
 
 def _normalize_url(url):
     """Normalizes URL by removing query params, fragments, and trailing slashes."""
@@ -239,6 +321,128 @@ def _extract_thread_id(url: str) -> Optional[str]:
     
     return None
 
+def _parse_rss_date(value) -> Optional[datetime]:
+    """RSS pub date ('Sat, 18 May 2024 10:00:00 GMT') as an aware datetime, or None."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def build_rss_update_index(f95_client: F95ApiClient, oldest_pub_date: Optional[datetime], max_pages: int = None) -> Optional[dict]:
+    """
+    Pages through the unfiltered latest-updates feed, newest first, until it passes oldest_pub_date
+    (the oldest stored rss_pub_date among the games being checked), runs out, or hits max_pages.
+    Returns {'items': {thread_id: newest feed item}, 'covered_since': aware datetime} or None if the
+    first page could not be fetched. A game whose rss_pub_date is at or after covered_since and that
+    has no entry in items has not been updated since (see check_single_game_update_and_status).
+    """
+    if max_pages is None:
+        max_pages = RSS_BATCH_MAX_PAGES
+    items = {}
+    covered_since = None
+    previous_first_id = None
+    for page in range(1, max_pages + 1):
+        feed = f95_client.get_latest_game_data_from_rss(limit=RSS_BATCH_PAGE_SIZE, page=page)
+        if feed is None:
+            if page == 1:
+                logger.warning("Batched update check: could not fetch the latest-updates feed. Falling back to per-game search.")
+                return None
+            logger.warning(f"Batched update check: page {page} failed. Index covers updates since {covered_since}.")
+            break
+        first_id = _extract_thread_id(feed[0].get('url')) if feed else None
+        if page > 1 and first_id and first_id == previous_first_id:
+            # The feed ignored the page parameter; nothing more to learn from paging
+            logger.warning("Batched update check: feed returned the same page twice. Stopping.")
+            break
+        previous_first_id = first_id
+
+        for item in feed:
+            thread_id = _extract_thread_id(item.get('url'))
+            if thread_id and thread_id not in items:
+                items[thread_id] = item
+            pub_date = _parse_rss_date(item.get('rss_pub_date'))
+            if pub_date and (covered_since is None or pub_date < covered_since):
+                covered_since = pub_date
+
+        if len(feed) < RSS_BATCH_PAGE_SIZE:
+            covered_since = datetime.min.replace(tzinfo=timezone.utc) # Reached the end of the feed
+            break
+        if oldest_pub_date and covered_since and covered_since <= oldest_pub_date:
+            break
+
+    logger.info(f"Batched update check: {len(items)} updated threads in {page} feed page(s), covering updates since {covered_since}.")
+    return {'items': items, 'covered_since': covered_since}
+
+# Statuses a game rarely leaves; see _rss_index_lookup
+_FINAL_STATUSES = ('Completed', 'Abandoned')
+
+def _rss_index_lookup(rss_index, f95_url, rss_pub_date, completed_status=None):
+    """
+    (feed item or None, settled) for a game in a build_rss_update_index result. settled: the index answers
+    the update check on its own, because the game is in it, or was last updated inside its covered window
+    and its stored status is final. A new version bumps the thread into the latest updates, but a status
+    change may not, so a game with a non-final status still gets a cheap search (its first strategy).
+    Returns (None, None) for a game the window covers that only needs that cheap search.
+    """
+    index_id = _extract_thread_id(f95_url)
+    match = rss_index['items'].get(index_id) if index_id else None
+    if match:
+        return match, True
+    stored_pub_date = _parse_rss_date(rss_pub_date)
+    covered = bool(index_id and stored_pub_date and rss_index['covered_since'] and stored_pub_date >= rss_index['covered_since'])
+    if covered and completed_status not in _FINAL_STATUSES:
+        return None, None
+    return None, covered
+
+def _prefetch_search_queries(db_path, user_id, rss_index):
+    """
+    Fetches the first search strategy of each monitored game of the user that rss_index doesn't settle,
+    concurrently through the async client. The per-game checks that follow then find it in the RSS cache.
+    """
+    conn = get_db_connection(db_path)
+    if not conn:
+        return
+    try:
+        rows = conn.execute("""
+            SELECT g.name, g.author, g.f95_url, g.rss_pub_date, g.completed_status FROM games g JOIN user_played_games upg ON g.id = upg.game_id
+            WHERE upg.user_id = ? AND upg.notify_for_updates = 1
+        """, (user_id,)).fetchall()
+    finally:
+        conn.close()
+    queries = []
+    for row in rows:
+        if rss_index is not None and _rss_index_lookup(rss_index, row['f95_url'], row['rss_pub_date'], row['completed_status'])[1]:
+            continue
+        strategies = generate_search_strategies(row['name'], row['author'])
+        if strategies:
+            q, creator_param = strategies[0]
+            query = {'search_term': q, 'creator': creator_param, 'limit': 60}
+            if query not in queries:
+                queries.append(query)
+    queries = queries[:RSS_PREFETCH_MAX_QUERIES]
+    if prefetch_rss_queries(queries) is not None:
+        logger.info(f"Prefetched {len(queries)} search queries for user {user_id} concurrently.")
+
+def _build_rss_update_index_for_games(db_path, f95_client, where_sql, params=()) -> Optional[dict]:
+    """build_rss_update_index over the monitored games selected by where_sql (on user_played_games upg)."""
+    conn = get_db_connection(db_path)
+    if not conn:
+        return None
+    try:
+        rows = conn.execute(f"""
+            SELECT DISTINCT g.id, g.rss_pub_date FROM games g JOIN user_played_games upg ON g.id = upg.game_id
+            WHERE {where_sql}
+        """, params).fetchall()
+    finally:
+        conn.close()
+    if len(rows) < RSS_BATCH_MIN_GAMES:
+        return None
+    dates = [d for d in (_parse_rss_date(r['rss_pub_date']) for r in rows) if d]
+    return build_rss_update_index(f95_client, min(dates) if dates else None)
+
 def get_user_played_game_urls(db_path: str, user_id: int) -> Set[str]:
     urls = set()
     conn = None
@@ -275,6 +479,14 @@ def process_rss_feed(db_path, client):
         logger.info("No items fetched from RSS feed.")
         return
 
+    # Cover images are downloaded concurrently up front (async client); the loop reuses those results
+    prefetched_images = prefetch_images([item.get('image_url') for item in game_items]) or {}
+
+    def _cached_image(image_url):
+        if image_url in prefetched_images:
+            return prefetched_images[image_url]
+        return client.cache_image_from_url(image_url)
+
     primary_admin_id = get_primary_admin_user_id(db_path)
     f95_username, f95_password = None, None
     if primary_admin_id:
@@ -284,6 +496,7 @@ def process_rss_feed(db_path, client):
     conn = get_db_connection(db_path)
     if not conn: return
 
+    scrape_jobs_to_queue = [] # (f95_url, game_id, priority)
     try:
         cursor = conn.cursor()
         current_timestamp = datetime.now(timezone.utc).isoformat()
@@ -310,7 +523,7 @@ def process_rss_feed(db_path, client):
                 logger.info(f"New game found in RSS: {name}")
                 cached_image_path = None
                 if item.get('image_url'):
-                    cached_image_path = client.cache_image_from_url(item.get('image_url'))
+                    cached_image_path = _cached_image(item.get('image_url'))
 
                 cursor.execute("""
                     INSERT INTO games (f95_url, name, version, author, image_url, rss_pub_date, 
@@ -368,7 +581,7 @@ def process_rss_feed(db_path, client):
                     'last_updated_in_db': current_timestamp
                 }
                 if item.get('image_url'):
-                     new_cache = client.cache_image_from_url(item.get('image_url'))
+                     new_cache = _cached_image(item.get('image_url'))
                      if new_cache: update_fields['image_url'] = new_cache
 
                 set_clause = ", ".join([f"{k} = ?" for k in update_fields.keys()])
@@ -376,25 +589,7 @@ def process_rss_feed(db_path, client):
                 cursor.execute(f"UPDATE games SET {set_clause} WHERE id = ?", tuple(params))
 
             if should_scrape and f95_username and f95_password:
-                logger.info(f"Scraping detailed data for: {name}")
-                try:
-                    scraped = extract_game_data(f95_url, username=f95_username, password=f95_password, requests_session=client.session)
-                    if scraped:
-                        scrape_sql = """
-                            UPDATE games SET description=?, engine=?, language=?, censorship=?, 
-                            tags_json=?, download_links_json=?, download_links_raw_html=?, scraper_last_run_at=?, last_updated_in_db=?
-                            WHERE id=?
-                        """
-                        scrape_params = (
-                            scraped.get('full_description'), scraped.get('engine'), 
-                            scraped.get('language'), scraped.get('censorship'),
-                            json.dumps(scraped.get('tags')), json.dumps(scraped.get('download_links')),
-                            scraped.get('download_links_raw_html'),
-                            current_timestamp, current_timestamp, game_id
-                        )
-                        cursor.execute(scrape_sql, scrape_params)
-                except Exception as e:
-                    logger.error(f"Scraping failed for {name}: {e}")
+                scrape_jobs_to_queue.append((f95_url, game_id, PRIORITY_NEW_GAME if row is None else PRIORITY_REFRESH))
 
         conn.commit()
     except Exception as e:
@@ -402,6 +597,13 @@ def process_rss_feed(db_path, client):
     finally:
         conn.close()
 
+    # Scrapes run from the queue, after the RSS transaction is committed
+    for f95_url, game_id, priority in scrape_jobs_to_queue:
+        logger.info(f"Queueing scrape of detailed data for: {f95_url}")
+        enqueue_scrape_job(db_path, _extract_thread_id(f95_url) or f95_url, game_id, priority)
+    if scrape_jobs_to_queue:
+        drain_scrape_queue(db_path, client, concurrency=1)
+
 def search_games_for_user(db_path: str, search_query: str, user_id: int):
     """Searches for games in the DB and RSS feed, marking which ones are already in user's list."""
     
@@ -559,26 +761,9 @@ def add_game_to_my_list(db_path, user_id, f95_url, client=None,
                 )
             
             # --- Auto-Scrape on Add ---
-            # Immediately trigger a scrape to populate details
-            try:
-                local_client = client or F95ApiClient()
-                # We need the played_game_id which is the 'id' of the user_played_games row, but we didn't capture it cleanly above.
-                # Actually, lastrowid on the cursor after the INSERT into user_played_games suffices.
-                played_game_id = cursor.lastrowid
-                
-                logger.info(f"Triggering immediate scrape for newly added game: {name_override or f95_url}")
-                # We need to close the connection before calling check_single_game_update_and_status because it opens its own connection
-                conn.commit() 
-                conn.close() 
-                conn = None # Prevent finally block from closing it again if we set it to None
-
-                check_single_game_update_and_status(db_path, local_client, played_game_id, user_id, force_scrape=True)
-                
-                if client is None:
-                    local_client.close_session()
-
-            except Exception as e:
-                logger.error(f"Error during immediate scrape on add: {e}")
+            # Queue a scrape to populate details; the caller drains the queue in the background (see drain_scrape_queue)
+            logger.info(f"Queueing scrape for newly added game: {name_override or f95_url}")
+            enqueue_scrape_job(db_path, _extract_thread_id(f95_url) or f95_url, game_id, PRIORITY_NEW_GAME)
 
             return True, "Game added successfully"
         except sqlite3.IntegrityError:
@@ -774,7 +959,15 @@ def update_completion_statuses(db_path, client):
     # Simplified version for artifact
     pass
 
-def check_single_game_update_and_status(db_path, f95_client, played_game_row_id, user_id, force_scrape=False):
+def check_single_game_update_and_status(db_path, f95_client, played_game_row_id, user_id, force_scrape=False, scrape_priority=None, rss_index=None):
+    """
+    Checks one monitored game against RSS (version, status, pub date, image) and queues a scrape job
+    when the stored data needs refreshing. The scrape itself runs in drain_scrape_queue.
+    scrape_priority: queue priority for that job (default PRIORITY_REFRESH; a version change raises it).
+    rss_index: result of build_rss_update_index; the game is looked up there first and only searched
+               for when the index doesn't cover it.
+    Returns the thread key of the queued scrape job (see run_scrape_job_for_thread), or None if none was queued.
+    """
     conn = get_db_connection(db_path)
     if not conn: return
     try:
@@ -795,6 +988,20 @@ def check_single_game_update_and_status(db_path, f95_client, played_game_row_id,
         
         # Normalize DB URL for comparison
         db_game_url_norm = _normalize_url(game['f95_url'])
+
+        # Batched index first: a hit is the newest feed entry; a miss inside the covered window means no update
+        if rss_index is not None:
+            match, settled = _rss_index_lookup(rss_index, game['f95_url'], game['rss_pub_date'], game['completed_status'])
+            if match:
+                logger.info(f"Match found for {game['name']} in the batched latest-updates index.")
+            elif settled:
+                logger.debug(f"No update for {game['name']} since {game['rss_pub_date']} (batched index). Skipping search.")
+            elif settled is None:
+                # No new version, but a status change may not reach the latest updates: re-check it with one query
+                logger.debug(f"No update for {game['name']} since {game['rss_pub_date']} (batched index). Re-checking status '{game['completed_status']}' with one search.")
+                strategies = strategies[:1]
+            if settled:
+                strategies = []
         
         for q, creator_param in strategies:
             try:
@@ -831,6 +1038,7 @@ def check_single_game_update_and_status(db_path, f95_client, played_game_row_id,
                 continue
             
         updated = False
+        version_changed = False
         if match:
             changes = []
             params = []
@@ -844,6 +1052,7 @@ def check_single_game_update_and_status(db_path, f95_client, played_game_row_id,
                 
                 # Force a scrape to get new links/tags/desc for the new version
                 should_force_scrape = True 
+                version_changed = True
                 logger.info(f"Version update detected for {game['name']} ({game['version']} -> {match['version']}). Forcing scrape.")
 
             # 2. Status Check
@@ -913,11 +1122,7 @@ def check_single_game_update_and_status(db_path, f95_client, played_game_row_id,
 
         # 2. Scrape (Force OR Missing Data)
         # Retrieve Admin Credentials for Scraping
-        primary_admin_id = get_primary_admin_user_id(db_path)
-        f95_username, f95_password = None, None
-        if primary_admin_id:
-            f95_username = get_setting(db_path, 'f95_username', user_id=primary_admin_id)
-            f95_password = get_setting(db_path, 'f95_password', user_id=primary_admin_id)
+        f95_username, f95_password = _get_scraper_credentials(db_path)
 
         # Ensure should_force_scrape is initialized if not set by version update logic above
         try:
@@ -946,72 +1151,14 @@ def check_single_game_update_and_status(db_path, f95_client, played_game_row_id,
                 should_force_scrape = True 
         
         if should_force_scrape and f95_username and f95_password:
-            logger.info(f"Sync-driven scraping for: {game['name']} (Force={force_scrape}, MissingImg={is_image_missing})")
-            scraped = extract_game_data(game['f95_url'], username=f95_username, password=f95_password, requests_session=f95_client.session)
-            if scraped:
-                # If image was missing, try to cache from scraped data
-                new_scraped_image_path = None
-                if is_image_missing and scraped.get('image_url'):
-                     logger.info(f"Attempting to recover image for {game['name']} from Scraped URL: {scraped['image_url']}")
-                     new_scraped_image_path = f95_client.cache_image_from_url(scraped['image_url'])
-                
-                # Fallback for Status: If scraper failed to find status, use RSS prefix method (Reliable)
-                # Also trigger if 'Unknown' (from sanitization)
-                current_status = scraped.get('status')
-                if current_status in ['Not found', 'Unknown', 'Ongoing']:
-                    logger.info(f"Status check: Scraper returned '{current_status}'. Verifying with RSS prefixes.")
-                    found_rss_status = None
-                    # Check order: Ongoing -> Completed -> On Hold -> Abandoned
-                    for status_check in ['ongoing', 'completed', 'on_hold', 'abandoned']:
-                        check_res = _determine_specific_game_status(f95_client, game['f95_url'], game['name'], status_check, author=game['author'])
-                        if check_res:
-                            # Ensure standardized formatting "On Hold" instead of "On_Hold"
-                            found_rss_status = check_res.replace('_', ' ').title()
-                            break
-                    
-                    if found_rss_status:
-                        if found_rss_status != scraped.get('status'):
-                            logger.info(f"Recovered/Corrected status for {game['name']}: '{scraped.get('status')}' -> '{found_rss_status}' via RSS.")
-                            scraped['status'] = found_rss_status
-                        else:
-                            logger.info(f"RSS confirmed status '{found_rss_status}' for {game['name']}.")
-                    elif match and match.get('completed_status'):
-                        if match['completed_status'] != scraped.get('status'):
-                            scraped['status'] = match['completed_status']
-                            logger.info(f"Recovered status '{scraped['status']}' via initial RSS match.")
-
-                    # Final Safety Net: If status is still Unknown/Not found, assume Implicit Ongoing
-                    # (Common for games with no status tags)
-                    if scraped.get('status') in ['Not found', 'Unknown']:
-                        logger.info(f"Status '{scraped.get('status')}' unresolved after RSS checks. Defaulting to 'Ongoing' (Implicit).")
-                        scraped['status'] = 'Ongoing'
-
-                scrape_sql = """
-                    UPDATE games SET 
-                        description=?, engine=?, language=?, censorship=?, 
-                        tags_json=?, download_links_json=?, download_links_raw_html=?,
-                        completed_status=?, os_list=?, release_date=?, thread_updated_date=?,
-                        scraper_last_run_at=?, last_updated_in_db=?
-                """
-                scrape_params = [
-                    scraped.get('full_description'), scraped.get('engine'),
-                    scraped.get('language'), scraped.get('censorship'),
-                    json.dumps(scraped.get('tags')), json.dumps(scraped.get('download_links')),
-                    scraped.get('download_links_raw_html'),
-                    scraped.get('status'), scraped.get('os_general_list'), scraped.get('release_date'), scraped.get('thread_updated_date'),
-                    datetime.now(timezone.utc).isoformat(), datetime.now(timezone.utc).isoformat()
-                ]
-                
-                if new_scraped_image_path:
-                    scrape_sql += ", image_url=? "
-                    scrape_params.append(new_scraped_image_path)
-                
-                scrape_sql += " WHERE id=?"
-                scrape_params.append(game['id'])
-                
-                cursor.execute(scrape_sql, tuple(scrape_params))
-                conn.commit()
-
+            priority = scrape_priority or PRIORITY_REFRESH
+            if version_changed:
+                priority = max(priority, PRIORITY_VERSION_CHANGE)
+            logger.info(f"Queueing scrape for: {game['name']} (Force={force_scrape}, MissingImg={is_image_missing}, Priority={priority})")
+            thread_key = _extract_thread_id(game['f95_url']) or game['f95_url']
+            enqueue_scrape_job(db_path, thread_key, game['id'], priority,
+                               image_missing=is_image_missing, rss_status=match.get('completed_status') if match else None)
+            return thread_key
 
     except Exception as e:
         logger.error(f"Error checking game {game['name']}: {e}")
@@ -1019,12 +1166,400 @@ def check_single_game_update_and_status(db_path, f95_client, played_game_row_id,
     finally:
         conn.close()
 
+def _get_scraper_credentials(db_path):
+    """F95zone username and password of the primary admin (used for all scraping), or (None, None)."""
+    primary_admin_id = get_primary_admin_user_id(db_path)
+    if not primary_admin_id:
+        return None, None
+    return (get_setting(db_path, 'f95_username', user_id=primary_admin_id),
+            get_setting(db_path, 'f95_password', user_id=primary_admin_id))
+
+def _load_scrape_target(db_path, game_id, image_missing=False):
+    """
+    What a scrape job needs before fetching: (outcome, target). outcome is 'skipped' (no credentials /
+    game gone) or 'failed' when there is nothing to fetch, else None and target is a dict with the
+    games row, the scraper credentials and previous_hash (the first post hash an unchanged page has).
+    """
+    f95_username, f95_password = _get_scraper_credentials(db_path)
+    if not (f95_username and f95_password):
+        logger.warning(f"Scrape job for game {game_id} skipped: no F95zone credentials configured.")
+        return 'skipped', None
+
+    conn = get_db_connection(db_path)
+    if not conn: return 'failed', None
+    try:
+        game = conn.execute("SELECT * FROM games WHERE id=?", (game_id,)).fetchone()
+    finally:
+        conn.close()
+    if not game:
+        return 'skipped', None
+
+    logger.info(f"Sync-driven scraping for: {game['name']} (MissingImg={image_missing})")
+    # Unchanged first post (same hash, same parser) parses to the data already stored, unless the
+    # image is missing and the scraped image URL is needed
+    previous_hash = None
+    if game['parser_version'] == PARSER_VERSION and not image_missing:
+        previous_hash = game['first_post_hash']
+    return None, {'game': game, 'username': f95_username, 'password': f95_password, 'previous_hash': previous_hash}
+
+def _scrape_and_store_game(db_path, f95_client, game_id, image_missing=False, rss_status=None, timings=None):
+    """
+    Scrapes one game thread and writes the result to its games row (scrape job handler, see drain_scrape_queue).
+    No DB connection is held while the page is fetched and parsed.
+    rss_status: completed_status of the RSS match that queued the job, used when the status stays unresolved.
+    timings: optional dict that receives the ms spent per phase.
+    Returns 'updated', 'unchanged' (first post hash matched), 'skipped' (no credentials / game gone)
+    or 'failed' if the page could not be fetched or parsed (retry).
+    """
+    outcome, target = _load_scrape_target(db_path, game_id, image_missing)
+    if outcome:
+        return outcome
+    game = target['game']
+    scraped, page_hash = _scrape_game_page(game['f95_url'], target['username'], target['password'], f95_client,
+                                           previous_hash=target['previous_hash'], timings=timings)
+    return _store_scraped_game(db_path, f95_client, game, scraped, page_hash, target['previous_hash'],
+                               image_missing, rss_status, timings)
+
+def _store_scraped_game(db_path, f95_client, game, scraped, page_hash, previous_hash, image_missing=False, rss_status=None, timings=None):
+    """
+    Second half of a scrape job: resolves the status, recovers a missing image and writes the parsed
+    page to the games row. Returns the outcome, as _scrape_and_store_game.
+    """
+    if not scraped and page_hash and page_hash == previous_hash:
+        logger.info(f"First post of {game['name']} unchanged since the last scrape. Skipping parse and update.")
+        conn = get_db_connection(db_path)
+        if not conn: return 'failed'
+        try:
+            conn.execute("UPDATE games SET scraper_last_run_at=? WHERE id=?", (datetime.now(timezone.utc).isoformat(), game['id']))
+            conn.commit()
+        finally:
+            conn.close()
+        return 'unchanged'
+    if not scraped:
+        return 'failed'
+
+    # If image was missing, try to cache from scraped data
+    new_scraped_image_path = None
+    if image_missing and scraped.get('image_url'):
+         logger.info(f"Attempting to recover image for {game['name']} from Scraped URL: {scraped['image_url']}")
+         with scrape_metrics.timed_phase(timings, 'image_cache'):
+             new_scraped_image_path = f95_client.cache_image_from_url(scraped['image_url'])
+    
+    # Fallback for Status: If scraper failed to find status, use RSS prefix method (Reliable)
+    # Also trigger if 'Unknown' (from sanitization)
+    status_clock = scrape_metrics.PhaseClock(timings)
+    current_status = scraped.get('status')
+    if current_status in ['Not found', 'Unknown', 'Ongoing']:
+        logger.info(f"Status check: Scraper returned '{current_status}'. Verifying with RSS prefixes.")
+        found_rss_status = _resolve_game_status(f95_client, game['f95_url'], game['name'], author=game['author'])
+        
+        if found_rss_status:
+            if found_rss_status != scraped.get('status'):
+                logger.info(f"Recovered/Corrected status for {game['name']}: '{scraped.get('status')}' -> '{found_rss_status}' via RSS.")
+                scraped['status'] = found_rss_status
+            else:
+                logger.info(f"RSS confirmed status '{found_rss_status}' for {game['name']}.")
+        elif rss_status:
+            if rss_status != scraped.get('status'):
+                scraped['status'] = rss_status
+                logger.info(f"Recovered status '{scraped['status']}' via initial RSS match.")
+
+        # Final Safety Net: If status is still Unknown/Not found, assume Implicit Ongoing
+        # (Common for games with no status tags)
+        if scraped.get('status') in ['Not found', 'Unknown']:
+            logger.info(f"Status '{scraped.get('status')}' unresolved after RSS checks. Defaulting to 'Ongoing' (Implicit).")
+            scraped['status'] = 'Ongoing'
+        status_clock.lap('status_resolve')
+
+    scrape_sql = """
+        UPDATE games SET 
+            description=?, engine=?, language=?, censorship=?, 
+            tags_json=?, download_links_json=?, download_links_raw_html=?,
+            completed_status=?, os_list=?, release_date=?, thread_updated_date=?,
+            scraper_last_run_at=?, last_updated_in_db=?, first_post_hash=?, parser_version=?
+    """
+    scrape_params = [
+        scraped.get('full_description'), scraped.get('engine'),
+        scraped.get('language'), scraped.get('censorship'),
+        json.dumps(scraped.get('tags')), json.dumps(scraped.get('download_links')),
+        scraped.get('download_links_raw_html'),
+        scraped.get('status'), scraped.get('os_general_list'), scraped.get('release_date'), scraped.get('thread_updated_date'),
+        datetime.now(timezone.utc).isoformat(), datetime.now(timezone.utc).isoformat(),
+        page_hash, PARSER_VERSION
+    ]
+    
+    if new_scraped_image_path:
+        scrape_sql += ", image_url=? "
+        scrape_params.append(new_scraped_image_path)
+    
+    scrape_sql += " WHERE id=?"
+    scrape_params.append(game['id'])
+    
+    with scrape_metrics.timed_phase(timings, 'db_write'):
+        conn = get_db_connection(db_path)
+        if not conn: return 'failed'
+        try:
+            conn.execute(scrape_sql, tuple(scrape_params))
+            conn.commit()
+        finally:
+            conn.close()
+    return 'updated'
+
+def _scrape_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+def _run_scrape_job(db_path, f95_client, job, worker_id):
+    """Runs one leased job and completes or fails it. Returns True unless the scrape failed."""
+    timings = {}
+    started = time.perf_counter()
+    try:
+        outcome = _scrape_and_store_game(db_path, f95_client, job['game_id'], bool(job['image_missing']), job['rss_status'], timings=timings)
+        error = None
+    except Exception as e:
+        outcome, error = 'failed', e
+    return _finish_scrape_job(db_path, job, worker_id, outcome, error, started, timings)
+
+def _finish_scrape_job(db_path, job, worker_id, outcome, error, started, timings):
+    """Stores the job's timings and completes or fails it (worker_id: the claiming worker). Returns True unless the scrape failed."""
+    if outcome == 'failed' and error is None:
+        error = "Fetch or parse failed"
+    if outcome != 'skipped':
+        try:
+            scrape_metrics.save_scrape_timings(db_path, job['game_id'], job['thread_id'], outcome,
+                                               (time.perf_counter() - started) * 1000, timings)
+        except Exception as e:
+            logger.warning(f"Could not store scrape timings for job {job['id']}: {e}")
+    if outcome == 'failed':
+        fail_scrape_job(db_path, job['id'], worker_id, error)
+        return False
+    complete_scrape_job(db_path, job['id'], worker_id, job['generation'])
+    return True
+
+def run_scrape_job_for_thread(db_path, f95_client, thread_key, timeout=None):
+    """
+    Runs the queued scrape job of one thread only (single-game syncs), instead of draining the whole queue.
+    If another worker holds the job, waits for it to finish (running the job again if a request was merged
+    into it meanwhile), for up to `timeout` seconds (default SCRAPE_JOB_LEASE_SECONDS).
+    Returns True once the thread has no live job left, False if the scrape failed or the wait timed out.
+    """
+    if timeout is None:
+        timeout = SCRAPE_JOB_LEASE_SECONDS
+    worker_id = _scrape_worker_id()
+    deadline = time.monotonic() + timeout
+    while True:
+        job = claim_scrape_job_for_thread(db_path, worker_id, thread_key)
+        if job is not None:
+            if not _run_scrape_job(db_path, f95_client, job, worker_id):
+                return False # Retried with backoff by a later drain
+            continue # Re-queued if another request was merged into the job while it ran
+        if get_live_scrape_job(db_path, thread_key) is None:
+            return True
+        if time.monotonic() >= deadline:
+            logger.warning(f"Timed out waiting for another worker's scrape of thread {thread_key}.")
+            return False
+        time.sleep(2)
+
+def drain_scrape_queue(db_path, f95_client=None, concurrency=None):
+    """
+    Works through the due scrape jobs until none is left, with up to `concurrency` worker threads
+    (default SCRAPE_CONCURRENCY), each with its own F95ApiClient (f95_client is used when running serially).
+    Jobs are leased, so several drains (threads or processes) can run at once.
+    Failed jobs are retried with backoff by a later drain. Returns the number of jobs completed.
+    With the parse pool enabled (SCRAPER_PARSE_WORKERS), the workers only fetch and the drain runs as a
+    pipeline, see _drain_scrape_queue_pipelined.
+    """
+    if concurrency is None:
+        concurrency = SCRAPE_CONCURRENCY
+    pool = get_parse_pool()
+    if pool is not None:
+        return _drain_scrape_queue_pipelined(db_path, f95_client, max(concurrency, 1), pool)
+
+    def _worker(client):
+        worker_id = _scrape_worker_id()
+        own_client = client is None
+        if own_client:
+            client = F95ApiClient()
+        done = 0
+        try:
+            while True:
+                jobs = claim_scrape_jobs(db_path, worker_id)
+                if not jobs:
+                    return done
+                if _run_scrape_job(db_path, client, jobs[0], worker_id):
+                    done += 1
+        finally:
+            if own_client:
+                client.close_session()
+
+    if concurrency <= 1:
+        return _worker(f95_client)
+    count = 0
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ScrapeWorker") as executor:
+        for future in [executor.submit(_worker, None) for _ in range(concurrency)]:
+            try:
+                count += future.result()
+            except Exception as e:
+                logger.error(f"Scrape worker error: {e}")
+    return count
+
+def _drain_scrape_queue_pipelined(db_path, f95_client, concurrency, pool):
+    """
+    drain_scrape_queue as a fetch -> parse -> write pipeline:
+    - `concurrency` fetcher threads claim jobs, fetch and snapshot the page, submit the HTML to the parse
+      pool and claim the next job without waiting for the parse (blocking only while the pool's bounded
+      queue, SCRAPER_PARSE_QUEUE_SIZE, is full);
+    - the pool's processes parse pages into plain dicts;
+    - this thread is the single writer: it takes each finished parse (or failed fetch) off the results
+      queue, resolves the status, writes the games row and completes or fails the job.
+    Returns the number of jobs completed.
+    """
+    results = queue.Queue()
+    # Jobs claimed but not written yet. A fetcher that finds the queue empty waits for these before
+    # leaving, since completing a job re-queues it when a request was merged into it meanwhile.
+    in_flight = [0]
+    in_flight_changed = threading.Condition()
+
+    def _fetch(client, job, item):
+        outcome, target = _load_scrape_target(db_path, job['game_id'], bool(job['image_missing']))
+        if outcome:
+            item['outcome'] = outcome
+            return
+        item['target'] = target
+        game = target['game']
+        html_content = fetch_game_page_html(game['f95_url'], username=target['username'], password=target['password'],
+                                            f95_client=client, timings=item['timings'])
+        if not html_content:
+            item['outcome'] = 'failed'
+            return
+        with scrape_metrics.timed_phase(item['timings'], 'snapshot_save'):
+            snapshot_store.save_snapshot(_extract_thread_id(game['f95_url']), html_content)
+        item['future'] = pool.submit(html_content, game['f95_url'], target['previous_hash'], item['timings'])
+
+    def _fetcher():
+        worker_id = _scrape_worker_id()
+        client = F95ApiClient()
+        try:
+            while True:
+                jobs = claim_scrape_jobs(db_path, worker_id)
+                if not jobs:
+                    with in_flight_changed:
+                        if in_flight[0] == 0:
+                            return
+                        in_flight_changed.wait()
+                    continue
+                with in_flight_changed:
+                    in_flight[0] += 1
+                item = {'job': jobs[0], 'worker_id': worker_id, 'timings': {}, 'started': time.perf_counter(),
+                        'outcome': None, 'error': None, 'target': None, 'future': None}
+                try:
+                    _fetch(client, jobs[0], item)
+                except Exception as e:
+                    item['outcome'], item['error'] = 'failed', e
+                if item['future'] is not None:
+                    item['future'].add_done_callback(lambda _, item=item: results.put(item))
+                else:
+                    results.put(item)
+        finally:
+            client.close_session()
+            results.put(None)
+
+    def _write(client, item):
+        outcome, error, timings = item['outcome'], item['error'], item['timings']
+        if item['future'] is not None:
+            target = item['target']
+            try:
+                scraped, page_hash, parse_timings = item['future'].result()
+                add_parse_timings(timings, parse_timings)
+                outcome = _store_scraped_game(db_path, client, target['game'], scraped, page_hash, target['previous_hash'],
+                                              bool(item['job']['image_missing']), item['job']['rss_status'], timings)
+            except Exception as e:
+                logger.error(f"Parsing or storing failed for {target['game']['f95_url']}: {e}", exc_info=True)
+                outcome, error = 'failed', e
+        return _finish_scrape_job(db_path, item['job'], item['worker_id'], outcome, error, item['started'], timings)
+
+    own_client = f95_client is None
+    if own_client:
+        f95_client = F95ApiClient()
+    count = 0
+    fetchers = [threading.Thread(target=_fetcher, name=f"ScrapeFetcher-{i}", daemon=True) for i in range(concurrency)]
+    for thread in fetchers:
+        thread.start()
+    try:
+        running = len(fetchers)
+        while running:
+            item = results.get()
+            if item is None:
+                running -= 1
+                continue
+            try:
+                if _write(f95_client, item):
+                    count += 1
+            except Exception as e:
+                logger.error(f"Scrape writer error for job {item['job']['id']}: {e}")
+            finally:
+                with in_flight_changed:
+                    in_flight[0] -= 1
+                    in_flight_changed.notify_all()
+    finally:
+        if own_client:
+            f95_client.close_session()
+    return count
+
 def scheduled_games_update_check(db_path, f95_client):
     user_ids = get_all_user_ids(db_path)
+    # One feed walk for every user's games
+    rss_index = None
+    if RSS_BATCH_DETECTION_ENABLED:
+        rss_index = _build_rss_update_index_for_games(db_path, f95_client, "upg.notify_for_updates = 1")
     for uid in user_ids:
-        sync_all_my_games_for_user(db_path, f95_client, uid)
+        sync_all_my_games_for_user(db_path, f95_client, uid, rss_index=rss_index)
+    snapshot_store.prune_snapshots()
+
+def _sync_games_concurrently(db_path, played_game_ids, user_id, force_scrape, concurrency, scrape_priority=None, rss_index=None):
+    """
+    Runs check_single_game_update_and_status for up to `concurrency` games at once.
+    Each worker thread gets its own F95ApiClient because the client's proxy state is
+    per-instance; thread page fetches share the BrowserService page pool.
+    Returns the number of games processed without error.
+    """
+    thread_local = threading.local()
+    clients = []
+    clients_lock = threading.Lock()
+
+    def _check_game(pid):
+        client = getattr(thread_local, 'client', None)
+        if client is None:
+            client = F95ApiClient()
+            thread_local.client = client
+            with clients_lock:
+                clients.append(client)
+        check_single_game_update_and_status(db_path, client, pid, user_id, force_scrape, scrape_priority, rss_index)
 
-def sync_all_my_games_for_user(db_path, f95_client, user_id, force_scrape=False):
+    count = 0
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="SyncWorker") as executor:
+            futures = {executor.submit(_check_game, pid): pid for pid in played_game_ids}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    count += 1
+                except Exception as e:
+                    logger.error(f"Sync error for played game {futures[future]}: {e}")
+    finally:
+        for client in clients:
+            client.close_session()
+    return count
+
+def sync_all_my_games_for_user(db_path, f95_client, user_id, force_scrape=False, concurrency=None, scrape_priority=None, rss_index=None):
+    """
+    Checks every monitored game of a user for updates, then drains the scrape jobs the checks queued.
+    concurrency: games processed at once; defaults to SCRAPE_CONCURRENCY. 1 keeps the
+                 original serial behaviour using the given f95_client.
+    scrape_priority: queue priority of the scrape jobs (default PRIORITY_REFRESH).
+    rss_index: a prebuilt build_rss_update_index result; built for this user's games when not given.
+    """
+    if concurrency is None:
+        concurrency = SCRAPE_CONCURRENCY
     conn = get_db_connection(db_path)
     count = 0
     total = 0
@@ -1035,10 +1570,83 @@ def sync_all_my_games_for_user(db_path, f95_client, user_id, force_scrape=False)
              ids = [r[0] for r in cursor.fetchall()]
              total = len(ids)
              conn.close()
+
+             if rss_index is None and RSS_BATCH_DETECTION_ENABLED and total >= RSS_BATCH_MIN_GAMES:
+                 rss_index = _build_rss_update_index_for_games(db_path, f95_client, "upg.user_id = ? AND upg.notify_for_updates = 1", (user_id,))
+             if total > 1:
+                 _prefetch_search_queries(db_path, user_id, rss_index)
              
-             for pid in ids:
-                 check_single_game_update_and_status(db_path, f95_client, pid, user_id, force_scrape)
-                 count += 1
+             if concurrency > 1 and total > 1:
+                 logger.info(f"Syncing {total} games for user {user_id} with concurrency {concurrency}.")
+                 count = _sync_games_concurrently(db_path, ids, user_id, force_scrape, concurrency, scrape_priority, rss_index)
+             else:
+                 for pid in ids:
+                     check_single_game_update_and_status(db_path, f95_client, pid, user_id, force_scrape, scrape_priority, rss_index)
+                     count += 1
+
+             drain_scrape_queue(db_path, f95_client, concurrency)
         except Exception as e:
             logger.error(f"Sync error: {e}")
     return count, total
+
+def _reparse_snapshot(job):
+    """Process pool worker: parses the newest snapshot of one game. Returns (game_id, scraped dict or None, first post hash)."""
+    game_id, f95_url, thread_id = job
+    _, html_content = snapshot_store.load_snapshot(thread_id)
+    if not html_content:
+        return game_id, None, None
+    return game_id, parse_game_page_content(html_content, f95_url), first_post_hash(html_content)
+
+def reparse_games_from_snapshots(db_path, workers=None):
+    """
+    Rebuilds the scraped columns of every game from its newest HTML snapshot, without any network traffic.
+    Parsing runs in a process pool (workers defaults to the CPU count); the DB is written from this process.
+    completed_status is left alone: the live value also depends on RSS prefix checks the scraper can't redo offline.
+    Returns (games updated, games with a snapshot).
+    """
+    conn = get_db_connection(db_path)
+    if not conn:
+        return 0, 0
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, f95_url FROM games")
+        available = set(snapshot_store.list_snapshot_threads())
+        jobs = []
+        for row in cursor.fetchall():
+            thread_id = _extract_thread_id(row['f95_url'])
+            if thread_id in available:
+                jobs.append((row['id'], row['f95_url'], thread_id))
+        logger.info(f"Re-parsing {len(jobs)} games from HTML snapshots in {snapshot_store.SNAPSHOT_DIR}.")
+
+        updated = 0
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = {executor.submit(_reparse_snapshot, job): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    game_id, scraped, page_hash = future.result()
+                except Exception as e:
+                    logger.error(f"Re-parse failed for {job[1]}: {e}")
+                    continue
+                if not scraped:
+                    continue
+                cursor.execute("""
+                    UPDATE games SET
+                        description=?, engine=?, language=?, censorship=?,
+                        tags_json=?, download_links_json=?, download_links_raw_html=?,
+                        os_list=?, release_date=?, thread_updated_date=?, last_updated_in_db=?,
+                        first_post_hash=?, parser_version=?
+                    WHERE id=?
+                """, (
+                    scraped.get('full_description'), scraped.get('engine'),
+                    scraped.get('language'), scraped.get('censorship'),
+                    json.dumps(scraped.get('tags')), json.dumps(scraped.get('download_links')),
+                    scraped.get('download_links_raw_html'),
+                    scraped.get('os_general_list'), scraped.get('release_date'), scraped.get('thread_updated_date'),
+                    datetime.now(timezone.utc).isoformat(), page_hash, PARSER_VERSION, game_id
+                ))
+                updated += 1
+        conn.commit()
+        return updated, len(jobs)
+    finally:
+        conn.close()
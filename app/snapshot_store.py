@@ -0,0 +1,140 @@
+import hashlib
+import os
+import threading
+import time
+import zlib
+
+from app.logging_config import logger
+
+try:
+    import zstandard
+except ImportError: # Optional: zlib is used when zstandard isn't installed
+    zstandard = None
+
+# --- Configuration ---
+# Raw thread HTML is kept so the parser can be re-run offline (see reparse_snapshots.py)
+SNAPSHOTS_ENABLED = os.getenv("SNAPSHOTS_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "/data/html_snapshots")
+# Retention: newest N distinct snapshots per thread, and nothing older than the max age
+# (except each thread's newest snapshot, which is what a re-parse reads)
+SNAPSHOT_KEEP_PER_THREAD = int(os.getenv("SNAPSHOT_KEEP_PER_THREAD", "3"))
+SNAPSHOT_MAX_AGE_DAYS = int(os.getenv("SNAPSHOT_MAX_AGE_DAYS", "90"))
+
+_ZSTD_SUFFIX = ".html.zst"
+_ZLIB_SUFFIX = ".html.z"
+_write_lock = threading.Lock()
+
+
+def _compress(data):
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=10).compress(data), _ZSTD_SUFFIX
+    return zlib.compress(data, 9), _ZLIB_SUFFIX
+
+def _decompress(path, blob):
+    if path.endswith(_ZSTD_SUFFIX):
+        if zstandard is None:
+            raise RuntimeError(f"{path} is zstd compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return zlib.decompress(blob)
+
+def _thread_dir(thread_id, snapshot_dir=None):
+    return os.path.join(snapshot_dir or SNAPSHOT_DIR, str(thread_id))
+
+def _snapshot_files(thread_id, snapshot_dir=None):
+    """Returns [(mtime, content_hash, path)] for a thread, newest first."""
+    directory = _thread_dir(thread_id, snapshot_dir)
+    if not os.path.isdir(directory):
+        return []
+    files = []
+    for name in os.listdir(directory):
+        if not (name.endswith(_ZSTD_SUFFIX) or name.endswith(_ZLIB_SUFFIX)):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            files.append((os.path.getmtime(path), name.split('.', 1)[0], path))
+        except OSError:
+            continue
+    files.sort(reverse=True)
+    return files
+
+
+def content_hash(html):
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+def save_snapshot(thread_id, html, snapshot_dir=None):
+    """
+    Stores the raw HTML of a thread page under <dir>/<thread_id>/<sha256>.
+    Identical content is stored once (the existing file is just marked as newest).
+    Returns the content hash, or None when snapshots are disabled or the write failed.
+    """
+    if not SNAPSHOTS_ENABLED or not thread_id or not html:
+        return None
+
+    digest = content_hash(html)
+    directory = _thread_dir(thread_id, snapshot_dir)
+    try:
+        with _write_lock:
+            for _, existing_hash, path in _snapshot_files(thread_id, snapshot_dir):
+                if existing_hash == digest:
+                    os.utime(path, None)
+                    return digest
+
+            os.makedirs(directory, exist_ok=True)
+            blob, suffix = _compress(html.encode('utf-8'))
+            path = os.path.join(directory, digest + suffix)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+
+            # Per-thread retention
+            for _, _, old_path in _snapshot_files(thread_id, snapshot_dir)[max(1, SNAPSHOT_KEEP_PER_THREAD):]:
+                os.remove(old_path)
+        logger.debug(f"Snapshot stored for thread {thread_id} ({len(html)} -> {len(blob)} bytes).")
+        return digest
+    except OSError as e:
+        logger.warning(f"Could not store HTML snapshot for thread {thread_id}: {e}")
+        return None
+
+def load_snapshot(thread_id, digest=None, snapshot_dir=None):
+    """
+    Returns (content_hash, html) for the given snapshot, or the thread's newest one when digest is None.
+    Returns (None, None) if there is none.
+    """
+    for _, existing_hash, path in _snapshot_files(thread_id, snapshot_dir):
+        if digest is None or existing_hash == digest:
+            try:
+                with open(path, 'rb') as f:
+                    return existing_hash, _decompress(path, f.read()).decode('utf-8')
+            except (OSError, RuntimeError, zlib.error) as e:
+                logger.warning(f"Could not read HTML snapshot {path}: {e}")
+                return None, None
+    return None, None
+
+def list_snapshot_threads(snapshot_dir=None):
+    """Thread IDs that have at least one snapshot."""
+    root = snapshot_dir or SNAPSHOT_DIR
+    if not os.path.isdir(root):
+        return []
+    return sorted(name for name in os.listdir(root) if os.path.isdir(os.path.join(root, name)))
+
+def prune_snapshots(max_age_days=None, snapshot_dir=None):
+    """Applies the age limit to every thread (keeping each thread's newest snapshot). Returns the number of files removed."""
+    if max_age_days is None:
+        max_age_days = SNAPSHOT_MAX_AGE_DAYS
+    if max_age_days <= 0:
+        return 0
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for thread_id in list_snapshot_threads(snapshot_dir):
+        with _write_lock:
+            for mtime, _, path in _snapshot_files(thread_id, snapshot_dir)[1:]:
+                if mtime < cutoff:
+                    try:
+                        os.remove(path)
+                        removed += 1
+                    except OSError as e:
+                        logger.warning(f"Could not remove old snapshot {path}: {e}")
+    if removed:
+        logger.info(f"Pruned {removed} HTML snapshots older than {max_age_days} days.")
+    return removed
@@ -0,0 +1,209 @@
+"""
+Offline benchmark and golden-output parity check for parse_game_page_content.
+
+Parses every page in benchmarks/fixtures/ (anonymized F95zone thread HTML) with each parser mode and reports
+throughput (pages/s), p50/p99 latency and peak memory per page. Every mode's output is compared with
+benchmarks/golden/<fixture>.json, and first_post_hash is checked to ignore reply-only changes (so the
+unchanged-page skip fires on active threads) but not first-post edits; any failure makes the script exit with status 1.
+
+    python benchmarks/run_parser_benchmark.py                      # benchmark all modes + parity check
+    python benchmarks/run_parser_benchmark.py --mode single_pass+fast --iterations 50
+    python benchmarks/run_parser_benchmark.py --check-only         # parity only, no timing
+    python benchmarks/run_parser_benchmark.py --update-golden      # re-record golden output (legacy mode)
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCHMARK_DIR, "fixtures")
+GOLDEN_DIR = os.path.join(BENCHMARK_DIR, "golden")
+
+# Add project root to path
+sys.path.append(os.path.dirname(BENCHMARK_DIR))
+os.environ.setdefault("LOG_FILE_PATH", os.path.join(BENCHMARK_DIR, "benchmark.log"))
+
+from app.f95_web_scraper import parse_game_page_content, first_post_hash
+
+# The parser logs per page; keep that I/O out of the measurements
+logging.getLogger("AVNCodex").setLevel(logging.ERROR)
+
+FIXTURE_URL = "https://f95zone.to/threads/fixture.1/"
+# name -> parse_game_page_content keyword arguments. "legacy" is the reference the golden output comes from.
+MODES = {
+    "legacy": {"fast": False, "engine": "legacy"},
+    "legacy+fast": {"fast": True, "engine": "legacy"},
+    "single_pass": {"fast": False, "engine": "single_pass"},
+    "single_pass+fast": {"fast": True, "engine": "single_pass"},
+}
+
+
+def load_fixtures(name_filter=None):
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        if name_filter and name_filter not in name:
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            fixtures[name] = f.read()
+    return fixtures
+
+
+def golden_path(name):
+    return os.path.join(GOLDEN_DIR, f"{name}.json")
+
+
+def update_golden(fixtures):
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    for name, html in fixtures.items():
+        result = parse_game_page_content(html, FIXTURE_URL, **MODES["legacy"])
+        with open(golden_path(name), "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False, sort_keys=True)
+            f.write("\n")
+        print(f"Recorded {golden_path(name)}")
+
+
+def check_parity(fixtures, modes):
+    """Returns a list of (mode, fixture, differing keys) for outputs that don't match the golden files."""
+    mismatches = []
+    for name, html in fixtures.items():
+        if not os.path.exists(golden_path(name)):
+            mismatches.append(("-", name, ["<no golden file, run with --update-golden>"]))
+            continue
+        with open(golden_path(name), "r", encoding="utf-8") as f:
+            expected = json.load(f)
+        for mode in modes:
+            # Round-trip through JSON so tuples/None compare the same way as the stored file
+            actual = json.loads(json.dumps(parse_game_page_content(html, FIXTURE_URL, **MODES[mode])))
+            if actual != expected:
+                keys = sorted(k for k in set(expected) | set(actual) if expected.get(k) != actual.get(k))
+                mismatches.append((mode, name, keys))
+    return mismatches
+
+
+def _vary_replies(html):
+    """Same page with the last reply author's Messages count, every timestamp and the reaction counts changed."""
+    last_messages = html.rfind("<dt>Messages</dt><dd>")
+    if last_messages != -1:
+        start = last_messages + len("<dt>Messages</dt><dd>")
+        html = html[:start] + "98765" + html[html.index("</dd>", start):]
+    html = re.sub(r"(<time\b[^>]*>)[^<]*(</time>)", r"\g<1>2030-01-01T00:00:00+0000\g<2>", html)
+    html = re.sub(r'data-time="\d+"', 'data-time="1900000000"', html)
+    return html.replace(" and 0 others", " and 41 others")
+
+
+def _vary_first_post(html):
+    """Same page with an extra sentence at the start of the first post's bbWrapper."""
+    marker = '<div class="bbWrapper">'
+    index = html.index(marker) + len(marker)
+    return html[:index] + "Edited by the developer. " + html[index:]
+
+
+def check_first_post_hash(fixtures):
+    """Returns a list of (fixture, problem) where first_post_hash reacts to replies or misses a first-post edit."""
+    problems = []
+    for name, html in fixtures.items():
+        page_hash = first_post_hash(html)
+        replies_changed = _vary_replies(html)
+        if replies_changed == html:
+            problems.append((name, "fixture has no replies to vary"))
+        elif first_post_hash(replies_changed) != page_hash:
+            problems.append((name, "hash changed when only replies changed (unchanged-page skip would not fire)"))
+        elif parse_game_page_content(replies_changed, FIXTURE_URL) != parse_game_page_content(html, FIXTURE_URL):
+            problems.append((name, "parsed output changed when only replies changed"))
+        if first_post_hash(_vary_first_post(html)) == page_hash:
+            problems.append((name, "hash unchanged after a first-post edit"))
+    return problems
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def benchmark_mode(fixtures, mode, iterations):
+    kwargs = MODES[mode]
+    for html in fixtures.values(): # Warm-up (imports, regex compilation, caches)
+        parse_game_page_content(html, FIXTURE_URL, **kwargs)
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for html in fixtures.values():
+            t0 = time.perf_counter()
+            parse_game_page_content(html, FIXTURE_URL, **kwargs)
+            latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    # Memory is measured separately: tracemalloc slows parsing down considerably
+    peaks = []
+    for html in fixtures.values():
+        tracemalloc.start()
+        parse_game_page_content(html, FIXTURE_URL, **kwargs)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "pages_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_peak_mb": statistics.mean(peaks) / (1024 * 1024),
+        "max_peak_mb": max(peaks) / (1024 * 1024),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parse_game_page_content on the offline fixture corpus.")
+    parser.add_argument("--mode", action="append", choices=sorted(MODES), help="Parser mode(s) to run (default: all).")
+    parser.add_argument("--iterations", type=int, default=10, help="Passes over the corpus per mode (default: 10).")
+    parser.add_argument("--fixture", help="Only use fixtures whose name contains this string.")
+    parser.add_argument("--check-only", action="store_true", help="Only run the golden-output parity check.")
+    parser.add_argument("--update-golden", action="store_true", help="Re-record golden output from the legacy mode.")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixture)
+    if not fixtures:
+        print(f"No fixtures found in {FIXTURES_DIR}.")
+        return 1
+    modes = args.mode or list(MODES)
+
+    if args.update_golden:
+        update_golden(fixtures)
+        return 0
+
+    if not args.check_only:
+        print(f"{len(fixtures)} fixtures, {args.iterations} iterations per mode")
+        print(f"{'mode':<18} {'pages/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'peak MB (mean/max)':>20}")
+        for mode in modes:
+            stats = benchmark_mode(fixtures, mode, args.iterations)
+            print(f"{mode:<18} {stats['pages_per_s']:>9.1f} {stats['p50_ms']:>9.1f} {stats['p99_ms']:>9.1f} "
+                  f"{stats['mean_peak_mb']:>10.1f}/{stats['max_peak_mb']:<9.1f}")
+
+    mismatches = check_parity(fixtures, modes)
+    if mismatches:
+        print("Golden output parity: FAILED")
+        for mode, name, keys in mismatches:
+            print(f"  {mode:<18} {name}: {', '.join(keys)}")
+        return 1
+    print(f"Golden output parity: OK ({len(fixtures)} fixtures x {len(modes)} modes)")
+
+    hash_problems = check_first_post_hash(fixtures)
+    if hash_problems:
+        print("First post hash: FAILED")
+        for name, problem in hash_problems:
+            print(f"  {name}: {problem}")
+        return 1
+    print(f"First post hash: OK ({len(fixtures)} fixtures, replies ignored, first-post edits detected)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Micro-benchmark and parity check for the RSS item parser (f95apiclient/rss_parser.py).
+
+Parses benchmarks/fixtures/rss/*.xml (anonymized latest-updates feeds) with the streaming lxml parser and
+with the previous feedparser-based parse, reports items/s and p50/p99 latency per document, and checks that
+both produce identical items. Any difference makes the script exit with status 1.
+--rows repeats the fixture's items to simulate larger feeds (F95zone serves 60-500 rows per request).
+
+    python benchmarks/run_rss_parser_benchmark.py                     # 90-row fixture
+    python benchmarks/run_rss_parser_benchmark.py --rows 500 --iterations 50
+    python benchmarks/run_rss_parser_benchmark.py --check-only
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+RSS_FIXTURES_DIR = os.path.join(BENCHMARK_DIR, "fixtures", "rss")
+
+# Add project root to path
+sys.path.append(os.path.dirname(BENCHMARK_DIR))
+
+from f95apiclient.rss_parser import parse_rss_items, parse_rss_items_feedparser
+
+PARSERS = {
+    "feedparser": parse_rss_items_feedparser,
+    "lxml_iterparse": parse_rss_items,
+}
+
+
+def load_fixtures(rows=None):
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(RSS_FIXTURES_DIR, "*.xml"))):
+        with open(path, "rb") as f:
+            content = f.read()
+        if rows:
+            content = _resize_feed(content, rows)
+        fixtures[os.path.splitext(os.path.basename(path))[0]] = content
+    return fixtures
+
+
+def _resize_feed(content, rows):
+    """Repeats (or truncates) the <item> elements of a feed to `rows` items."""
+    items = re.findall(rb"<item>.*?</item>", content, re.DOTALL)
+    head = content[:content.index(b"<item>")]
+    tail = content[content.rindex(b"</item>") + len(b"</item>"):]
+    resized = [items[i % len(items)] for i in range(rows)]
+    return head + b"\n".join(resized) + tail
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def benchmark_parser(fixtures, name, iterations):
+    parse = PARSERS[name]
+    for content in fixtures.values(): # Warm-up (imports, regex compilation)
+        parse(content)
+
+    latencies = []
+    items = 0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for content in fixtures.values():
+            t0 = time.perf_counter()
+            items += len(parse(content))
+            latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "items_per_s": items / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def check_parity(fixtures):
+    """Returns a list of (fixture, item index) where the two parsers disagree."""
+    mismatches = []
+    for name, content in fixtures.items():
+        expected = parse_rss_items_feedparser(content)
+        actual = parse_rss_items(content)
+        if len(expected) != len(actual):
+            mismatches.append((name, f"{len(actual)} items, expected {len(expected)}"))
+            continue
+        mismatches.extend((name, f"item {i}") for i, (a, b) in enumerate(zip(actual, expected)) if a != b)
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the streaming RSS parser against feedparser.")
+    parser.add_argument("--rows", type=int, help="Resize each fixture feed to this many items.")
+    parser.add_argument("--iterations", type=int, default=20, help="Passes over the fixtures per parser (default: 20).")
+    parser.add_argument("--check-only", action="store_true", help="Only run the parity check.")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.rows)
+    if not fixtures:
+        print(f"No fixtures found in {RSS_FIXTURES_DIR}.")
+        return 1
+
+    if not args.check_only:
+        print(f"{len(fixtures)} feeds, {args.iterations} iterations per parser")
+        print(f"{'parser':<16} {'items/s':>10} {'p50 ms':>9} {'p99 ms':>9}")
+        for name in PARSERS:
+            stats = benchmark_parser(fixtures, name, args.iterations)
+            print(f"{name:<16} {stats['items_per_s']:>10.0f} {stats['p50_ms']:>9.2f} {stats['p99_ms']:>9.2f}")
+
+    mismatches = check_parity(fixtures)
+    if mismatches:
+        print("Parser parity: FAILED")
+        for name, where in mismatches:
+            print(f"  {name}: {where}")
+        return 1
+    print(f"Parser parity: OK ({len(fixtures)} feeds)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 # f95apiclient/__init__.py
 
 import requests
+import urllib3
 from requests.exceptions import ProxyError, ConnectTimeout, ReadTimeout, SSLError # For retry logic
 from bs4 import BeautifulSoup # Removed NavigableString, Tag as _parse_handiwork_page is removed
 # import json # Removed as JSON-LD parsing is removed
@@ -15,8 +16,16 @@ from urllib.parse import urlparse # To get path and extension from URL
 import json
 import os # Added for OS path operations
 
+from f95apiclient.direct_circuit import get_direct_circuit
+from f95apiclient.image_index import get_image_index, conditional_headers, IMAGE_CACHE_REVALIDATE
+from f95apiclient.proxy_pool import get_proxy_pool
+from f95apiclient.rate_limit import get_rate_limiter, THROTTLE_STATUS_CODES
+from f95apiclient.rss_cache import get_rss_cache
+from f95apiclient.rss_parser import iter_rss_stream
+
 # Setup basic logging
 # logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
 # --- Constants based on F95API (Node.js version) ---
 F95_BASE_URL = "https://f95zone.to"
@@ -59,9 +68,99 @@ MD_KEY_AUTHOR = ["Author", "Developer", "Creator"]
 # --- Image Cache Constants ---
 IMAGE_CACHE_DIR = "/data/image_cache" # Filesystem path
 IMAGE_CACHE_WEB_PATH_PREFIX = "/cached_images/" # Web path prefix
+IMAGE_CONTENT_TYPE_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+    'image/bmp': '.bmp',
+    'image/tiff': '.tif'
+}
+
+def cached_image_filenames(url_hash):
+    """File names an image with this URL hash can have in IMAGE_CACHE_DIR (one per known extension)."""
+    return [f"{url_hash}{extension}" for extension in dict.fromkeys(IMAGE_CONTENT_TYPE_EXTENSIONS.values())]
 
 # Removed get_direct_text as it was used by _parse_handiwork_page
 
+def build_rss_params(base_url, limit=90, search_term=None, completion_status_filter=None, tags=None, notags=None,
+                     engines=None, creator=None, page=1):
+    """
+    Builds the latest_data.php RSS request for the given filters (shared by F95ApiClient and AsyncF95ApiClient).
+    Returns (base RSS URL, list of (name, value) query parameters).
+    """
+    base_rss_url = f"{base_url}/sam/latest_alpha/latest_data.php"
+    url_params_dict = {'cmd': 'rss', 'cat': 'games', 'rows': str(limit)}
+    if page and page > 1:
+        url_params_dict['page'] = str(page)
+
+    if search_term:
+        url_params_dict['search'] = search_term # requests will handle URL encoding of params
+        logger.info(f"Fetching RSS feed with search term: '{search_term}', limit: {limit}")
+    else:
+        logger.info(f"Fetching RSS feed, limit: {limit}")
+
+    if creator:
+        url_params_dict['creator'] = creator
+        logger.info(f"Filtering RSS for Creator: {creator}")
+
+    prefix_params = []
+    
+    # Status Filter
+    if completion_status_filter:
+        if completion_status_filter == "completed":
+            prefix_params.append(("prefixes[]", "18"))
+            logger.info("Filtering RSS for: Completed games")
+        elif completion_status_filter == "ongoing":
+            prefix_params.append(("noprefixes[]", "18"))
+            prefix_params.append(("noprefixes[]", "20")) 
+            prefix_params.append(("noprefixes[]", "22")) 
+            logger.info("Filtering RSS for: Ongoing games (not completed, on hold, or abandoned)")
+        elif completion_status_filter == "on_hold":
+             prefix_params.append(("prefixes[]", "20"))
+             logger.info("Filtering RSS for: On Hold games")
+        elif completion_status_filter == "abandoned":
+             prefix_params.append(("prefixes[]", "22"))
+             logger.info("Filtering RSS for: Abandoned games")
+    
+    # Engine Filter
+    if engines:
+        for engine_id in engines:
+            prefix_params.append(("prefixes[]", str(engine_id)))
+        logger.info(f"Filtering RSS for Engines: {engines}")
+
+    # Tags Filter (Include)
+    if tags:
+        # RSS uses tags=ID,ID,ID format or multiple tags[]?
+        # From research: tags=1507 (single). For multiple? 
+        # Usually URL parameters repeat: tags[]=1&tags[]=2 OR comma separated tags=1,2
+        # The browser documentation example uses 'tags=1507'.
+        # Looking at F95 structure, it often uses lists. Let's try appending tuples.
+        # However, looking at the user provided URL: tags=1507.
+        # Let's assume list format 'tags[]' like prefixes for safety, OR single 'tags' if it's one.
+        # Wait, the screenshot showed 'Select a tag...'. 
+        # If standard XenForo/F95, likely list.
+        # But the user example `tags=1507` suggests simple param. 
+        # Let's use list tuples to be safe with requests: tags[]
+        for tag_id in tags:
+            prefix_params.append(("tags[]", str(tag_id))) 
+        logger.info(f"Filtering RSS for Tags: {tags}")
+
+    # Tags Filter (Exclude)
+    if notags:
+        for tag_id in notags:
+            prefix_params.append(("notags[]", str(tag_id)))
+        logger.info(f"Filtering RSS to Exclude Tags: {notags}")
+    
+    # Construct query string manually for list-like parameters if requests encode them differently than expected
+    # For "prefixes[]=18", requests typically encodes params={'prefixes[]': '18'} as prefixes%5B%5D=18
+    # If multiple prefixes are needed, e.g. prefixes[]=18&prefixes[]=19
+    # we can pass a list of tuples to params: params=[('prefixes[]', '18'), ('prefixes[]', '19')]
+    
+    final_url_params = list(url_params_dict.items()) + prefix_params
+    return base_rss_url, final_url_params
+
+
 class F95ApiClient:
     def __init__(self, session_cookies=None, max_attempts=5, retry_delay_seconds=5, request_timeout=15, use_proxies=True):
         """
@@ -95,6 +194,11 @@ class F95ApiClient:
         self.retry_delay_seconds = retry_delay_seconds # Kept, but not used in the immediate proxy switch loop
         self.request_timeout = request_timeout
         self.use_proxies = use_proxies
+        self.rate_limiter = get_rate_limiter() # Shared by all clients (and the Playwright scraper) in this process
+        self.rss_cache = get_rss_cache() # Shared by all clients, so repeated searches across games/users hit it too
+        self.image_index = get_image_index() # Original image URL -> cached file, so cached images need no request
+        self.proxy_pool = get_proxy_pool() # Health scores of the proxies below, shared by all clients and persisted
+        self.direct_circuit = get_direct_circuit() # Skips the direct first attempt while direct requests keep failing
         self.available_proxies = [] # Will store tuples of (proxy_url_str, scheme_for_requests_dict)
         self.current_proxy = None # Initialize current_proxy
 
@@ -241,10 +345,14 @@ class F95ApiClient:
                      self.logger.warning(f"Failed to save proxy cache: {e}")
             else:
                 self.logger.warning("No proxies were loaded from any source.")
-            
+
+        if self.available_proxies:
+            self.proxy_pool.set_candidates(self.available_proxies) # Probes new candidates in the background
+
     def _set_random_proxy(self):
         """
-        Configures the session to use one randomly selected proxy from self.available_proxies.
+        Configures the session to use a proxy from self.available_proxies, picked by the proxy pool
+        (weighted by health score among probed proxies; quarantined ones are skipped).
         """
         if not self.available_proxies:
             # Lazy Load Trigger
@@ -255,7 +363,13 @@ class F95ApiClient:
             self.session.proxies = {} # Ensure no proxy is set
             return False
 
-        selected_proxy_url, scheme = random.choice(self.available_proxies)
+        # Waits briefly for the first background probes if none has answered yet
+        selected = self.proxy_pool.choose(exclude={self.current_proxy} if self.current_proxy else ())
+        if selected is None:
+            self.logger.warning("No healthy proxy in the pool (all probed proxies failed or are quarantined).")
+            self.session.proxies = {}
+            return False
+        selected_proxy_url, scheme = selected
         
         # The 'scheme' here is what requests needs ('http', 'socks5h', etc.)
         # The actual proxy_url already includes its own scheme (e.g. http://ip:port or socks5h://ip:port)
@@ -267,8 +381,17 @@ class F95ApiClient:
         self.logger.info(f"Session configured to use proxy: {selected_proxy_url} (type derived from its scheme: {scheme})")
         return True
 
-    def _make_request(self, method: str, url: str, params: Optional[dict] = None, data: Optional[dict] = None, headers: Optional[dict] = None, stream: bool = False) -> requests.Response:
-        """Makes an HTTP request with the current session, handling proxies and retries."""
+    def _make_request(self, method: str, url: str, params: Optional[dict] = None, data: Optional[dict] = None, headers: Optional[dict] = None, stream: bool = False, max_attempts: Optional[int] = None,
+                      cookies=None, allow_proxy: bool = True) -> requests.Response:
+        """
+        Makes an HTTP request with the current session, handling proxies and retries.
+        max_attempts: Optional per-call override of self.max_attempts.
+        cookies: Cookies sent with this request only (the session's cookie jar is left untouched).
+        allow_proxy: False keeps every attempt direct, even while the direct connection circuit is open.
+                     Requests carrying login cookies must use it: public proxies could read them (verify=False).
+        """
+        attempts_allowed = max_attempts or self.max_attempts
+        use_proxies = self.use_proxies and allow_proxy
         
         effective_headers = self.session.headers.copy()
         if headers:
@@ -279,13 +402,18 @@ class F95ApiClient:
         log_proxy_info = "direct connection" 
         attempt_with_proxy_activated = False 
 
-        for attempt in range(self.max_attempts):
-            self.logger.debug(f"Request attempt {attempt + 1}/{self.max_attempts} to {method.upper()} {url}")
+        for attempt in range(attempts_allowed):
+            self.logger.debug(f"Request attempt {attempt + 1}/{attempts_allowed} to {method.upper()} {url}")
             
             current_proxies_for_request = None # Default to no proxy / direct
 
+            # While direct requests keep failing in this process, skip straight to a proxy (except for the periodic probe)
+            if use_proxies and attempt == 0 and not attempt_with_proxy_activated and not self.direct_circuit.allow_direct():
+                self.logger.info(f"Attempt {attempt + 1}: Direct connection circuit is open. Going through a proxy.")
+                attempt_with_proxy_activated = True
+
             # Determine if proxy should be used for this attempt
-            if self.use_proxies: # Check if proxies are enabled generally
+            if use_proxies: # Check if proxies are enabled generally
                 if attempt == 0 and not attempt_with_proxy_activated:
                     # First attempt for a request sequence is direct by default, unless forced
                     self.logger.info(f"Attempt {attempt + 1}: Initial attempt will be direct (no proxy).")
@@ -308,10 +436,18 @@ class F95ApiClient:
                         current_proxies_for_request = {}
             else:
                 # Proxies not enabled or none loaded, always direct
-                self.logger.info(f"Attempt {attempt + 1}: Making request directly (proxies explicitly disabled).")
+                self.logger.info(f"Attempt {attempt + 1}: Making request directly (proxies disabled{'' if allow_proxy else ' for this request'}).")
                 log_proxy_info = "direct connection (proxies disabled)"
                 current_proxies_for_request = {}
 
+            # Pace requests to f95zone (per host + endpoint class). A 429/503 below pushes the next slot back.
+            if not self.rate_limiter.acquire(url):
+                self.logger.error(f"Rate limiter has no slot for {url} within the wait limit. Giving up on this request.")
+                return None
+
+            proxy_used = self.current_proxy if current_proxies_for_request else None
+            is_direct = not current_proxies_for_request
+            request_started = time.monotonic()
             try:
                 response = self.session.request(
                     method,
@@ -321,18 +457,35 @@ class F95ApiClient:
                     headers=effective_headers,
                     timeout=self.request_timeout,
                     allow_redirects=True,
-                    proxies=current_proxies_for_request, # Explicitly pass proxies for this specific request call
+                    # Explicitly pass proxies for this specific request call. For direct attempts the session's proxy
+                    # (left over from an earlier proxied attempt) is overridden with None, as {} would be merged with it.
+                    proxies=current_proxies_for_request or {key: None for key in self.session.proxies},
+                    cookies=cookies,
                     stream=stream # Pass stream parameter
                 )
+                self.rate_limiter.record_response(url, response.status_code, response.headers.get('Retry-After'))
+                if proxy_used:
+                    # A 403 through a proxy means the proxy is blocked; anything else means it works
+                    self.proxy_pool.record(proxy_used, response.status_code != 403, (time.monotonic() - request_started) * 1000)
+                elif is_direct:
+                    # Same for direct requests: a 403 means our own address is blocked
+                    if response.status_code == 403:
+                        self.direct_circuit.record_failure()
+                    else:
+                        self.direct_circuit.record_success()
                 response.raise_for_status()  # Raise HTTPError for bad responses (4XX or 5XX)
                 return response # Success
             
             except (requests.exceptions.ConnectionError, ConnectTimeout, ReadTimeout, SSLError, ProxyError) as e: # Combined common connection/proxy errors
-                self.logger.warning(f"Attempt {attempt + 1}/{self.max_attempts} with {log_proxy_info} failed: {type(e).__name__} - {e}")
+                self.logger.warning(f"Attempt {attempt + 1}/{attempts_allowed} with {log_proxy_info} failed: {type(e).__name__} - {e}")
                 last_exception = e
+                if proxy_used:
+                    self.proxy_pool.record(proxy_used, False) # Quarantined with an exponential cool-down
+                elif is_direct:
+                    self.direct_circuit.record_failure()
                 
                 # If this was a direct attempt and it failed with a connection-related error, activate proxy usage for next time.
-                if not attempt_with_proxy_activated and current_proxies_for_request is None and self.use_proxies:
+                if not attempt_with_proxy_activated and current_proxies_for_request is None and use_proxies:
                     if isinstance(e, requests.exceptions.ConnectionError) and "Max retries exceeded" in str(e):
                         self.logger.info(f"Direct attempt failed with 'Max retries exceeded'. Activating proxy usage for subsequent attempts.")
                         attempt_with_proxy_activated = True
@@ -350,19 +503,19 @@ class F95ApiClient:
                         attempt_with_proxy_activated = True
 
 
-                if attempt < self.max_attempts - 1:
-                    self.logger.info(f"Continuing to attempt {attempt + 2}/{self.max_attempts}. Next will {'use proxy' if attempt_with_proxy_activated else 'be direct'}.")
+                if attempt < attempts_allowed - 1:
+                    self.logger.info(f"Continuing to attempt {attempt + 2}/{attempts_allowed}. Next will {'use proxy' if attempt_with_proxy_activated else 'be direct'}.")
                     continue 
                 else:
-                    self.logger.error(f"All {self.max_attempts} attempts failed. Last error ({type(e).__name__}) on {log_proxy_info}: {e}")
+                    self.logger.error(f"All {attempts_allowed} attempts failed. Last error ({type(e).__name__}) on {log_proxy_info}: {e}")
             
             except requests.exceptions.HTTPError as e:
-                self.logger.warning(f"Attempt {attempt + 1}/{self.max_attempts} with {log_proxy_info} failed: HTTPError {e.response.status_code} {e.response.reason}")
+                self.logger.warning(f"Attempt {attempt + 1}/{attempts_allowed} with {log_proxy_info} failed: HTTPError {e.response.status_code} {e.response.reason}")
                 last_exception = e
 
                 # If this was a direct attempt and it's a 403, activate proxy usage.
                 activated_proxy_on_this_403 = False
-                if not attempt_with_proxy_activated and current_proxies_for_request == {} and e.response.status_code == 403 and self.use_proxies:
+                if not attempt_with_proxy_activated and current_proxies_for_request == {} and e.response.status_code == 403 and use_proxies:
                     self.logger.info(f"Direct attempt failed with HTTP 403. Activating proxy usage for subsequent attempts.")
                     attempt_with_proxy_activated = True
                     activated_proxy_on_this_403 = True
@@ -370,42 +523,43 @@ class F95ApiClient:
                 # Retry for 403 (Forbidden), 429 (Too Many Requests) or 5xx server errors, 
                 # OR if we just activated proxies due to a 403 on a direct attempt.
                 if e.response.status_code == 403 or e.response.status_code == 429 or e.response.status_code >= 500 or activated_proxy_on_this_403:
-                    if attempt < self.max_attempts - 1:
-                        self.logger.info(f"HTTPError {e.response.status_code} is retryable or proxy activated. Continuing to attempt {attempt + 2}/{self.max_attempts}.")
+                    if attempt < attempts_allowed - 1:
+                        self.logger.info(f"HTTPError {e.response.status_code} is retryable or proxy activated. Continuing to attempt {attempt + 2}/{attempts_allowed}.")
                         
                         # If proxies are enabled and available, always try to set a new one for the next attempt after these errors.
-                        if self.use_proxies:
+                        if use_proxies:
                             self.logger.info(f"Forcing new proxy selection after HTTP {e.response.status_code} on {log_proxy_info}.")
                             if not self._set_random_proxy():
                                 self.logger.warning("Failed to set a new proxy for the next attempt. It might be direct or use a previous proxy if one was already set and not cleared.")
                         
-                        # Add delay, especially for 429
-                        time.sleep(self.retry_delay_seconds * (1 + (e.response.status_code == 429)))
+                        # 429/503 are paced by the rate limiter (Retry-After / backoff) on the next acquire
+                        if e.response.status_code not in THROTTLE_STATUS_CODES:
+                            time.sleep(self.retry_delay_seconds)
                         continue # Proceed to the next attempt in the loop
                     else:
-                        self.logger.error(f"All {self.max_attempts} attempts failed. Last HTTPError: {e.response.status_code} on {log_proxy_info}")
+                        self.logger.error(f"All {attempts_allowed} attempts failed. Last HTTPError: {e.response.status_code} on {log_proxy_info}")
                 else:
                     # For other HTTP errors (e.g., 400, 401, 404), don't retry, return the response immediately.
                     self.logger.error(f"Non-retryable HTTPError {e.response.status_code} on {log_proxy_info}. Returning error response immediately.")
                     return e.response 
             
             except Exception as e: # Catch any other unexpected errors during the request
-                self.logger.error(f"An unexpected error occurred on attempt {attempt + 1}/{self.max_attempts} for {url} with {log_proxy_info}: {type(e).__name__} - {e}", exc_info=True)
+                self.logger.error(f"An unexpected error occurred on attempt {attempt + 1}/{attempts_allowed} for {url} with {log_proxy_info}: {type(e).__name__} - {e}", exc_info=True)
                 last_exception = e
                 # Activate proxies if direct attempt failed with unexpected error.
-                if not attempt_with_proxy_activated and current_proxies_for_request is None and self.use_proxies:
+                if not attempt_with_proxy_activated and current_proxies_for_request is None and use_proxies:
                     self.logger.info(f"Direct attempt failed with unexpected error. Activating proxy usage for subsequent attempts.")
                     attempt_with_proxy_activated = True
 
-                if attempt < self.max_attempts - 1:
-                    self.logger.info(f"Continuing to attempt {attempt + 2}/{self.max_attempts} after unexpected error.")
+                if attempt < attempts_allowed - 1:
+                    self.logger.info(f"Continuing to attempt {attempt + 2}/{attempts_allowed} after unexpected error.")
                     continue
                 else:
-                    self.logger.error(f"All {self.max_attempts} attempts failed with unexpected error. Last error ({type(e).__name__}): {e}")
+                    self.logger.error(f"All {attempts_allowed} attempts failed with unexpected error. Last error ({type(e).__name__}): {e}")
 
         # If loop finishes, all attempts failed.
         if last_exception: # If no HTTP response but an exception was caught
-            self.logger.error(f"Request to {url} failed after {self.max_attempts} attempts. Last exception: {last_exception}")
+            self.logger.error(f"Request to {url} failed after {attempts_allowed} attempts. Last exception: {last_exception}")
         return None # All attempts failed
 
     def _get_xf_token(self, url_to_fetch_token_from=None):
@@ -523,177 +677,78 @@ class F95ApiClient:
 
     def get_latest_game_data_from_rss(self, limit=90, search_term: str = None, completion_status_filter: str = None, 
                                       tags: list = None, notags: list = None, engines: list = None,
-                                      creator: str = None) -> list[dict]:
+                                      creator: str = None, page: int = 1, use_cache: bool = True) -> list[dict]:
         """
         Fetches and parses game data from the F95Zone RSS feed using the new _make_request method.
-        Supports filtering by Tags, Engines, Status, and Creator.
+        Supports filtering by Tags, Engines, Status, and Creator. page: 1-based page of `limit` items (newest first).
+        Results are cached for RSS_CACHE_TTL_SECONDS per distinct query (see rss_cache); identical
+        concurrent queries share one request. use_cache=False always fetches (and doesn't store).
+        Returns a list the caller may modify, or None if the feed could not be fetched.
         """
-        base_rss_url = f"{self.base_url}/sam/latest_alpha/latest_data.php"
-        url_params_dict = {'cmd': 'rss', 'cat': 'games', 'rows': str(limit)}
-
-        if search_term:
-            url_params_dict['search'] = search_term # requests will handle URL encoding of params
-            self.logger.info(f"Fetching RSS feed with search term: '{search_term}', limit: {limit}")
-        else:
-            self.logger.info(f"Fetching RSS feed, limit: {limit}")
+        base_rss_url, final_url_params = build_rss_params(self.base_url, limit, search_term, completion_status_filter,
+                                                          tags, notags, engines, creator, page)
 
-        if creator:
-            url_params_dict['creator'] = creator
-            self.logger.info(f"Filtering RSS for Creator: {creator}")
+        if not use_cache:
+            return self._fetch_rss_items(base_rss_url, final_url_params, search_term)
+        # The order of repeated list parameters (tags[], prefixes[]) doesn't change the result
+        cache_key = tuple(sorted(final_url_params))
+        return self.rss_cache.get_or_fetch(cache_key, lambda: self._fetch_rss_items(base_rss_url, final_url_params, search_term))
 
-        prefix_params = []
-        
-        # Status Filter
-        if completion_status_filter:
-            if completion_status_filter == "completed":
-                prefix_params.append(("prefixes[]", "18"))
-                self.logger.info("Filtering RSS for: Completed games")
-            elif completion_status_filter == "ongoing":
-                prefix_params.append(("noprefixes[]", "18"))
-                prefix_params.append(("noprefixes[]", "20")) 
-                prefix_params.append(("noprefixes[]", "22")) 
-                self.logger.info("Filtering RSS for: Ongoing games (not completed, on hold, or abandoned)")
-            elif completion_status_filter == "on_hold":
-                 prefix_params.append(("prefixes[]", "20"))
-                 self.logger.info("Filtering RSS for: On Hold games")
-            elif completion_status_filter == "abandoned":
-                 prefix_params.append(("prefixes[]", "22"))
-                 self.logger.info("Filtering RSS for: Abandoned games")
-        
-        # Engine Filter
-        if engines:
-            for engine_id in engines:
-                prefix_params.append(("prefixes[]", str(engine_id)))
-            self.logger.info(f"Filtering RSS for Engines: {engines}")
-
-        # Tags Filter (Include)
-        if tags:
-            # RSS uses tags=ID,ID,ID format or multiple tags[]?
-            # From research: tags=1507 (single). For multiple? 
-            # Usually URL parameters repeat: tags[]=1&tags[]=2 OR comma separated tags=1,2
-            # The browser documentation example uses 'tags=1507'.
-            # Looking at F95 structure, it often uses lists. Let's try appending tuples.
-            # However, looking at the user provided URL: tags=1507.
-            # Let's assume list format 'tags[]' like prefixes for safety, OR single 'tags' if it's one.
-            # Wait, the screenshot showed 'Select a tag...'. 
-            # If standard XenForo/F95, likely list.
-            # But the user example `tags=1507` suggests simple param. 
-            # Let's use list tuples to be safe with requests: tags[]
-            for tag_id in tags:
-                prefix_params.append(("tags[]", str(tag_id))) 
-            self.logger.info(f"Filtering RSS for Tags: {tags}")
-
-        # Tags Filter (Exclude)
-        if notags:
-            for tag_id in notags:
-                prefix_params.append(("notags[]", str(tag_id)))
-            self.logger.info(f"Filtering RSS to Exclude Tags: {notags}")
-        
-        # Construct query string manually for list-like parameters if requests encode them differently than expected
-        # For "prefixes[]=18", requests typically encodes params={'prefixes[]': '18'} as prefixes%5B%5D=18
-        # If multiple prefixes are needed, e.g. prefixes[]=18&prefixes[]=19
-        # we can pass a list of tuples to params: params=[('prefixes[]', '18'), ('prefixes[]', '19')]
-        
-        final_url_params = list(url_params_dict.items()) + prefix_params
-        
+    def _fetch_rss_items(self, base_rss_url, final_url_params, search_term=None) -> Optional[list[dict]]:
+        """Requests one RSS query and parses its items (uncached part of get_latest_game_data_from_rss)."""
         # Log the fully constructed URL for debugging (urllib.parse.urlencode handles the list of tuples for params)
         debug_url = f"{base_rss_url}?{urllib.parse.urlencode(final_url_params)}"
         self.logger.debug(f"Constructed RSS request URL: {debug_url}")
 
-        response = self._make_request("GET", base_rss_url, params=final_url_params)
+        # Conditional GET: if the feed hasn't changed since the last full response for this URL,
+        # the server answers 304 and the items parsed back then are reused (no body, no feedparser run)
+        validated = self.rss_cache.get_validated(debug_url)
+        conditional_headers = {}
+        if validated:
+            etag, last_modified, _ = validated
+            if etag:
+                conditional_headers['If-None-Match'] = etag
+            if last_modified:
+                conditional_headers['If-Modified-Since'] = last_modified
+
+        # Streamed: the items are parsed as the body arrives
+        response = self._make_request("GET", base_rss_url, params=final_url_params, headers=conditional_headers or None, stream=True)
 
         # If response is None (all retries failed) or not a 200 OK, return None to indicate failure.
         if response is None:
             self.logger.error(f"Failed to fetch RSS feed {debug_url} after all retries or due to an unexpected issue before sending the request.")
             return None # Explicitly return None for complete failure to fetch
-        if response.status_code != 200:
-            self.logger.error(f"Failed to fetch RSS feed {debug_url}. Status: {response.status_code}, Reason: {response.reason}")
-            return None # Explicitly return None for non-200 responses
-
-        parsed_items_data = []
-        try:
-            # Using feedparser for robust RSS parsing
-            import feedparser
-            feed = feedparser.parse(response.content) # Use response.content for feedparser
-            self.logger.debug(f"Found {len(feed.entries)} items in the RSS feed response.")
-
-            for item in feed.entries:
-                game_data = {}
-                title = item.get("title", "No Title")
-                
-                # Regex to extract name and version: ^\[(UPDATE|NEW)\]\s(.*?)\s\[([^\]]+)\]$
-                # Example: [UPDATE] Game Name Here [v1.0 Final]
-                # Example: [NEW] Another Game [0.5b]
-                match = re.match(r"^\[(?:UPDATE|NEW|GAME)\]\s(.*?)(?:\s\[([^\]]+)\])?$", title.strip())
-                if match:
-                    game_data['name'] = match.group(1).strip()
-                    game_data['version'] = match.group(2).strip() if match.group(2) else "Unknown"
-                else:
-                    # Fallback if primary regex fails (e.g. no [version] part, or different prefix)
-                    name_match = re.match(r"^\[[^\]]+\]\s*(.*)", title.strip())
-                    if name_match:
-                        game_data['name'] = name_match.group(1).strip()
-                    else:
-                        game_data['name'] = title # Use full title if no structure matches
-                    game_data['version'] = "Unknown" 
-                
-                self.logger.debug(f"RSS title parsed: Name='{game_data.get('name', 'N/A')}', Version='{game_data.get('version', 'N/A')}' from '{title}'")
-
-                game_data['url'] = item.get("link")
-                author_raw = item.get("author", "N/A") # Get raw author, default to N/A
-                
-                # Clean the author string
-                author_cleaned = "N/A" # Default to N/A
-                if author_raw and author_raw != "N/A":
-                    # Use regex to remove <rss@f95> tag, ignoring case and allowing for surrounding whitespace
-                    author_cleaned = re.sub(r'\s*<rss@f95>\s*', '', author_raw, flags=re.IGNORECASE).strip()
-                
-                game_data['author'] = author_cleaned if author_cleaned else "N/A" # Ensure it's N/A if empty after strip
-                
-                # F95Zone RSS uses 'published' for the date
-                game_data['rss_pub_date'] = item.get("published") # Format: 'Sat, 18 May 2024 10:00:00 GMT'
-
-                # Extract status from tags
-                # feedparser puts categories/tags into 'tags' list of dicts: [{'term': 'TagName', 'scheme': None, 'label': None}]
-                tags = [t.get('term', '') for t in item.get('tags', [])]
-                status = "Ongoing" # Default assumption if no other status tag found
-                # F95Zone tags are case-sensitive usually, but let's be safe
-                tags_lower = [t.lower() for t in tags]
-                
-                if "completed" in tags_lower:
-                    status = "Completed"
-                elif "on hold" in tags_lower or "onhold" in tags_lower: # Fixed: Check for 'onhold' (no space) too
-                    status = "On Hold"
-                elif "abandoned" in tags_lower:
-                    status = "Abandoned"
-                
-                game_data['completed_status'] = status
-                
-                # Extract image URL from description HTML using regex
-                image_url_from_rss = None
-                if item.get("description", ""):
-                    # More robust regex for src attribute, using hex escapes for quotes to avoid SyntaxError
-                    img_match = re.search(r'<img[^>]+src\s*=\s*[\x22\x27]([^\x22\x27]+)[\x22\x27]', item.get("description", ""), re.IGNORECASE)
-                    if img_match:
-                        image_url_from_rss = img_match.group(1)
-                    
-                    game_data['image_url'] = image_url_from_rss # Store original URL or None
-                else: # No description or no img_match
-
-                    game_data['image_url'] = None
-                
-                # Ensure essential fields are present
-                if game_data.get('name') and game_data.get('url'):
-                    parsed_items_data.append(game_data)
-
-        except Exception as e:
-            self.logger.error(f"Error parsing RSS feed content: {e}")
-            # If parsing fails after a successful fetch, this is different from fetch failure.
-            # Returning empty list might be acceptable, or None if we want to signal this specific error too.
-            # For now, let's keep it as [] for parsing errors post-successful fetch, to distinguish from total fetch failure.
-            return [] # Return empty if parsing fails
+        with response:
+            if response.status_code == 304 and validated:
+                self.logger.debug(f"RSS feed not modified since last fetch: {debug_url}")
+                self.rss_cache.record_not_modified()
+                return [dict(item) for item in validated[2]]
+            if response.status_code != 200:
+                self.logger.error(f"Failed to fetch RSS feed {debug_url}. Status: {response.status_code}, Reason: {response.reason}")
+                return None # Explicitly return None for non-200 responses
+
+            parsed_items_data = []
+            response.raw.decode_content = True # gzip/deflate bodies are decoded as they are read
+            try:
+                # lxml iterparse over the body as it downloads (falls back to feedparser for malformed XML), see rss_parser
+                for game_data in iter_rss_stream(response.raw):
+                    self.logger.debug(f"RSS title parsed: Name='{game_data.get('name', 'N/A')}', Version='{game_data.get('version', 'N/A')}'")
+                    # Ensure essential fields are present
+                    if game_data.get('name') and game_data.get('url'):
+                        parsed_items_data.append(game_data)
+
+            except (urllib3.exceptions.HTTPError, OSError) as e:
+                self.logger.error(f"Connection failed while reading RSS feed {debug_url}: {type(e).__name__} - {e}")
+                return None # A truncated feed is a fetch failure, not an empty one
+            except Exception as e:
+                self.logger.error(f"Error parsing RSS feed content: {e}")
+                # If parsing fails after a successful fetch, this is different from fetch failure.
+                # Returning empty list might be acceptable, or None if we want to signal this specific error too.
+                # For now, let's keep it as [] for parsing errors post-successful fetch, to distinguish from total fetch failure.
+                return [] # Return empty if parsing fails
 
         self.logger.info(f"Collected {len(parsed_items_data)} unique game data items from RSS processing.")
+        self.rss_cache.store_validated(debug_url, response.headers.get('ETag'), response.headers.get('Last-Modified'), parsed_items_data)
         
         # The 'limit' parameter is now handled by 'rows' in the RSS URL.
         # The _make_request and RSS server should respect this.
@@ -711,28 +766,32 @@ class F95ApiClient:
         
         return selected_items
 
-    def cache_image_from_url(self, original_image_url: str) -> Optional[str]:
+    def cache_image_from_url(self, original_image_url: str, revalidate: bool = IMAGE_CACHE_REVALIDATE) -> Optional[str]:
         """
         Downloads and caches an image from the given URL.
         Returns the web-accessible path to the cached image, or None if caching fails.
+        Images already in the image index (and on disk) are returned without a request. With revalidate=True
+        they are checked with a conditional request instead and only re-downloaded if the server has a new version.
         """
         if not original_image_url:
             self.logger.debug("cache_image_from_url called with no URL.")
             return None
 
-        self.logger.info(f"Attempting to download and cache image: {original_image_url}")
+        url_hash = hashlib.sha256(original_image_url.encode('utf-8')).hexdigest()
+        content_type_to_ext_map = IMAGE_CONTENT_TYPE_EXTENSIONS
+        cached = self.image_index.find(original_image_url, IMAGE_CACHE_DIR, cached_image_filenames(url_hash))
+        if cached and not revalidate:
+            self.logger.debug(f"Image index hit for {original_image_url}: {cached['filename']}")
+            return f"{IMAGE_CACHE_WEB_PATH_PREFIX}{cached['filename']}"
+
+        self.logger.info(f"Attempting to {'revalidate' if cached else 'download and cache'} image: {original_image_url}")
         try:
-            url_hash = hashlib.sha256(original_image_url.encode('utf-8')).hexdigest()
-            content_type_to_ext_map = {
-                'image/jpeg': '.jpg',
-                'image/png': '.png',
-                'image/gif': '.gif',
-                'image/webp': '.webp',
-                'image/bmp': '.bmp',
-                'image/tiff': '.tif'
-            }
+            img_response = self._make_request("GET", original_image_url, stream=True, headers=conditional_headers(cached) or None)
 
-            img_response = self._make_request("GET", original_image_url, stream=True)
+            if cached and img_response is not None and img_response.status_code == 304:
+                self.image_index.mark_validated(original_image_url)
+                self.logger.debug(f"Cached image for {original_image_url} is still current (304 Not Modified).")
+                return f"{IMAGE_CACHE_WEB_PATH_PREFIX}{cached['filename']}"
 
             if img_response and img_response.status_code == 200:
                 actual_content_type = img_response.headers.get('Content-Type', '').lower().split(';')[0].strip()
@@ -754,23 +813,28 @@ class F95ApiClient:
                         # Ensure the cache directory exists (it's also called in __init__, but good to have here too for robustness if method is called standalone)
                         self._ensure_cache_dir_exists() 
 
-                        if os.path.exists(final_fs_path):
+                        if os.path.exists(final_fs_path) and not cached:
                             self.logger.debug(f"Image already correctly cached: {final_fs_path} for {original_image_url}")
-                            return final_web_path
-                        else:
+                        else: # New image, or a changed one on revalidation
                             with open(final_fs_path, 'wb') as f:
                                 for chunk in img_response.iter_content(1024):
                                     f.write(chunk)
                             self.logger.info(f"Successfully cached image {original_image_url} to {final_fs_path} (Content-Type: {actual_content_type})")
                             
                             old_cached_paths = self._get_cached_image_paths(original_image_url) # This method generates path based on original URL ext or .img
-                            if old_cached_paths and old_cached_paths['fs_path'] != final_fs_path and os.path.exists(old_cached_paths['fs_path']):
-                                try:
-                                    os.remove(old_cached_paths['fs_path'])
-                                    self.logger.info(f"Removed old cache file: {old_cached_paths['fs_path']}")
-                                except OSError as e_remove:
-                                    self.logger.warning(f"Could not remove old cache file {old_cached_paths['fs_path']}: {e_remove}")
-                            return final_web_path
+                            stale_paths = {old_cached_paths['fs_path'] if old_cached_paths else None,
+                                           os.path.join(IMAGE_CACHE_DIR, cached['filename']) if cached else None}
+                            for stale_path in stale_paths - {None, final_fs_path}:
+                                if os.path.exists(stale_path):
+                                    try:
+                                        os.remove(stale_path)
+                                        self.logger.info(f"Removed old cache file: {stale_path}")
+                                    except OSError as e_remove:
+                                        self.logger.warning(f"Could not remove old cache file {stale_path}: {e_remove}")
+                        self.image_index.record(original_image_url, final_filename, actual_content_type,
+                                                img_response.headers.get('ETag'), img_response.headers.get('Last-Modified'),
+                                                os.path.getsize(final_fs_path))
+                        return final_web_path
                     else:
                         self.logger.warning(f"Could not determine a safe file extension for image {original_image_url} with Content-Type: {actual_content_type}. Will not cache.")
                         return None
@@ -779,6 +843,8 @@ class F95ApiClient:
                     return None
             else:
                 self.logger.warning(f"Failed to download image {original_image_url}. Status: {img_response.status_code if img_response else 'No response'}")
+                if cached: # Revalidation failed; the cached copy is still better than nothing
+                    return f"{IMAGE_CACHE_WEB_PATH_PREFIX}{cached['filename']}"
                 return None
         except requests.exceptions.RequestException as img_e: 
             self.logger.error(f"Error downloading image {original_image_url} (RequestException): {img_e}")
@@ -0,0 +1,349 @@
+# f95apiclient/async_client.py
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import urllib.parse
+from typing import Optional
+from urllib.parse import urlparse
+
+try:
+    import httpx
+except ImportError: # Optional: only needed by AsyncF95ApiClient (pip install "httpx[http2,socks]")
+    httpx = None
+
+from f95apiclient import (
+    F95ApiClient, F95_BASE_URL, IMAGE_CACHE_DIR, IMAGE_CACHE_WEB_PATH_PREFIX, IMAGE_CONTENT_TYPE_EXTENSIONS,
+    build_rss_params, cached_image_filenames,
+)
+from f95apiclient.image_index import get_image_index, conditional_headers, IMAGE_CACHE_REVALIDATE
+from f95apiclient.direct_circuit import get_direct_circuit
+from f95apiclient.proxy_pool import get_proxy_pool
+from f95apiclient.rate_limit import get_rate_limiter, THROTTLE_STATUS_CODES
+from f95apiclient.rss_cache import get_rss_cache
+from f95apiclient.rss_parser import parse_rss_items
+
+# --- Configuration ---
+# Connections kept per pool (one pool for direct traffic, one per proxy in use); HTTP/2 multiplexes requests on them
+ASYNC_CLIENT_MAX_CONNECTIONS = int(os.getenv("ASYNC_CLIENT_MAX_CONNECTIONS", "20"))
+ASYNC_CLIENT_KEEPALIVE_SECONDS = float(os.getenv("ASYNC_CLIENT_KEEPALIVE_SECONDS", "30"))
+# Requests the *_many helpers run at once
+ASYNC_CLIENT_CONCURRENCY = int(os.getenv("ASYNC_CLIENT_CONCURRENCY", "8"))
+# Lets the sync code paths fan their RSS queries / image downloads out through this client (needs httpx)
+ASYNC_CLIENT_ENABLED = os.getenv("ASYNC_CLIENT_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncF95ApiClient:
+    """
+    asyncio counterpart of F95ApiClient for fanning out RSS queries and image downloads on one event loop.
+    Requests go through pooled httpx.AsyncClient connections (keep-alive, HTTP/2 when h2 is installed) and
+    follow F95ApiClient._make_request: direct first, a proxy from the pool after connection errors / 403, retries on
+    403/429/5xx. The rate limiter, RSS cache and proxy pool are the process-wide ones the sync client uses.
+    Use as `async with AsyncF95ApiClient() as client:` or call aclose().
+    """
+
+    def __init__(self, session_cookies=None, max_attempts=5, retry_delay_seconds=5, request_timeout=15, use_proxies=True,
+                 http2=True, max_connections=ASYNC_CLIENT_MAX_CONNECTIONS):
+        if httpx is None:
+            raise RuntimeError("AsyncF95ApiClient needs the httpx package (pip install \"httpx[http2,socks]\")")
+        self.base_url = F95_BASE_URL
+        self.logger = logger
+        self.max_attempts = max_attempts
+        self.retry_delay_seconds = retry_delay_seconds
+        self.request_timeout = request_timeout
+        self.use_proxies = use_proxies
+        self.rate_limiter = get_rate_limiter()
+        self.rss_cache = get_rss_cache()
+        self.image_index = get_image_index()
+        self.proxy_pool = get_proxy_pool()
+        self.direct_circuit = get_direct_circuit()
+        self.current_proxy = None
+        self._cookies = dict(session_cookies or {})
+        self._http2 = http2 and self._h2_available()
+        self._limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections,
+                                    keepalive_expiry=ASYNC_CLIENT_KEEPALIVE_SECONDS)
+        self._clients = {} # proxy URL (None = direct) -> httpx.AsyncClient
+        self._proxy_source = None # F95ApiClient that loads (and caches) the proxy list
+
+    @staticmethod
+    def _h2_available():
+        try:
+            import h2 # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
+        if self._proxy_source is not None:
+            self._proxy_source.close_session()
+
+    def _client_for(self, proxy_url=None):
+        client = self._clients.get(proxy_url)
+        if client is None:
+            client = httpx.AsyncClient(
+                http2=self._http2, limits=self._limits, timeout=self.request_timeout, verify=False,
+                follow_redirects=True, proxy=proxy_url, cookies=self._cookies,
+                headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'},
+            )
+            self._clients[proxy_url] = client
+        return client
+
+    async def _choose_proxy(self) -> Optional[str]:
+        """
+        A proxy picked by the shared proxy pool. When the pool has no candidates yet, F95ApiClient loads
+        the proxy lists into it (in a worker thread, once per client).
+        """
+        if not self.proxy_pool.has_candidates():
+            if self._proxy_source is None:
+                self._proxy_source = F95ApiClient(use_proxies=True)
+                await asyncio.to_thread(self._proxy_source._load_proxies)
+            if not self.proxy_pool.has_candidates():
+                return None
+        # choose() may wait for the first background probes, so keep it off the loop
+        selected = await asyncio.to_thread(self.proxy_pool.choose, {self.current_proxy} if self.current_proxy else ())
+        if selected is None:
+            return None
+        self.current_proxy = selected[0]
+        return self.current_proxy
+
+    async def _make_request(self, method: str, url: str, params=None, headers: Optional[dict] = None,
+                            max_attempts: Optional[int] = None):
+        """Async F95ApiClient._make_request. Returns an httpx.Response, or None when all attempts failed."""
+        attempts_allowed = max_attempts or self.max_attempts
+        # Skip the direct first attempt while the (shared) direct connection circuit is open
+        use_proxy = self.use_proxies and not self.direct_circuit.allow_direct()
+        last_exception = None
+
+        for attempt in range(attempts_allowed):
+            proxy_url = await self._choose_proxy() if (use_proxy and self.use_proxies) else None
+            log_proxy_info = f"proxy {proxy_url}" if proxy_url else "direct connection"
+
+            # Pace requests to f95zone without blocking the loop (same buckets as the sync client)
+            wait = self.rate_limiter.reserve(url)
+            if wait is None:
+                self.logger.error(f"Rate limiter has no slot for {url} within the wait limit. Giving up on this request.")
+                return None
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            request_started = time.monotonic()
+            response = None
+            try:
+                response = await self._client_for(proxy_url).request(method, url, params=params, headers=headers)
+            except (httpx.TransportError, httpx.ProxyError) as e:
+                self.logger.warning(f"Attempt {attempt + 1}/{attempts_allowed} with {log_proxy_info} failed: {type(e).__name__} - {e}")
+                last_exception = e
+                use_proxy = True # Connection-level failures switch to proxies, as in the sync client
+                continue
+            except Exception as e:
+                self.logger.error(f"An unexpected error occurred on attempt {attempt + 1}/{attempts_allowed} for {url} with {log_proxy_info}: {type(e).__name__} - {e}", exc_info=True)
+                last_exception = e
+                use_proxy = True
+                continue
+            finally:
+                # Every outcome is reported, including cancellation, so a half-open circuit probe is never left hanging
+                ok = response is not None and response.status_code != 403
+                if proxy_url:
+                    self.proxy_pool.record(proxy_url, ok, (time.monotonic() - request_started) * 1000 if ok else None)
+                elif ok:
+                    self.direct_circuit.record_success()
+                else:
+                    self.direct_circuit.record_failure()
+
+            self.rate_limiter.record_response(url, response.status_code, response.headers.get('Retry-After'))
+            status = response.status_code
+            if status < 400:
+                return response
+            self.logger.warning(f"Attempt {attempt + 1}/{attempts_allowed} with {log_proxy_info} failed: HTTP {status} {response.reason_phrase}")
+            last_exception = None
+            if status == 403 or status == 429 or status >= 500:
+                use_proxy = True # The sync client also switches to a (new) proxy after these
+                if attempt < attempts_allowed - 1:
+                    # 429/503 are paced by the rate limiter (Retry-After / backoff) on the next reserve
+                    if status not in THROTTLE_STATUS_CODES:
+                        await asyncio.sleep(self.retry_delay_seconds)
+                    continue
+                self.logger.error(f"All {attempts_allowed} attempts failed. Last HTTPError: {status} on {log_proxy_info}")
+                return None
+            # Other HTTP errors (400, 401, 404, ...) are not retried
+            self.logger.error(f"Non-retryable HTTPError {status} on {log_proxy_info}. Returning error response immediately.")
+            return response
+
+        if last_exception:
+            self.logger.error(f"Request to {url} failed after {attempts_allowed} attempts. Last exception: {last_exception}")
+        return None
+
+    async def get_latest_game_data_from_rss(self, limit=90, search_term: str = None, completion_status_filter: str = None,
+                                            tags: list = None, notags: list = None, engines: list = None,
+                                            creator: str = None, page: int = 1, use_cache: bool = True) -> Optional[list[dict]]:
+        """Async F95ApiClient.get_latest_game_data_from_rss (same parameters, cache and conditional requests)."""
+        base_rss_url, final_url_params = build_rss_params(self.base_url, limit, search_term, completion_status_filter,
+                                                          tags, notags, engines, creator, page)
+        if not use_cache:
+            return await self._fetch_rss_items(base_rss_url, final_url_params)
+        return await self.rss_cache.get_or_fetch_async(tuple(sorted(final_url_params)),
+                                                       lambda: self._fetch_rss_items(base_rss_url, final_url_params))
+
+    async def _fetch_rss_items(self, base_rss_url, final_url_params) -> Optional[list[dict]]:
+        debug_url = f"{base_rss_url}?{urllib.parse.urlencode(final_url_params)}"
+        validated = self.rss_cache.get_validated(debug_url)
+        conditional_headers = {}
+        if validated:
+            etag, last_modified, _ = validated
+            if etag:
+                conditional_headers['If-None-Match'] = etag
+            if last_modified:
+                conditional_headers['If-Modified-Since'] = last_modified
+
+        response = await self._make_request("GET", base_rss_url, params=final_url_params, headers=conditional_headers or None)
+        if response is None:
+            self.logger.error(f"Failed to fetch RSS feed {debug_url} after all retries.")
+            return None
+        if response.status_code == 304 and validated:
+            self.rss_cache.record_not_modified()
+            return [dict(item) for item in validated[2]]
+        if response.status_code != 200:
+            self.logger.error(f"Failed to fetch RSS feed {debug_url}. Status: {response.status_code}, Reason: {response.reason_phrase}")
+            return None
+
+        try:
+            items = [item for item in parse_rss_items(response.content) if item.get('name') and item.get('url')]
+        except Exception as e:
+            self.logger.error(f"Error parsing RSS feed content: {e}")
+            return []
+        self.rss_cache.store_validated(debug_url, response.headers.get('ETag'), response.headers.get('Last-Modified'), items)
+        self.logger.info(f"Collected {len(items)} game data items from RSS ({debug_url}).")
+        return items
+
+    async def cache_image_from_url(self, original_image_url: str, revalidate: bool = IMAGE_CACHE_REVALIDATE) -> Optional[str]:
+        """Async F95ApiClient.cache_image_from_url: same file naming and image index, returns the web path or None."""
+        if not original_image_url:
+            return None
+        url_hash = hashlib.sha256(original_image_url.encode('utf-8')).hexdigest()
+        cached = await asyncio.to_thread(self.image_index.find, original_image_url, IMAGE_CACHE_DIR, cached_image_filenames(url_hash))
+        if cached and not revalidate:
+            return f"{IMAGE_CACHE_WEB_PATH_PREFIX}{cached['filename']}"
+        try:
+            response = await self._make_request("GET", original_image_url, headers=conditional_headers(cached) or None)
+            if cached and response is not None and response.status_code == 304:
+                await asyncio.to_thread(self.image_index.mark_validated, original_image_url)
+                return f"{IMAGE_CACHE_WEB_PATH_PREFIX}{cached['filename']}"
+            if response is None or response.status_code != 200:
+                self.logger.warning(f"Failed to download image {original_image_url}. Status: {response.status_code if response else 'No response'}")
+                return f"{IMAGE_CACHE_WEB_PATH_PREFIX}{cached['filename']}" if cached else None
+            content_type = response.headers.get('Content-Type', '').lower().split(';')[0].strip()
+            if not content_type.startswith('image/'):
+                self.logger.warning(f"Downloaded content for {original_image_url} is not an image. Content-Type: {content_type}.")
+                return None
+            extension = IMAGE_CONTENT_TYPE_EXTENSIONS.get(content_type)
+            if not extension:
+                url_extension = os.path.splitext(urlparse(original_image_url).path)[1].lower()
+                if url_extension in IMAGE_CONTENT_TYPE_EXTENSIONS.values():
+                    extension = url_extension
+            if not extension:
+                self.logger.warning(f"Could not determine a safe file extension for image {original_image_url} with Content-Type: {content_type}. Will not cache.")
+                return None
+
+            filename = f"{url_hash}{extension}"
+            fs_path = os.path.join(IMAGE_CACHE_DIR, filename)
+            if cached or not os.path.exists(fs_path): # New image, or a changed one on revalidation
+                os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+                await asyncio.to_thread(_write_file, fs_path, response.content)
+                self.logger.info(f"Successfully cached image {original_image_url} to {fs_path} (Content-Type: {content_type})")
+                if cached and cached['filename'] != filename:
+                    await asyncio.to_thread(_remove_file, os.path.join(IMAGE_CACHE_DIR, cached['filename']))
+            await asyncio.to_thread(self.image_index.record, original_image_url, filename, content_type,
+                                    response.headers.get('ETag'), response.headers.get('Last-Modified'), os.path.getsize(fs_path))
+            return f"{IMAGE_CACHE_WEB_PATH_PREFIX}{filename}"
+        except OSError as e:
+            self.logger.error(f"Error saving image {original_image_url}: {e}")
+            return None
+        except Exception as e:
+            self.logger.error(f"Unexpected error caching image {original_image_url}: {e}", exc_info=True)
+            return None
+
+    # --- Fan-out helpers ---
+
+    async def _gather_limited(self, coroutines, concurrency):
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def _run(coroutine):
+            async with semaphore:
+                return await coroutine
+        return await asyncio.gather(*(_run(c) for c in coroutines))
+
+    async def get_latest_game_data_from_rss_many(self, queries: list[dict], concurrency=ASYNC_CLIENT_CONCURRENCY) -> list:
+        """Runs several RSS queries (keyword-argument dicts for get_latest_game_data_from_rss) concurrently; results in order."""
+        return await self._gather_limited([self.get_latest_game_data_from_rss(**q) for q in queries], concurrency)
+
+    async def cache_images_from_urls(self, urls: list[str], concurrency=ASYNC_CLIENT_CONCURRENCY) -> list:
+        """Caches several images concurrently; web paths (or None) in the order of urls."""
+        return await self._gather_limited([self.cache_image_from_url(u) for u in urls], concurrency)
+
+
+def _write_file(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+# --- Fan-out from sync code ---
+
+def _fan_out(run):
+    """
+    Runs run(client) on a fresh event loop with one AsyncF95ApiClient (its connections are reused for the
+    whole fan-out). Returns None without running anything when the async client is disabled or httpx is
+    missing, so callers keep their sync path. Must not be called from a running event loop.
+    """
+    if not ASYNC_CLIENT_ENABLED or httpx is None:
+        return None
+
+    async def _main():
+        async with AsyncF95ApiClient() as client:
+            return await run(client)
+    try:
+        return asyncio.run(_main())
+    except Exception as e:
+        logger.warning(f"Async fan-out failed ({type(e).__name__}: {e}). Falling back to sequential requests.")
+        return None
+
+def prefetch_rss_queries(queries: list[dict]) -> Optional[list]:
+    """
+    Runs RSS queries (keyword-argument dicts for get_latest_game_data_from_rss) concurrently. The results land
+    in the shared RSS cache, so the same queries made afterwards through F95ApiClient are cache hits.
+    Returns the results in order, or None if the queries were not run.
+    """
+    if len(queries) < 2:
+        return None
+    return _fan_out(lambda client: client.get_latest_game_data_from_rss_many(queries))
+
+def prefetch_images(urls: list[str]) -> Optional[dict]:
+    """
+    Caches images concurrently (recorded in the shared image index). Returns {url: web path or None},
+    or None if nothing was run.
+    """
+    urls = list(dict.fromkeys(u for u in urls if u))
+    if len(urls) < 2:
+        return None
+    paths = _fan_out(lambda client: client.cache_images_from_urls(urls))
+    return dict(zip(urls, paths)) if paths is not None else None
@@ -0,0 +1,119 @@
+# f95apiclient/direct_circuit.py
+
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+DIRECT_CIRCUIT_ENABLED = os.getenv("DIRECT_CIRCUIT_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+# Consecutive failed direct requests (connection errors, timeouts, 403) that open the circuit
+DIRECT_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("DIRECT_CIRCUIT_FAILURE_THRESHOLD", "3"))
+# How long the circuit stays open before one direct request is let through as a probe; doubles per failed probe
+DIRECT_CIRCUIT_OPEN_SECONDS = float(os.getenv("DIRECT_CIRCUIT_OPEN_SECONDS", "120"))
+DIRECT_CIRCUIT_MAX_OPEN_SECONDS = float(os.getenv("DIRECT_CIRCUIT_MAX_OPEN_SECONDS", "1800"))
+# A probe that hasn't reported back after this long is assumed lost and another one is allowed
+DIRECT_CIRCUIT_PROBE_TIMEOUT_SECONDS = float(os.getenv("DIRECT_CIRCUIT_PROBE_TIMEOUT_SECONDS", "60"))
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class DirectCircuitBreaker:
+    """
+    Remembers whether direct (proxy-less) requests to F95zone are working, across all clients in the process.
+    Closed: requests try direct first. After DIRECT_CIRCUIT_FAILURE_THRESHOLD consecutive direct failures it opens,
+    and requests go straight through the proxy pool instead of paying request_timeout on a direct attempt each time.
+    Once the open period has passed, a single request is let through direct (half-open): success closes the
+    circuit, failure reopens it for twice as long (capped at DIRECT_CIRCUIT_MAX_OPEN_SECONDS).
+    """
+
+    def __init__(self, failure_threshold=DIRECT_CIRCUIT_FAILURE_THRESHOLD, open_seconds=DIRECT_CIRCUIT_OPEN_SECONDS,
+                 max_open_seconds=DIRECT_CIRCUIT_MAX_OPEN_SECONDS, enabled=DIRECT_CIRCUIT_ENABLED):
+        self.failure_threshold = max(1, failure_threshold)
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.enabled = enabled
+        self.state = CLOSED
+        self._lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._current_open_seconds = open_seconds
+        self._retry_at = 0.0       # monotonic time the next half-open probe may start
+        self._probe_started = None # monotonic start of the half-open probe in flight
+        self.times_opened = 0
+        self.skipped_direct = 0
+
+    def allow_direct(self) -> bool:
+        """
+        Whether the caller should try a direct request now. In the half-open state this hands out the single
+        probe; the caller must report its outcome with record_success() / record_failure().
+        """
+        if not self.enabled:
+            return True
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == OPEN and now >= self._retry_at:
+                self.state = HALF_OPEN
+                self._probe_started = now
+                logger.info("Direct connection circuit half-open: probing with one direct request.")
+                return True
+            if self.state == HALF_OPEN and now - self._probe_started >= DIRECT_CIRCUIT_PROBE_TIMEOUT_SECONDS:
+                self._probe_started = now # The previous probe never reported back
+                return True
+            self.skipped_direct += 1
+            return False
+
+    def record_success(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._consecutive_failures = 0
+            if self.state != CLOSED:
+                logger.info("Direct connection circuit closed: direct requests work again.")
+                self.state = CLOSED
+                self._current_open_seconds = self.open_seconds
+                self._probe_started = None
+
+    def record_failure(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._consecutive_failures += 1
+            if self.state == HALF_OPEN:
+                self._current_open_seconds = min(self.max_open_seconds, self._current_open_seconds * 2)
+                self._open()
+            elif self.state == CLOSED and self._consecutive_failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        # Lock held by the caller
+        self.state = OPEN
+        self._retry_at = time.monotonic() + self._current_open_seconds
+        self._probe_started = None
+        self.times_opened += 1
+        logger.warning(f"Direct connection circuit open after {self._consecutive_failures} consecutive direct failures. "
+                       f"Requests go through proxies for the next {self._current_open_seconds:.0f}s.")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'state': self.state if self.enabled else 'disabled',
+                    'consecutive_failures': self._consecutive_failures,
+                    'times_opened': self.times_opened, 'skipped_direct': self.skipped_direct,
+                    'retry_in_seconds': max(0.0, self._retry_at - time.monotonic()) if self.state == OPEN else None}
+
+
+_direct_circuit = None
+_direct_circuit_lock = threading.Lock()
+
+def get_direct_circuit() -> DirectCircuitBreaker:
+    """Returns the process-wide DirectCircuitBreaker, creating it on first use."""
+    global _direct_circuit
+    with _direct_circuit_lock:
+        if _direct_circuit is None:
+            _direct_circuit = DirectCircuitBreaker()
+        return _direct_circuit
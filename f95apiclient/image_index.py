@@ -0,0 +1,147 @@
+# f95apiclient/image_index.py
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+# Kept next to (not inside) the image cache directory, which is served as-is under /cached_images/
+IMAGE_INDEX_DB_PATH = os.getenv("IMAGE_INDEX_DB_PATH", "/data/image_cache_index.db")
+# Check cached images with a conditional request (ETag / Last-Modified) instead of trusting the index
+IMAGE_CACHE_REVALIDATE = os.getenv("IMAGE_CACHE_REVALIDATE", "false").lower() in ("1", "true", "yes", "on")
+
+_COLUMNS = ('url', 'filename', 'content_type', 'etag', 'last_modified', 'size', 'cached_at', 'validated_at')
+
+
+class ImageIndex:
+    """
+    Persistent map of original image URL -> cached file (plus ETag / Last-Modified and size), so a cached image
+    can be found without a request. The file name's extension comes from the response Content-Type, so without
+    the index the file can't be located before downloading.
+    """
+
+    def __init__(self, db_path=IMAGE_INDEX_DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._init_db()
+
+    @contextmanager
+    def _connect(self):
+        # Commits on success and always closes (sqlite3's own context manager leaves the connection open)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        try:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            with self._lock, self._connect() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS image_index (
+                        url TEXT PRIMARY KEY,
+                        filename TEXT NOT NULL,
+                        content_type TEXT,
+                        etag TEXT,
+                        last_modified TEXT,
+                        size INTEGER NOT NULL,
+                        cached_at REAL NOT NULL,
+                        validated_at REAL NOT NULL
+                    )
+                """)
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Could not initialize image index at {self.db_path}: {e}")
+
+    def find(self, url, cache_dir, legacy_filenames=()) -> Optional[dict]:
+        """
+        The index entry for url if its file is still in cache_dir with the recorded size, else None
+        (stale entries are dropped). Without an entry, files cached before the index existed are looked up
+        under legacy_filenames and indexed on the spot.
+        """
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute("SELECT * FROM image_index WHERE url = ?", (url,)).fetchone()
+                if row is not None:
+                    entry = dict(row)
+                    fs_path = os.path.join(cache_dir, entry['filename'])
+                    if os.path.isfile(fs_path) and os.path.getsize(fs_path) == entry['size']:
+                        self.hits += 1
+                        return entry
+                    logger.info(f"Image index entry for {url} is stale ({entry['filename']} missing or changed). Dropping it.")
+                    conn.execute("DELETE FROM image_index WHERE url = ?", (url,))
+                for filename in legacy_filenames:
+                    fs_path = os.path.join(cache_dir, filename)
+                    if os.path.isfile(fs_path):
+                        entry = self._upsert(conn, url, filename, None, None, None, os.path.getsize(fs_path))
+                        self.hits += 1
+                        return entry
+                self.misses += 1
+                return None
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Image index lookup failed for {url}: {e}")
+            return None
+
+    def record(self, url, filename, content_type, etag, last_modified, size):
+        """Adds or replaces url's entry after its image was downloaded to filename."""
+        try:
+            with self._lock, self._connect() as conn:
+                self._upsert(conn, url, filename, content_type, etag, last_modified, size)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not record {url} in the image index: {e}")
+
+    @staticmethod
+    def _upsert(conn, url, filename, content_type, etag, last_modified, size):
+        now = time.time()
+        entry = dict(zip(_COLUMNS, (url, filename, content_type, etag, last_modified, size, now, now)))
+        conn.execute(f"INSERT OR REPLACE INTO image_index ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                     tuple(entry.values()))
+        return entry
+
+    def mark_validated(self, url):
+        """Notes that a conditional request for url came back 304 Not Modified."""
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("UPDATE image_index SET validated_at = ? WHERE url = ?", (time.time(), url))
+        except sqlite3.Error as e:
+            logger.warning(f"Could not update image index entry for {url}: {e}")
+
+    def stats(self) -> dict:
+        try:
+            with self._lock, self._connect() as conn:
+                size = conn.execute("SELECT COUNT(*) FROM image_index").fetchone()[0]
+        except sqlite3.Error:
+            size = None
+        return {'entries': size, 'hits': self.hits, 'misses': self.misses}
+
+
+def conditional_headers(entry: Optional[dict]) -> dict:
+    """If-None-Match / If-Modified-Since headers for revalidating an indexed image (empty without validators)."""
+    headers = {}
+    if entry and entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry and entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+_image_index = None
+_image_index_lock = threading.Lock()
+
+def get_image_index() -> ImageIndex:
+    """Returns the process-wide ImageIndex, creating it (and its table) on first use."""
+    global _image_index
+    with _image_index_lock:
+        if _image_index is None:
+            _image_index = ImageIndex()
+        return _image_index
@@ -0,0 +1,271 @@
+# f95apiclient/proxy_pool.py
+
+import atexit
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+# Scores are kept next to resources/proxy_cache.json (the candidate list) so restarts don't start cold
+PROXY_SCORES_FILE = os.getenv("PROXY_SCORES_FILE", os.path.join(os.getcwd(), 'resources', 'proxy_scores.json'))
+# Candidates are probed with a small request to this URL through the proxy
+PROXY_PROBE_URL = os.getenv("PROXY_PROBE_URL", "https://f95zone.to/robots.txt")
+PROXY_PROBE_TIMEOUT_SECONDS = float(os.getenv("PROXY_PROBE_TIMEOUT_SECONDS", "5"))
+PROXY_PROBE_CONCURRENCY = int(os.getenv("PROXY_PROBE_CONCURRENCY", "32"))
+# Candidates probed per background round, and how long a healthy proxy's last check stays valid
+PROXY_PROBE_BATCH_SIZE = int(os.getenv("PROXY_PROBE_BATCH_SIZE", "200"))
+PROXY_REPROBE_AFTER_SECONDS = int(os.getenv("PROXY_REPROBE_AFTER_SECONDS", "1800"))
+# How long choose() waits for the first probes to report a working proxy
+PROXY_CHOOSE_WAIT_SECONDS = float(os.getenv("PROXY_CHOOSE_WAIT_SECONDS", "10"))
+# Quarantine after a failure: base * 2^(consecutive failures - 1), capped
+PROXY_QUARANTINE_BASE_SECONDS = int(os.getenv("PROXY_QUARANTINE_BASE_SECONDS", "120"))
+PROXY_QUARANTINE_MAX_SECONDS = int(os.getenv("PROXY_QUARANTINE_MAX_SECONDS", "21600"))
+# Weight of the newest observation in the latency / success moving averages
+PROXY_EWMA_ALPHA = float(os.getenv("PROXY_EWMA_ALPHA", "0.3"))
+# Proxies that haven't been seen in a candidate list (or worked) for this long are dropped from the scores file
+PROXY_SCORE_MAX_AGE_SECONDS = int(os.getenv("PROXY_SCORE_MAX_AGE_SECONDS", str(7 * 86400)))
+
+_SAVE_INTERVAL_SECONDS = 60
+
+
+class ProxyScore:
+    """Moving-average health of one proxy."""
+
+    __slots__ = ('proxy_url', 'scheme', 'latency_ms', 'success_rate', 'successes', 'failures',
+                 'consecutive_failures', 'quarantined_until', 'last_checked', 'last_seen')
+
+    def __init__(self, proxy_url, scheme, latency_ms=None, success_rate=None, successes=0, failures=0,
+                 consecutive_failures=0, quarantined_until=0.0, last_checked=0.0, last_seen=0.0):
+        self.proxy_url = proxy_url
+        self.scheme = scheme
+        self.latency_ms = latency_ms     # EWMA of successful request latency; None until one succeeded
+        self.success_rate = success_rate # EWMA of 1/0 outcomes; None until probed
+        self.successes = successes
+        self.failures = failures
+        self.consecutive_failures = consecutive_failures
+        self.quarantined_until = quarantined_until # Wall-clock time (persisted)
+        self.last_checked = last_checked
+        self.last_seen = last_seen or time.time()
+
+    def record(self, ok, latency_ms=None):
+        now = time.time()
+        self.last_checked = now
+        outcome = 1.0 if ok else 0.0
+        self.success_rate = outcome if self.success_rate is None else \
+            PROXY_EWMA_ALPHA * outcome + (1 - PROXY_EWMA_ALPHA) * self.success_rate
+        if ok:
+            self.successes += 1
+            self.consecutive_failures = 0
+            self.quarantined_until = 0.0
+            if latency_ms is not None:
+                self.latency_ms = latency_ms if self.latency_ms is None else \
+                    PROXY_EWMA_ALPHA * latency_ms + (1 - PROXY_EWMA_ALPHA) * self.latency_ms
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+            cool_down = min(PROXY_QUARANTINE_MAX_SECONDS, PROXY_QUARANTINE_BASE_SECONDS * 2 ** (self.consecutive_failures - 1))
+            self.quarantined_until = now + cool_down
+
+    def is_healthy(self, now):
+        return self.success_rate is not None and self.latency_ms is not None and self.quarantined_until <= now
+
+    def weight(self):
+        """Selection weight: success rate over latency (a 200 ms proxy with 90% success beats a 2 s one with 100%)."""
+        return max(0.01, self.success_rate) ** 2 / (self.latency_ms / 1000.0 + 0.2)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ProxyPool:
+    """
+    Process-wide pool of public proxies with health scores. Candidates (from the proxy lists F95ApiClient loads)
+    are probed concurrently in a background thread; requests report their outcome back with record().
+    choose() picks among healthy proxies weighted by score, so a fallback costs one fast hop instead of a
+    series of timeouts on dead entries. Failing proxies are quarantined with an exponential cool-down.
+    """
+
+    def __init__(self, scores_file=PROXY_SCORES_FILE):
+        self.scores_file = scores_file
+        self._scores = {} # proxy_url -> ProxyScore
+        self._lock = threading.Lock()
+        self._healthy_event = threading.Event()
+        self._probe_thread = None
+        self._dirty = False
+        self._last_saved = 0.0
+        self._load()
+
+    # --- Candidates and probing ---
+
+    def has_candidates(self):
+        with self._lock:
+            return bool(self._scores)
+
+    def set_candidates(self, proxies):
+        """Adds (proxy_url, scheme) candidates (existing scores are kept) and starts background probing."""
+        now = time.time()
+        with self._lock:
+            for proxy_url, scheme in proxies:
+                score = self._scores.get(proxy_url)
+                if score is None:
+                    self._scores[proxy_url] = ProxyScore(proxy_url, scheme, last_seen=now)
+                else:
+                    score.last_seen = now
+            self._dirty = True
+        self.start_probing()
+
+    def start_probing(self):
+        """Probes the candidates most in need of it in a background thread (no-op if a round is running)."""
+        with self._lock:
+            if self._probe_thread is not None and self._probe_thread.is_alive():
+                return
+            self._probe_thread = threading.Thread(target=self._probe_round, name="ProxyProbe", daemon=True)
+            self._probe_thread.start()
+
+    def _probe_candidates(self):
+        now = time.time()
+        with self._lock:
+            due = [s for s in self._scores.values()
+                   if s.quarantined_until <= now and now - s.last_checked >= PROXY_REPROBE_AFTER_SECONDS]
+        # Never-probed first, then previously good ones
+        due.sort(key=lambda s: (s.success_rate is not None, -(s.success_rate or 0)))
+        return due[:PROXY_PROBE_BATCH_SIZE]
+
+    def _probe_round(self):
+        candidates = self._probe_candidates()
+        if not candidates:
+            return
+        logger.info(f"ProxyPool: Probing {len(candidates)} proxies ({PROXY_PROBE_CONCURRENCY} at a time).")
+        answered = 0
+        with ThreadPoolExecutor(max_workers=PROXY_PROBE_CONCURRENCY, thread_name_prefix="ProxyProbe") as executor:
+            futures = {executor.submit(self._probe, s.proxy_url): s.proxy_url for s in candidates}
+            # Recorded as they finish, so a waiting choose() gets the first proxy that answers
+            for future in as_completed(futures):
+                ok, latency_ms = future.result()
+                self.record(futures[future], ok, latency_ms, save=False)
+                answered += ok
+        self.save()
+        logger.info(f"ProxyPool: {answered}/{len(candidates)} probed proxies answered. {self.stats()['healthy']} healthy in total.")
+
+    @staticmethod
+    def _probe(proxy_url):
+        started = time.monotonic()
+        try:
+            response = requests.get(PROXY_PROBE_URL, proxies={'http': proxy_url, 'https': proxy_url},
+                                    timeout=PROXY_PROBE_TIMEOUT_SECONDS, verify=False)
+            ok = response.status_code < 400
+        except Exception:
+            ok = False
+        return ok, (time.monotonic() - started) * 1000
+
+    # --- Selection and feedback ---
+
+    def choose(self, exclude=(), wait_seconds=PROXY_CHOOSE_WAIT_SECONDS) -> Optional[tuple]:
+        """
+        Returns a (proxy_url, scheme) picked by weighted score among healthy proxies, waiting up to wait_seconds
+        for a running probe round to find one. Falls back to an unprobed candidate, then to an excluded healthy one, or None.
+        """
+        deadline = time.monotonic() + wait_seconds
+        while True:
+            now = time.time()
+            with self._lock:
+                all_healthy = [s for s in self._scores.values() if s.is_healthy(now)]
+                healthy = [s for s in all_healthy if s.proxy_url not in exclude]
+                unprobed = [s for s in self._scores.values() if s.success_rate is None and s.proxy_url not in exclude]
+                probing = self._probe_thread is not None and self._probe_thread.is_alive()
+            if healthy:
+                chosen = random.choices(healthy, weights=[s.weight() for s in healthy])[0]
+                return chosen.proxy_url, chosen.scheme
+            remaining = deadline - time.monotonic()
+            if not probing or remaining <= 0:
+                break
+            self._healthy_event.clear()
+            self._healthy_event.wait(min(remaining, 1.0))
+        if unprobed:
+            chosen = random.choice(unprobed)
+            return chosen.proxy_url, chosen.scheme
+        if all_healthy: # Only the excluded proxy works (it wasn't quarantined, so the failure wasn't its fault)
+            chosen = random.choice(all_healthy)
+            return chosen.proxy_url, chosen.scheme
+        if not probing:
+            self.start_probing() # Quarantines may have expired
+        return None
+
+    def record(self, proxy_url, ok, latency_ms=None, save=True):
+        """Feeds the outcome of a request (or probe) through proxy_url into its score."""
+        with self._lock:
+            score = self._scores.get(proxy_url)
+            if score is None:
+                return
+            score.record(ok, latency_ms)
+            self._dirty = True
+        if ok:
+            self._healthy_event.set()
+        if save and time.time() - self._last_saved >= _SAVE_INTERVAL_SECONDS:
+            self.save()
+
+    def stats(self) -> dict:
+        now = time.time()
+        with self._lock:
+            scores = list(self._scores.values())
+        return {
+            'candidates': len(scores),
+            'probed': sum(1 for s in scores if s.success_rate is not None),
+            'healthy': sum(1 for s in scores if s.is_healthy(now)),
+            'quarantined': sum(1 for s in scores if s.quarantined_until > now),
+        }
+
+    # --- Persistence ---
+
+    def _load(self):
+        if not os.path.exists(self.scores_file):
+            return
+        try:
+            with open(self.scores_file, 'r') as f:
+                data = json.load(f)
+            cutoff = time.time() - PROXY_SCORE_MAX_AGE_SECONDS
+            for entry in data.get('proxies', []):
+                score = ProxyScore(**{k: entry[k] for k in ProxyScore.__slots__ if k in entry})
+                if score.last_seen >= cutoff:
+                    self._scores[score.proxy_url] = score
+            logger.info(f"ProxyPool: Loaded scores of {len(self._scores)} proxies from {self.scores_file}.")
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.warning(f"ProxyPool: Could not load proxy scores from {self.scores_file}: {e}")
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = [s.to_dict() for s in self._scores.values()]
+            self._dirty = False
+            self._last_saved = time.time()
+        try:
+            os.makedirs(os.path.dirname(self.scores_file), exist_ok=True)
+            tmp_path = f"{self.scores_file}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'timestamp': time.time(), 'proxies': entries}, f)
+            os.replace(tmp_path, self.scores_file)
+        except OSError as e:
+            logger.warning(f"ProxyPool: Could not save proxy scores to {self.scores_file}: {e}")
+
+
+_proxy_pool = None
+_proxy_pool_lock = threading.Lock()
+
+def get_proxy_pool() -> ProxyPool:
+    """Returns the process-wide ProxyPool, creating it (and loading saved scores) on first use."""
+    global _proxy_pool
+    with _proxy_pool_lock:
+        if _proxy_pool is None:
+            _proxy_pool = ProxyPool()
+            atexit.register(_proxy_pool.save)
+        return _proxy_pool
@@ -0,0 +1,192 @@
+# f95apiclient/rate_limit.py
+
+import logging
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+# Hosts (and their subdomains) that are rate limited; traffic to anything else passes straight through
+RATE_LIMIT_DOMAINS = [d.strip().lower() for d in os.getenv("RATE_LIMIT_DOMAINS", "f95zone.to,f95zone.com").split(',') if d.strip()]
+# Longest a caller waits for a slot before giving up (the request then fails like any other error)
+RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv("RATE_LIMIT_MAX_WAIT_SECONDS", "120"))
+# Retry-After values above this are capped (a misbehaving header shouldn't park the app for days)
+RATE_LIMIT_MAX_RETRY_AFTER_SECONDS = float(os.getenv("RATE_LIMIT_MAX_RETRY_AFTER_SECONDS", "3600"))
+# AIMD: every healthy response adds this fraction of the starting rate, every 429/503 multiplies the rate by the factor
+RATE_LIMIT_INCREASE_FRACTION = float(os.getenv("RATE_LIMIT_INCREASE_FRACTION", "0.05"))
+RATE_LIMIT_DECREASE_FACTOR = float(os.getenv("RATE_LIMIT_DECREASE_FACTOR", "0.5"))
+
+# Endpoint class -> (starting requests/s, burst, min requests/s, max requests/s).
+# Override with RATE_LIMIT_<CLASS>_RPS / RATE_LIMIT_<CLASS>_MAX_RPS, e.g. RATE_LIMIT_PAGE_RPS=1.
+_DEFAULT_CLASS_LIMITS = {
+    'rss': (1.0, 3, 0.1, 4.0),
+    'page': (0.5, 2, 0.05, 3.0),
+    'image': (4.0, 8, 0.5, 20.0),
+    'login': (0.2, 1, 0.02, 0.5),
+}
+
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def classify_url(url: str) -> tuple[str, str]:
+    """Returns (host, endpoint class) for a URL; the class is one of 'rss', 'login', 'image' or 'page'."""
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    path = parts.path.lower()
+    if 'latest_data.php' in path or 'cmd=rss' in parts.query.lower():
+        return host, 'rss'
+    if path.startswith('/login'):
+        return host, 'login'
+    if host.startswith('attachments.') or path.startswith('/data/') or path.endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif')):
+        return host, 'image'
+    return host, 'page'
+
+def parse_retry_after(value) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class AdaptiveTokenBucket:
+    """
+    Token bucket for one (host, endpoint class), kept in its GCRA form: instead of a token count it tracks
+    the theoretical arrival time of the next request, which lets callers reserve a slot and sleep outside the lock.
+    The rate adapts AIMD-style: additive increase on healthy responses, multiplicative decrease on 429/503.
+    """
+
+    def __init__(self, name, rate, burst, min_rate, max_rate):
+        self.name = name
+        self.initial_rate = rate
+        self.rate = rate
+        self.burst = max(1, int(burst))
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._tat = 0.0 # Theoretical arrival time (monotonic)
+        self._lock = threading.Lock()
+        self.throttled = 0
+        self.requests = 0
+        self.waited_seconds = 0.0
+
+    def reserve(self, max_wait=None) -> Optional[float]:
+        """Claims the next slot and returns how long to wait before using it, or None if that exceeds max_wait."""
+        with self._lock:
+            now = time.monotonic()
+            interval = 1.0 / self.rate
+            tat = max(self._tat, now)
+            wait = max(0.0, tat - (self.burst - 1) * interval - now)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tat = tat + interval
+            self.requests += 1
+            self.waited_seconds += wait
+            return wait
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.initial_rate * RATE_LIMIT_INCREASE_FRACTION)
+
+    def on_throttle(self, retry_after=None):
+        """Halves the rate (by default) and pushes the next slot back by Retry-After, or one new interval."""
+        with self._lock:
+            self.throttled += 1
+            old_rate = self.rate
+            self.rate = max(self.min_rate, self.rate * RATE_LIMIT_DECREASE_FACTOR)
+            delay = min(retry_after, RATE_LIMIT_MAX_RETRY_AFTER_SECONDS) if retry_after is not None else 1.0 / self.rate
+            # The burst allowance is subtracted again in reserve(), so add it here to block for the full delay
+            self._tat = max(self._tat, time.monotonic() + delay + (self.burst - 1) / self.rate)
+        logger.warning(f"Rate limit {self.name}: throttled by host, {old_rate:.2f} -> {self.rate:.2f} req/s, next request in {delay:.1f}s.")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'rate': self.rate, 'requests': self.requests, 'throttled': self.throttled,
+                    'waited_seconds': self.waited_seconds}
+
+
+class RateLimiter:
+    """Process-wide registry of AdaptiveTokenBucket per (host, endpoint class), shared by every client."""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_limited_host(host):
+        return any(host == d or host.endswith('.' + d) for d in RATE_LIMIT_DOMAINS)
+
+    def bucket_for(self, url) -> Optional[AdaptiveTokenBucket]:
+        """The bucket governing a URL, or None when the URL isn't rate limited."""
+        if not RATE_LIMIT_ENABLED:
+            return None
+        host, endpoint_class = classify_url(url)
+        if not self._is_limited_host(host):
+            return None
+        key = (host, endpoint_class)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                rate, burst, min_rate, max_rate = _DEFAULT_CLASS_LIMITS[endpoint_class]
+                rate = float(os.getenv(f"RATE_LIMIT_{endpoint_class.upper()}_RPS", rate))
+                max_rate = max(rate, float(os.getenv(f"RATE_LIMIT_{endpoint_class.upper()}_MAX_RPS", max_rate)))
+                bucket = self._buckets[key] = AdaptiveTokenBucket(f"{host}/{endpoint_class}", rate, burst, min(min_rate, rate), max_rate)
+            return bucket
+
+    def reserve(self, url, max_wait=RATE_LIMIT_MAX_WAIT_SECONDS) -> Optional[float]:
+        """Seconds to wait before requesting url (0 if unlimited), or None if the wait would exceed max_wait."""
+        bucket = self.bucket_for(url)
+        if bucket is None:
+            return 0.0
+        wait = bucket.reserve(max_wait)
+        if wait is None:
+            logger.warning(f"Rate limit {bucket.name}: next slot is more than {max_wait:.0f}s away. Giving up on {url}.")
+        return wait
+
+    def acquire(self, url, max_wait=RATE_LIMIT_MAX_WAIT_SECONDS) -> bool:
+        """Blocks until url may be requested. Returns False (without waiting) if that would take longer than max_wait."""
+        wait = self.reserve(url, max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    def record_response(self, url, status_code, retry_after_header=None):
+        """Feeds a response back into the bucket: 429/503 back off, other non-5xx responses speed up."""
+        bucket = self.bucket_for(url)
+        if bucket is None or status_code is None:
+            return
+        if status_code in THROTTLE_STATUS_CODES:
+            bucket.on_throttle(parse_retry_after(retry_after_header))
+        elif status_code < 500 and status_code != 403: # 403 is usually Cloudflare/IP related, not pacing
+            bucket.on_success()
+
+    def stats(self) -> dict:
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {bucket.name: bucket.stats() for bucket in buckets.values()}
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    """Returns the process-wide RateLimiter, creating it on first use."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+        return _rate_limiter
@@ -0,0 +1,182 @@
+# f95apiclient/rss_cache.py
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+# Parsed RSS results are reused for this long; 0 disables the cache (concurrent identical requests are still coalesced)
+RSS_CACHE_TTL_SECONDS = float(os.getenv("RSS_CACHE_TTL_SECONDS", "120"))
+# Most distinct queries kept; the least recently used one is dropped beyond this
+RSS_CACHE_MAX_ENTRIES = int(os.getenv("RSS_CACHE_MAX_ENTRIES", "512"))
+# Send If-None-Match / If-Modified-Since with RSS requests and reuse the last parsed items on 304 Not Modified
+RSS_CONDITIONAL_REQUESTS_ENABLED = os.getenv("RSS_CONDITIONAL_REQUESTS_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+# Longest a caller waits for another thread's identical in-flight request before fetching itself
+RSS_CACHE_INFLIGHT_WAIT_SECONDS = float(os.getenv("RSS_CACHE_INFLIGHT_WAIT_SECONDS", "180"))
+
+
+def _copy_items(items):
+    # Items are flat dicts of strings; callers mutate them, so every caller gets its own copies
+    return [dict(item) for item in items] if items is not None else None
+
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+class RssCache:
+    """
+    TTL + LRU cache of parsed RSS query results, keyed by the normalized query parameters.
+    Concurrent callers asking for the same key while it is being fetched wait for that one fetch
+    instead of issuing their own. Failed fetches (None) are not cached.
+    Separately, the validators (ETag / Last-Modified) and parsed items of the last full response per query URL
+    are kept past the TTL (same LRU bound), so an expired query can be revalidated with a conditional request.
+    """
+
+    def __init__(self, ttl_seconds=RSS_CACHE_TTL_SECONDS, max_entries=RSS_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._entries = OrderedDict()   # key -> (expires_at monotonic, items)
+        self._in_flight = {}            # key -> _InFlight
+        self._async_in_flight = {}      # (event loop id, key) -> asyncio.Future
+        self._validated = OrderedDict() # query URL -> (etag, last_modified, items)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.not_modified = 0
+
+    def get_or_fetch(self, key, fetch: Callable[[], Optional[list]]) -> Optional[list]:
+        """Returns a copy of the cached result for key, or of fetch()'s result (fetched once for concurrent callers)."""
+        with self._lock:
+            items = self._lookup(key)
+            if items is not None:
+                return items
+            waiting = self._in_flight.get(key)
+            if waiting is None:
+                leader = self._in_flight[key] = _InFlight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if waiting is not None:
+            if waiting.done.wait(RSS_CACHE_INFLIGHT_WAIT_SECONDS):
+                return _copy_items(waiting.result)
+            logger.warning(f"RSS cache: Gave up waiting for in-flight request {key}. Fetching separately.")
+            return _copy_items(fetch())
+
+        try:
+            leader.result = fetch()
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+                self._store(key, leader.result)
+            leader.done.set()
+        return _copy_items(leader.result)
+
+    async def get_or_fetch_async(self, key, fetch) -> Optional[list]:
+        """get_or_fetch for a coroutine function: concurrent callers on the same event loop await one fetch."""
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        with self._lock:
+            items = self._lookup(key)
+            if items is not None:
+                return items
+            waiting = self._async_in_flight.get(flight_key)
+            if waiting is None:
+                leader = self._async_in_flight[flight_key] = loop.create_future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if waiting is not None:
+            return _copy_items(await asyncio.shield(waiting))
+
+        result = None
+        try:
+            result = await fetch()
+        finally:
+            with self._lock:
+                self._async_in_flight.pop(flight_key, None)
+                self._store(key, result)
+            leader.set_result(result)
+        return _copy_items(result)
+
+    def _lookup(self, key):
+        # Lock held by the caller
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return _copy_items(entry[1])
+
+    def _store(self, key, items):
+        # Lock held by the caller
+        if items is None or self.ttl_seconds <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, items)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_validated(self, url):
+        """(etag, last_modified, items) of the last full response for url, or None."""
+        if not RSS_CONDITIONAL_REQUESTS_ENABLED:
+            return None
+        with self._lock:
+            validated = self._validated.get(url)
+            if validated is not None:
+                self._validated.move_to_end(url)
+            return validated
+
+    def store_validated(self, url, etag, last_modified, items):
+        """Remembers a full response's validators and parsed items (nothing is stored without a validator)."""
+        if not RSS_CONDITIONAL_REQUESTS_ENABLED or not (etag or last_modified):
+            return
+        with self._lock:
+            self._validated[url] = (etag, last_modified, _copy_items(items))
+            self._validated.move_to_end(url)
+            while len(self._validated) > self.max_entries:
+                self._validated.popitem(last=False)
+
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._validated.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {'hits': self.hits, 'misses': self.misses, 'coalesced': self.coalesced,
+                    'evictions': self.evictions, 'size': len(self._entries), 'not_modified': self.not_modified,
+                    'hit_ratio': (self.hits + self.coalesced) / lookups if lookups else None}
+
+
+_rss_cache = None
+_rss_cache_lock = threading.Lock()
+
+def get_rss_cache() -> RssCache:
+    """Returns the process-wide RssCache, creating it on first use."""
+    global _rss_cache
+    with _rss_cache_lock:
+        if _rss_cache is None:
+            _rss_cache = RssCache()
+        return _rss_cache
@@ -0,0 +1,166 @@
+# f95apiclient/rss_parser.py
+
+import io
+import logging
+import re
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# --- Precompiled patterns (previously compiled per item inside get_latest_game_data_from_rss) ---
+# Example: [UPDATE] Game Name Here [v1.0 Final] / [NEW] Another Game [0.5b]
+TITLE_RE = re.compile(r"^\[(?:UPDATE|NEW|GAME)\]\s(.*?)(?:\s\[([^\]]+)\])?$")
+# Fallback if the primary pattern fails (e.g. a different prefix)
+TITLE_FALLBACK_RE = re.compile(r"^\[[^\]]+\]\s*(.*)")
+# The <rss@f95> marker F95zone appends to author names
+AUTHOR_MARKER_RE = re.compile(r'\s*<rss@f95>\s*', re.IGNORECASE)
+# src attribute of the first <img> (hex escapes for the quotes)
+IMG_SRC_RE = re.compile(r'<img[^>]+src\s*=\s*[\x22\x27]([^\x22\x27]+)[\x22\x27]', re.IGNORECASE)
+# An & that doesn't start an entity
+BARE_AMPERSAND_RE = re.compile(r'&(?!(?:#\d+|#x[0-9a-fA-F]+|[a-zA-Z][a-zA-Z0-9]*);)')
+
+_DC_CREATOR = "{http://purl.org/dc/elements/1.1/}creator"
+
+
+def build_game_data(title, link, author_raw, pub_date, tag_terms, description):
+    """
+    Turns the raw fields of one feed item into the dict get_latest_game_data_from_rss returns
+    (name, version, url, author, rss_pub_date, completed_status, image_url).
+    """
+    game_data = {}
+    title = ("No Title" if title is None else title).strip()
+    match = TITLE_RE.match(title)
+    if match:
+        game_data['name'] = match.group(1).strip()
+        game_data['version'] = match.group(2).strip() if match.group(2) else "Unknown"
+    else:
+        name_match = TITLE_FALLBACK_RE.match(title)
+        game_data['name'] = name_match.group(1).strip() if name_match else title # Use full title if no structure matches
+        game_data['version'] = "Unknown"
+
+    game_data['url'] = link
+
+    author_cleaned = "N/A"
+    if author_raw and author_raw != "N/A":
+        author_cleaned = AUTHOR_MARKER_RE.sub('', author_raw).strip()
+    game_data['author'] = author_cleaned if author_cleaned else "N/A"
+
+    # F95Zone RSS uses 'pubDate' for the date. Format: 'Sat, 18 May 2024 10:00:00 GMT'
+    game_data['rss_pub_date'] = pub_date
+
+    # Status from the category tags; "Ongoing" if none of them is a status
+    tags_lower = [t.lower() for t in tag_terms]
+    status = "Ongoing"
+    if "completed" in tags_lower:
+        status = "Completed"
+    elif "on hold" in tags_lower or "onhold" in tags_lower:
+        status = "On Hold"
+    elif "abandoned" in tags_lower:
+        status = "Abandoned"
+    game_data['completed_status'] = status
+
+    image_url = None
+    if description:
+        img_match = IMG_SRC_RE.search(description)
+        if img_match:
+            image_url = img_match.group(1)
+    game_data['image_url'] = image_url
+    return game_data
+
+
+def _text(element):
+    # feedparser strips surrounding whitespace and returns None for empty elements
+    text = (element.text or '').strip()
+    return text or None
+
+
+def iter_rss_items(source):
+    """
+    Walks the <item> elements of an RSS 2.0 document with lxml.etree.iterparse and yields one
+    build_game_data dict per item, freeing each item once it is processed. source is the document's
+    bytes or a binary file object that is read as parsing goes (a streamed response's raw body), so
+    items come out while the rest of the feed is still downloading.
+    Raises lxml.etree.XMLSyntaxError on a malformed document.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    context = etree.iterparse(source, events=('end',), tag='item', resolve_entities=False, huge_tree=True)
+    for _, item in context:
+        title = link = author = dc_creator = pub_date = description = None
+        tag_terms = []
+        for child in item:
+            tag = child.tag
+            if tag == 'title':
+                title = _text(child)
+            elif tag == 'link':
+                link = _text(child)
+            elif tag == 'author':
+                author = _text(child)
+            elif tag == _DC_CREATOR:
+                dc_creator = _text(child)
+            elif tag == 'pubDate':
+                pub_date = _text(child)
+            elif tag == 'category':
+                term = _text(child)
+                if term:
+                    tag_terms.append(term)
+            elif tag == 'description':
+                description = child.text or ''
+                # feedparser re-serializes the description HTML with escaped attribute ampersands
+                if '&' in description:
+                    description = BARE_AMPERSAND_RE.sub('&amp;', description)
+        yield build_game_data(title, link, author or dc_creator, pub_date, tag_terms, description)
+        item.clear()
+        while item.getprevious() is not None:
+            del item.getparent()[0]
+
+
+class _RecordingReader:
+    """Binary file object over a stream that keeps what was read, so a document lxml rejects can be re-parsed."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._chunks = []
+
+    def read(self, size=-1):
+        data = self._stream.read(size if size is not None and size >= 0 else None)
+        self._chunks.append(data)
+        return data
+
+    def read_all(self):
+        """The whole document: what was read so far plus the rest of the stream."""
+        return b''.join(self._chunks) + (self._stream.read() or b'')
+
+
+def iter_rss_stream(stream):
+    """
+    Yields the items of an RSS document read from a binary stream (see iter_rss_items). If lxml finds
+    the XML malformed partway, the rest of the stream is read and the whole document is parsed with
+    feedparser; only its items past the ones already yielded are yielded (those came from well-formed XML).
+    """
+    reader = _RecordingReader(stream)
+    yielded = 0
+    try:
+        for game_data in iter_rss_items(reader):
+            yielded += 1
+            yield game_data
+    except etree.XMLSyntaxError as e:
+        logger.warning(f"RSS document is not well-formed XML ({e}). Parsing with feedparser instead.")
+        yield from parse_rss_items_feedparser(reader.read_all())[yielded:]
+
+
+def parse_rss_items_feedparser(content: bytes) -> list[dict]:
+    """The previous feedparser-based parse (fallback for documents lxml rejects, and the benchmark reference)."""
+    import feedparser
+    feed = feedparser.parse(content)
+    # An empty <title> counts as missing ("No Title"), as in iter_rss_items
+    return [build_game_data(entry.get("title") or None, entry.get("link"), entry.get("author", "N/A"),
+                            entry.get("published"), [t.get('term', '') for t in entry.get('tags', [])],
+                            entry.get("description", ""))
+            for entry in feed.entries]
+
+
+def parse_rss_items(content: bytes) -> list[dict]:
+    """All items of a downloaded RSS document (see iter_rss_stream), falling back to feedparser when the XML is malformed."""
+    return list(iter_rss_stream(io.BytesIO(content)))
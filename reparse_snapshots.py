@@ -0,0 +1,29 @@
+import argparse
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import snapshot_store
+from app.services import reparse_games_from_snapshots
+
+# Same default as run_app.DB_PATH; importing run_app would start the scheduler (and re-start it in every parser process)
+DB_PATH = os.environ.get("DATABASE_PATH", "/data/f95_games.db")
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild scraped game data from stored HTML snapshots (no network access).")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count).")
+    parser.add_argument("--prune", action="store_true", help="Apply the snapshot retention policy before re-parsing.")
+    args = parser.parse_args()
+
+    print(f"Target Database Path: {DB_PATH}")
+    print(f"Snapshot Directory: {snapshot_store.SNAPSHOT_DIR}")
+    if args.prune:
+        print(f"Removed {snapshot_store.prune_snapshots()} expired snapshots.")
+
+    updated, total = reparse_games_from_snapshots(DB_PATH, workers=args.workers)
+    print(f"Re-parsed {updated} of {total} games with snapshots.")
+
+if __name__ == "__main__":
+    main()
@@ -30,8 +30,15 @@ from app.services import (
     sync_all_my_games_for_user,
     search_games_for_user,
     check_for_my_updates,
-    send_pushover_notification
+    send_pushover_notification,
+    run_scrape_job_for_thread
 )
+from app.scrape_queue import PRIORITY_USER, PRIORITY_NEW_GAME
+from app import scrape_metrics
+from f95apiclient.direct_circuit import get_direct_circuit
+from f95apiclient.image_index import get_image_index
+from f95apiclient.proxy_pool import get_proxy_pool
+from f95apiclient.rss_cache import get_rss_cache
 from app.scheduler import start_or_reschedule_scheduler
 
 # Constants
@@ -115,7 +122,8 @@ def sync_all_for_user_background_task(app_context, user_id_to_sync, db_path_to_u
                 db_path=db_path_to_use, 
                 f95_client=local_f95_client, 
                 user_id=user_id_to_sync,
-                force_scrape=force_scrape_flag
+                force_scrape=force_scrape_flag,
+                scrape_priority=PRIORITY_USER
             )
             # Notify user of completion
             if get_setting(db_path_to_use, 'notify_on_sync_complete', 'True', user_id=user_id_to_sync) == 'True':
@@ -319,7 +327,9 @@ def add_game():
                         client = F95ApiClient()
                         try:
                             # Force scrape to get full details immediately
-                            check_single_game_update_and_status(DB_PATH, client, g_id, user_id, force_scrape=True) 
+                            thread_key = check_single_game_update_and_status(DB_PATH, client, g_id, user_id, force_scrape=True, scrape_priority=PRIORITY_NEW_GAME)
+                            if thread_key:
+                                run_scrape_job_for_thread(DB_PATH, client, thread_key)
                         except Exception as e:
                             app_instance.logger.error(f"Auto-sync error for game {g_id}: {e}")
                         finally:
@@ -377,7 +387,9 @@ def manual_sync_game(played_game_id):
             try:
                 # Signature: check_single_game_update_and_status(db_path, f95_client, played_game_row_id, user_id, force_scrape=False)
                 # Note: manual_sync_game passes 'played_game_id' which corresponds to 'played_game_row_id' (upg.id)
-                check_single_game_update_and_status(DB_PATH, client, game_id, user_id, force_scrape=True)
+                thread_key = check_single_game_update_and_status(DB_PATH, client, game_id, user_id, force_scrape=True, scrape_priority=PRIORITY_USER)
+                if thread_key:
+                    run_scrape_job_for_thread(DB_PATH, client, thread_key) # This thread only; waits if another worker has it
                 
                 # Notify completion
                 if get_setting(DB_PATH, 'notify_on_sync_complete', 'True', user_id=user_id) == 'True':
@@ -559,6 +571,18 @@ def admin_users():
     users = get_all_users_details(DB_PATH)
     return render_template('admin_users.html', users=users)
 
+@flask_app.route('/admin/scrape_timings', methods=['GET'])
+@login_required
+def admin_scrape_timings():
+    if not session.get('is_admin'):
+        abort(403) # Forbidden
+
+    limit = request.args.get('limit', 200, type=int)
+    timings = scrape_metrics.get_scrape_timings(DB_PATH, limit=max(1, min(limit, 2000)))
+    return render_template('admin_scrape_timings.html', timings=timings, metrics=scrape_metrics.summary(), limit=limit,
+                           rss_cache=get_rss_cache().stats(), proxy_pool=get_proxy_pool().stats(),
+                           direct_circuit=get_direct_circuit().stats(), image_index=get_image_index().stats())
+
 if __name__ == '__main__':
     # Ensure image cache dir exists
     if not os.path.exists(IMAGE_CACHE_DIR_FS):